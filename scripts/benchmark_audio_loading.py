@@ -0,0 +1,86 @@
+"""
+Compare audio decode paths on ICBHI-sized WAVs: native RIFF/memmap reader,
+soundfile and librosa.
+
+ICBHI recordings are ~20 s; the files are written at the pipeline rate
+(16 kHz mono PCM16, native fast path) and at a typical stethoscope export
+rate (44.1 kHz stereo, which still needs resampling). The last row is the
+encoder's bounded read of the first MAX_AUDIO_DURATION_SEC only.
+
+    python scripts/benchmark_audio_loading.py --seconds 20 --repeats 20
+"""
+
+import os
+import sys
+import time
+import wave
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import SAMPLE_RATE, MAX_AUDIO_DURATION_SEC
+
+
+def _write_wav(path: str, seconds: float, sr: int, channels: int) -> None:
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 0.05, (int(seconds * sr), channels))
+    pcm = np.clip(samples * 32767, -32768, 32767).astype("<i2")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
+
+
+def _time(fn, repeats: int) -> float:
+    fn()  # warm caches / lazy imports
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def _decoders(path: str):
+    from src.utils.audio import read_wav_header, _read_wav_native, load_audio
+
+    info = read_wav_header(path)
+    if info is not None and info.native_dtype is not None:
+        yield "native", lambda: _read_wav_native(path, read_wav_header(path))
+    try:
+        import soundfile as sf
+        yield "soundfile", lambda: sf.read(path, dtype="float32", always_2d=True)
+    except ImportError:
+        print("⚠️ soundfile not installed, skipping")
+    try:
+        import librosa
+        yield "librosa", lambda: librosa.load(path, sr=SAMPLE_RATE, mono=True)
+    except ImportError:
+        print("⚠️ librosa not installed, skipping")
+    yield "load_audio", lambda: load_audio(path, sr=SAMPLE_RATE)
+    # What the encoder does: decode only the analyzed window
+    yield f"load_audio[:{MAX_AUDIO_DURATION_SEC}s]", lambda: load_audio(path, sr=SAMPLE_RATE, duration=MAX_AUDIO_DURATION_SEC)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    layouts = [(SAMPLE_RATE, 1), (44100, 2)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for sr, channels in layouts:
+            path = os.path.join(tmpdir, f"icbhi_{sr}_{channels}ch.wav")
+            _write_wav(path, args.seconds, sr, channels)
+            print(f"\n📂 {args.seconds:.0f}s @ {sr} Hz, {channels} ch ({os.path.getsize(path) / 1e6:.1f} MB)")
+            for name, fn in _decoders(path):
+                print(f"  {name:16s} {_time(fn, args.repeats):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
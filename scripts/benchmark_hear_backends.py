@@ -0,0 +1,80 @@
+"""
+Compare HeAR runtime backends on CPU: load time, resident memory, latency.
+
+Each backend is measured in a fresh process so its RSS is not polluted by
+the others (e.g. TensorFlow's import alone).
+
+    CUDA_VISIBLE_DEVICES="" python scripts/benchmark_hear_backends.py \
+        --backend savedmodel --backend tflite=models/hear.tflite --backend onnx=models/hear.onnx
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing as mp
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def _measure(name: str, path, batch: int, repeats: int, results) -> None:
+    import psutil
+    from src.models.hear_backends import load_backend
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+
+    start = time.perf_counter()
+    backend = load_backend(name, path)
+    load_sec = time.perf_counter() - start
+
+    chunks = np.random.default_rng(0).uniform(-0.1, 0.1, (batch, 32000)).astype(np.float32)
+    start = time.perf_counter()
+    backend.infer(chunks)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        backend.infer(chunks)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    results.put({
+        "backend": name,
+        "load_sec": load_sec,
+        "rss_mb": (process.memory_info().rss - rss_before) / 1e6,
+        "cold_ms": cold_ms,
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", action="append", required=True,
+                        help="NAME or NAME=PATH (savedmodel, tflite, onnx)")
+    parser.add_argument("--batch", type=int, default=5, help="Chunks per call (5 = one 10 s clip)")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    print(f"🏁 HeAR backend benchmark (batch={args.batch}, {args.repeats} warm runs)\n")
+    print(f"{'backend':<11} {'load s':>7} {'RSS MB':>8} {'cold ms':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    for spec in args.backend:
+        name, _, path = spec.partition("=")
+        results = ctx.Queue()
+        worker = ctx.Process(target=_measure, args=(name, path or None, args.batch, args.repeats, results))
+        worker.start()
+        worker.join()
+        if worker.exitcode != 0:
+            print(f"{name:<11} ❌ failed (exit code {worker.exitcode})")
+            continue
+        r = results.get()
+        print(f"{r['backend']:<11} {r['load_sec']:>7.2f} {r['rss_mb']:>8.0f} {r['cold_ms']:>8.1f} "
+              f"{r['p50_ms']:>7.1f} {r['p95_ms']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
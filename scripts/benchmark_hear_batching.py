@@ -0,0 +1,69 @@
+"""
+Benchmark per-chunk vs batched HeAR inference on CPU.
+
+Compares the old loop (one (1, 32000) call per 2-second chunk) against
+`HeAREncoder._infer_chunks` (one (N, 32000) call per `max_batch_size`
+chunks) for clips of several lengths.
+
+Requires the real HeAR model (TensorFlow + HuggingFace access):
+    CUDA_VISIBLE_DEVICES="" python scripts/benchmark_hear_batching.py --repeats 20
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import SAMPLE_RATE, HEAR_MAX_BATCH_SIZE
+
+
+def per_chunk(encoder, chunks: np.ndarray) -> np.ndarray:
+    outputs = [encoder.model.infer(chunk[None, :]) for chunk in chunks]
+    return np.concatenate(outputs, axis=0)
+
+
+def time_call(fn, repeats: int) -> float:
+    """Median wall time (ms) of `fn` over `repeats` runs, after one warm-up."""
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=float, nargs="+", default=[2.0, 10.0, 30.0])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--max-batch-size", type=int, default=HEAR_MAX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    from src.models.hear_encoder import HeAREncoder
+
+    encoder = HeAREncoder(max_batch_size=args.max_batch_size)
+    if encoder.model is None:
+        print("❌ Real HeAR model not loaded (demo mode). This benchmark needs TensorFlow and the google/hear weights.")
+        sys.exit(1)
+
+    rng = np.random.default_rng(0)
+    print(f"🏁 HeAR CPU benchmark (median of {args.repeats} runs, max_batch_size={args.max_batch_size})\n")
+    print(f"{'clip (s)':>8} {'chunks':>6} {'per-chunk ms':>13} {'batched ms':>11} {'speedup':>8}")
+    for duration in args.durations:
+        waveform = rng.uniform(-0.1, 0.1, int(SAMPLE_RATE * duration)).astype(np.float32)
+        chunks = encoder._segment_audio(waveform, SAMPLE_RATE)
+
+        np.testing.assert_allclose(per_chunk(encoder, chunks), encoder._infer_chunks(chunks), rtol=1e-4, atol=1e-4)
+
+        loop_ms = time_call(lambda: per_chunk(encoder, chunks), args.repeats)
+        batched_ms = time_call(lambda: encoder._infer_chunks(chunks), args.repeats)
+        print(f"{duration:>8g} {len(chunks):>6} {loop_ms:>13.1f} {batched_ms:>11.1f} {loop_ms / batched_ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
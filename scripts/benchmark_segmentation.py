@@ -0,0 +1,77 @@
+"""
+Benchmark HeAR segmentation: list + np.pad vs strided views.
+
+Reports time and peak extra memory (tracemalloc) per recording for the
+legacy segmenter and for `frame_windows`, both as views and materialized
+into the (N, 32000) array HeAR consumes.
+
+    python scripts/benchmark_segmentation.py --durations 3 10 60 --repeats 200
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import SAMPLE_RATE, HEAR_CHUNK_DURATION_SEC
+from src.utils.segmentation import frame_windows
+
+
+def legacy_segment(waveform: np.ndarray, chunk: int) -> np.ndarray:
+    chunks = []
+    for i in range(0, len(waveform), chunk):
+        piece = waveform[i:i + chunk]
+        if len(piece) < chunk:
+            piece = np.pad(piece, (0, chunk - len(piece)), mode='constant')
+        chunks.append(piece)
+    return np.array(chunks, dtype=np.float32)
+
+
+def measure(fn, repeats: int):
+    """(median µs per call, peak extra KiB for one call)."""
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return float(np.median(timings)), peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=float, nargs="+", default=[3.0, 10.0, 60.0])
+    parser.add_argument("--hop-sec", type=float, default=HEAR_CHUNK_DURATION_SEC)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    window = int(SAMPLE_RATE * HEAR_CHUNK_DURATION_SEC)
+    hop = int(SAMPLE_RATE * args.hop_sec)
+    rng = np.random.default_rng(0)
+
+    print(f"🏁 Segmentation benchmark (window={window}, hop={hop}, median of {args.repeats} runs)\n")
+    print(f"{'clip (s)':>8} {'method':<22} {'µs/rec':>10} {'peak KiB':>10}")
+    for duration in args.durations:
+        waveform = rng.uniform(-0.1, 0.1, int(SAMPLE_RATE * duration) + 123).astype(np.float32)
+        methods = {"strided view": lambda: frame_windows(waveform, window, hop),
+                   "strided → array": lambda: frame_windows(waveform, window, hop).as_array()}
+        if hop == window:
+            methods = {"list + np.pad": lambda: legacy_segment(waveform, window), **methods}
+        for name, fn in methods.items():
+            us, kib = measure(fn, args.repeats)
+            print(f"{duration:>8g} {name:<22} {us:>10.1f} {kib:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
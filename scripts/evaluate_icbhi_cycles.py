@@ -0,0 +1,83 @@
+"""
+Evaluate the ClinicalClassifier on annotated ICBHI breathing cycles.
+
+Cycle embeddings are kept in the per-chunk EmbeddingStore, so only the first
+run (or a new HeAR revision) pays for HeAR inference; later runs read the
+embeddings back from the memory-mapped shards.
+
+    python scripts/evaluate_icbhi_cycles.py --data-dir data/icbhi --limit 200
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import ICBHI_DATA_DIR, EMBEDDING_STORE_DIR, SAMPLE_RATE, HEAR_CHUNK_DURATION_SEC
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=ICBHI_DATA_DIR)
+    parser.add_argument("--store-dir", default=EMBEDDING_STORE_DIR)
+    parser.add_argument("--limit", type=int, default=None, help="Max recordings (default: all)")
+    args = parser.parse_args()
+
+    from src.data import ICBHIDataset, EmbeddingStore
+    from src.data.icbhi_loader import CYCLE_LABELS, read_cycle_annotations, cycle_windows
+    from src.models.hear_encoder import HeAREncoder
+    from src.models.clinical_classifier import ClinicalClassifier
+    from src.utils.audio import load_audio
+
+    dataset = ICBHIDataset(args.data_dir)
+    store = EmbeddingStore(args.store_dir)
+    encoder = HeAREncoder()
+    revision = encoder.model_revision
+    window = int(SAMPLE_RATE * HEAR_CHUNK_DURATION_SEC)
+
+    recordings = dataset.recordings()[:args.limit]
+    computed = 0
+    start = time.perf_counter()
+    entries = []
+    for audio_path in recordings:
+        annotation_path = dataset.annotation_path(audio_path)
+        if not os.path.exists(annotation_path):
+            continue
+
+        def embed_recording():
+            if encoder.model is None:
+                raise RuntimeError("HeAR model not loaded (demo mode) and cycles are not in the store")
+            waveform, sr = load_audio(audio_path, sr=SAMPLE_RATE)
+            windows, cycles = cycle_windows(waveform, read_cycle_annotations(annotation_path), sr, window)
+            embeddings = encoder._infer_chunks(windows) if len(windows) else np.empty((0, encoder.embedding_dim))
+            return embeddings, [(c.start, c.end) for c in cycles], [c.label for c in cycles]
+
+        recording_id = os.path.splitext(os.path.basename(audio_path))[0]
+        if store.entry(recording_id, revision) is None:
+            computed += 1
+        entries.append(store.get_or_compute(recording_id, revision, embed_recording))
+
+    rows = np.concatenate([np.arange(e.row, e.stop) for e in entries]) if entries else np.empty(0, dtype=np.int64)
+    labels = np.array([label for e in entries for label in e.labels], dtype=np.int64)
+    embeddings = store.read_rows(rows)
+    elapsed = time.perf_counter() - start
+    print(f"📦 {len(rows)} cycles from {len(entries)} recordings "
+          f"({computed} embedded, {len(entries) - computed} from store) in {elapsed:.1f}s")
+
+    classifier = ClinicalClassifier()
+    if not classifier.model_loaded or not len(rows):
+        return
+    predicted = np.array([ClinicalClassifier.LABELS.index(label) for label, _, _ in classifier.predict_batch(embeddings)])
+    print(f"📊 Cycle accuracy: {np.mean(predicted == labels):.1%}")
+    for index, name in enumerate(CYCLE_LABELS):
+        mask = labels == index
+        if mask.any():
+            print(f"  {name:8s} recall {np.mean(predicted[mask] == index):6.1%}  (n={mask.sum()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Convert the official HeAR SavedModel into a lightweight CPU runtime file.
+
+    python scripts/export_hear_backend.py --format tflite --output models/hear.tflite
+    python scripts/export_hear_backend.py --format onnx   --output models/hear.onnx
+
+Then point the encoder at it:
+    AURA_HEAR_BACKEND=tflite AURA_HEAR_BACKEND_PATH=models/hear.tflite
+
+Requires TensorFlow (and tf2onnx for ONNX) on the machine doing the export
+only; edge devices need just tflite_runtime or onnxruntime.
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.model_store import get_model_store
+
+
+def export_tflite(model_dir: str, output: str, allow_select_ops: bool) -> None:
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_saved_model(model_dir, signature_keys=["serving_default"])
+    ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+    if allow_select_ops:
+        # Needs the Flex delegate at runtime (full TF's interpreter, not tflite_runtime)
+        ops.append(tf.lite.OpsSet.SELECT_TF_OPS)
+    converter.target_spec.supported_ops = ops
+    with open(output, "wb") as f:
+        f.write(converter.convert())
+
+
+def export_onnx(model_dir: str, output: str, opset: int) -> None:
+    subprocess.run([
+        sys.executable, "-m", "tf2onnx.convert",
+        "--saved-model", model_dir,
+        "--signature_def", "serving_default",
+        "--opset", str(opset),
+        "--output", output,
+    ], check=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=["tflite", "onnx"], required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--saved-model", help="Local SavedModel directory (default: the model store's 'hear')")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--allow-select-ops", action="store_true")
+    args = parser.parse_args()
+
+    model_dir = args.saved_model
+    if model_dir is None:
+        model_dir = get_model_store().resolve("hear")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    print(f"🔄 Converting {model_dir} → {args.output} ({args.format})...")
+    if args.format == "tflite":
+        export_tflite(model_dir, args.output, args.allow_select_ops)
+    else:
+        export_onnx(model_dir, args.output, args.opset)
+    print(f"✅ Wrote {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+    print("💡 Verify parity with: AURA_HEAR_BACKEND=<format> AURA_HEAR_BACKEND_PATH=<file> "
+          "pytest tests/test_hear_backends.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Validate triage accuracy on ICBHI recordings with neutral vitals.
+
+Samples come from ICBHIDataset.get_validation_samples and go through
+AuraMedAgent.predict_batch in chunks. With --workers > 0 the encoder decodes
+the recordings in a DecodePool, so decoding/resampling of the next files
+runs in worker processes while HeAR embeds the current ones.
+
+    python scripts/validate_icbhi.py --data-dir data/icbhi --n 200 --workers 4
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import ICBHI_DATA_DIR, DECODE_POOL_WORKERS, DECODE_POOL_PREFETCH
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=ICBHI_DATA_DIR)
+    parser.add_argument("--n", type=int, default=100, help="Recordings to validate")
+    parser.add_argument("--diagnosis", default=None)
+    parser.add_argument("--batch-size", type=int, default=16, help="Recordings per predict_batch call")
+    parser.add_argument("--workers", type=int, default=DECODE_POOL_WORKERS, help="Decode processes (0 decodes inline)")
+    parser.add_argument("--prefetch", type=int, default=DECODE_POOL_PREFETCH)
+    args = parser.parse_args()
+
+    from src.agent.core import AuraMedAgent
+    from src.data import ICBHIDataset
+    from src.models.hear_encoder import HeAREncoder
+    from src.utils.decode_pool import DecodePool
+
+    samples = ICBHIDataset(args.data_dir).get_validation_samples(n=args.n, diagnosis=args.diagnosis)
+    pool = DecodePool(workers=args.workers, prefetch=args.prefetch) if args.workers > 0 else None
+    if pool is not None:
+        # Fork the decode workers before TensorFlow is loaded by the encoder
+        pool.start()
+    try:
+        agent = AuraMedAgent(hear_encoder=HeAREncoder(decode_pool=pool))
+
+        correct = 0
+        confusion = Counter()
+        start = time.perf_counter()
+        for k in range(0, len(samples), args.batch_size):
+            chunk = samples[k:k + args.batch_size]
+            results = agent.predict_batch([(s.audio_path, s.vitals) for s in chunk])
+            for sample, result in zip(chunk, results):
+                correct += result.status == sample.expected_triage
+                confusion[(sample.expected_triage.value, result.status.value)] += 1
+            print(f"  {k + len(chunk):5d}/{len(samples)} recordings")
+        elapsed = time.perf_counter() - start
+    finally:
+        if pool is not None:
+            pool.close()
+
+    decode = f"{args.workers} decode workers" if pool is not None else "inline decode"
+    print(f"\n⏱️ {len(samples)} recordings in {elapsed:.1f}s ({len(samples) / max(elapsed, 1e-9):.1f}/s, {decode})")
+    if samples:
+        print(f"📊 Triage accuracy: {correct / len(samples):.1%}")
+    for (expected, got), count in sorted(confusion.items()):
+        print(f"  expected {expected:12s} got {got:12s} {count:5d}")
+
+
+if __name__ == "__main__":
+    main()
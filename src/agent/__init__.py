@@ -13,6 +13,9 @@ if TYPE_CHECKING:
 # Use TYPE_CHECKING for exports intended for static analysis
 if TYPE_CHECKING:
     from src.agent.core import AuraMedAgent
+    from src.agent.async_agent import AsyncAuraMedAgent
+    from src.agent.pipeline import PipelinedTriageRunner
+    from src.agent.worker_pool import TriageWorkerPool
     from src.agent.safety import SafetyGuard
 
 # Runtime exports: provide access via full path to avoid eager cycles
@@ -20,6 +23,9 @@ if TYPE_CHECKING:
 
 __all__ = [
     "AuraMedAgent",
+    "AsyncAuraMedAgent",
+    "PipelinedTriageRunner",
+    "TriageWorkerPool",
     "DangerSignException",
     "LowQualityError",
     "LowConfidenceError",
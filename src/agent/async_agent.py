@@ -0,0 +1,162 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import torch
+
+from src.agent.core import AuraMedAgent
+from src.agent.protocols import WHORespiratoryProtocol
+from src.agent.deadline import Deadline, deadline_stage
+from src.models.medgemma import PreparedPrompt
+from src.datatypes import PatientVitals, TriageResult, LowQualityError
+from src.config import MAX_CONCURRENT_TRIAGES, ASYNC_CPU_WORKERS
+from src.utils.audio import AudioSource, describe_audio_source
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAuraMedAgent:
+    """
+    Asyncio front-end for AuraMedAgent.
+
+    Keeps the event loop responsive by running the blocking pipeline stages
+    off-loop:
+      - audio decode, HeAR encoding and the clinical classifier run on a
+        configurable CPU executor
+      - MedGemma generation runs on a dedicated single-slot executor, so at
+        most one generate call holds the accelerator at a time
+    A semaphore bounds the number of triages in flight so concurrent callers
+    cannot oversubscribe the edge RAM budget.
+
+    Usage:
+        async with AsyncAuraMedAgent() as agent:
+            results = await asyncio.gather(*(agent.apredict(p, v) for p, v in queue))
+    """
+
+    def __init__(
+        self,
+        agent: Optional[AuraMedAgent] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = MAX_CONCURRENT_TRIAGES
+    ):
+        """
+        Initialize the async agent.
+
+        Args:
+            agent: Synchronous agent to wrap (a default one is built if omitted).
+            executor: Executor for decode/HeAR/classifier work. When omitted a
+                      thread pool of ASYNC_CPU_WORKERS threads is created and
+                      owned by this instance.
+            max_concurrency: Maximum number of triages in flight.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.agent = agent or AuraMedAgent()
+        self.max_concurrency = max_concurrency
+
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=ASYNC_CPU_WORKERS, thread_name_prefix="auramed-cpu"
+        )
+        self._generation_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="auramed-generate"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncAuraMedAgent":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Shut down the executors owned by this agent without blocking the loop."""
+        if self._closed:
+            return
+        self._closed = True
+
+        def _shutdown():
+            self._generation_executor.shutdown(wait=True)
+            if self._owns_executor:
+                self._executor.shutdown(wait=True)
+
+        await asyncio.get_running_loop().run_in_executor(None, _shutdown)
+
+    async def apredict(self, audio_path: AudioSource, vitals: PatientVitals) -> TriageResult:
+        """
+        Async equivalent of `AuraMedAgent.predict`.
+
+        Safety overrides, input validation, INCONCLUSIVE handling and WHO
+        protocol enrichment behave exactly as in the synchronous agent, and
+        each request runs under its own Deadline of MAX_INFERENCE_TIME_SEC
+        (time spent waiting for the generation slot counts against it).
+
+        Raises:
+            ValueError: If inputs are invalid.
+            FileNotFoundError: If the audio file doesn't exist.
+            RuntimeError: If the pipeline fails or the agent is closed.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncAuraMedAgent is closed")
+
+        async with self._semaphore:
+            start_time = time.perf_counter()
+
+            # H1: Safety Check First (Architecture Mandate)
+            override = self.agent._check_safety(vitals)
+            if override is not None:
+                return self.agent._finalize_result(override, start_time)
+
+            # H2: Input Validation
+            self.agent._validate_audio(audio_path)
+
+            loop = asyncio.get_running_loop()
+            deadline = Deadline()
+            try:
+                prompt = await loop.run_in_executor(
+                    self._executor, self._under_deadline, deadline, self._prepare, audio_path, vitals
+                )
+                result = await loop.run_in_executor(
+                    self._generation_executor,
+                    self._under_deadline,
+                    deadline,
+                    self.agent.medgemma_reasoning.generate_from_prompt,
+                    prompt,
+                    vitals
+                )
+
+                # H5: Protocol Enforcement - Override/Enrich with standard WHO actions
+                result.action_recommendation = WHORespiratoryProtocol.get_action(result.status, vitals.age_months)
+                return self.agent._finalize_result(result, start_time, deadline)
+
+            except LowQualityError as e:
+                result = self.agent._inconclusive_result(e, vitals)
+                return self.agent._finalize_result(result, start_time, deadline)
+            except Exception as e:
+                # H4: Wrap generic errors with context
+                logger.exception("Async pipeline component failed")
+                raise RuntimeError(f"AsyncAuraMedAgent: Pipeline execution failed: {str(e)}") from e
+
+    async def apredict_many(self, requests: Sequence[Tuple[AudioSource, PatientVitals]]) -> List[TriageResult]:
+        """Run `apredict` for every request concurrently, preserving input order."""
+        return list(await asyncio.gather(
+            *(self.apredict(audio_path, vitals) for audio_path, vitals in requests)
+        ))
+
+    @staticmethod
+    def _under_deadline(deadline: Deadline, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn` on an executor thread with the request's deadline active."""
+        # run_in_executor does not carry context variables to the worker thread
+        with deadline.activate():
+            return fn(*args)
+
+    def _prepare(self, audio_path: AudioSource, vitals: PatientVitals) -> PreparedPrompt:
+        """CPU stage: decode + HeAR encode + classifier/prompt build."""
+        logger.info("Processing audio file: %s", describe_audio_source(audio_path))
+        embedding: torch.Tensor = self.agent.hear_encoder.encode(audio_path)
+        with deadline_stage("classifier"):
+            return self.agent.medgemma_reasoning.build_prompt(embedding, vitals)
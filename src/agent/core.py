@@ -1,15 +1,24 @@
 import time
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from src.models.hear_encoder import HeAREncoder
 from src.models.medgemma import MedGemmaReasoning
+from src.models.embedding_cache import EmbeddingCache
 from src.agent.safety import SafetyGuard
-from src.datatypes import PatientVitals, TriageResult, TriageStatus, DangerSignException, LowQualityError
+from src.datatypes import PatientVitals, TriageResult, TriageStatus, TriagePath, DangerSignException, LowQualityError
 from src.agent.protocols import WHORespiratoryProtocol
-from src.config import MAX_INFERENCE_TIME_SEC
+from src.agent.deadline import Deadline
+from src.config import MAX_INFERENCE_TIME_SEC, HEAR_CACHE_DIR
 from src.utils.resource_audit import audit_resources
+from src.utils.audio import AudioSource, describe_audio_source
+
+if TYPE_CHECKING:
+    from src.models.registry import ModelRegistry
+    from src.models.hear_stream import HeARStreamSession
 
 logger = logging.getLogger(__name__)
 
@@ -19,23 +28,50 @@ class AuraMedAgent:
     The main orchestrator for the AuraMed diagnostic pipeline.
     
     Encapsulates HeAREncoder and MedGemmaReasoning components,
-    providing a single `predict()` interface for end-users.
+    providing a single `predict()` interface for end-users and
+    `predict_batch()` for whole clinic queues.
     """
     
     def __init__(
         self,
         hear_encoder: Optional[HeAREncoder] = None,
-        medgemma_reasoning: Optional[MedGemmaReasoning] = None
+        medgemma_reasoning: Optional[MedGemmaReasoning] = None,
+        registry: Optional["ModelRegistry"] = None
     ):
         """
         Initialize the AuraMedAgent.
+        
+        Args:
+            hear_encoder: Encoder to use (injected instances take precedence).
+            medgemma_reasoning: Reasoning engine to use.
+            registry: Optional ModelRegistry. When given, components that are
+                      not injected are shared handles from the registry, so
+                      several agents in one process load each model once.
+        
+        Without a registry, the default HeAREncoder is given its own
+        EmbeddingCache (persisted under HEAR_CACHE_DIR when configured).
         """
-        self.hear_encoder = hear_encoder or HeAREncoder()
-        self.medgemma_reasoning = medgemma_reasoning or MedGemmaReasoning()
+        if registry is not None:
+            self.hear_encoder = hear_encoder or registry.hear_encoder()
+            self.medgemma_reasoning = medgemma_reasoning or registry.medgemma_reasoning()
+        else:
+            self.hear_encoder = hear_encoder or HeAREncoder(cache=EmbeddingCache(persist_dir=HEAR_CACHE_DIR))
+            self.medgemma_reasoning = medgemma_reasoning or MedGemmaReasoning()
         logger.info("AuraMedAgent initialized successfully.")
 
-    def _finalize_result(self, result: TriageResult, start_time: float) -> TriageResult:
-        """Calculate latency and attach usage stats to the result."""
+    @property
+    def embedding_cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters of the HeAR embedding cache (empty if caching is disabled)."""
+        cache = getattr(self.hear_encoder, "cache", None)
+        return cache.stats() if isinstance(cache, EmbeddingCache) else {}
+
+    def _finalize_result(
+        self,
+        result: TriageResult,
+        start_time: float,
+        deadline: Optional[Deadline] = None
+    ) -> TriageResult:
+        """Calculate latency and attach usage stats (and stage timings) to the result."""
         end_time = time.perf_counter()
         latency_sec = round(end_time - start_time, 3)
         
@@ -43,29 +79,41 @@ class AuraMedAgent:
         if result.usage_stats is None:
             result.usage_stats = {}
             
+        max_allowed_sec = deadline.total_sec if deadline is not None else MAX_INFERENCE_TIME_SEC
         result.usage_stats.update({
             "latency_sec": latency_sec,
-            "max_allowed_sec": MAX_INFERENCE_TIME_SEC
+            "max_allowed_sec": max_allowed_sec
         })
+        if deadline is not None:
+            result.usage_stats.update(deadline.usage_stats())
         
         logger.info("Prediction complete. Status: %s, Latency: %.3fs", result.status.value, latency_sec)
         
-        if latency_sec > MAX_INFERENCE_TIME_SEC:
+        if latency_sec > max_allowed_sec:
             logger.warning(
                 "Latency (%.2fs) exceeded threshold (%.2fs)",
-                latency_sec, MAX_INFERENCE_TIME_SEC
+                latency_sec, max_allowed_sec
             )
         return result
 
     @audit_resources
-    def predict(self, audio_path: str, vitals: PatientVitals) -> TriageResult:
+    def predict(self, audio_path: AudioSource, vitals: PatientVitals) -> TriageResult:
         """
         Run the full diagnostic pipeline.
         
         Orchestrates: Audio -> HeAR Encoder -> MedGemma Reasoning -> TriageResult.
         
+        Runs under a Deadline of MAX_INFERENCE_TIME_SEC with per-stage budgets
+        (decode, HeAR, classifier, generation). If the budget runs out,
+        generation is stopped and the WHO rule-based path answers instead;
+        such results are flagged with TriagePath.DEADLINE_FALLBACK and
+        usage_stats["deadline_exceeded"].
+        
         Args:
-            audio_path: Path to the audio file (.wav) containing cough recording.
+            audio_path: Path to the audio file (.wav) containing cough recording,
+                        or the recording in memory: raw file bytes, a binary
+                        file-like object, or a decoded (waveform, sample_rate)
+                        pair. In-memory input is never written to disk.
             vitals: Patient vitals including age, respiratory rate, and danger signs.
             
         Returns:
@@ -79,51 +127,200 @@ class AuraMedAgent:
         start_time = time.perf_counter()
         
         # H1: Safety Check First (Architecture Mandate)
-        if not isinstance(vitals, PatientVitals):
-            raise ValueError("vitals must be an instance of PatientVitals")
-            
-        try:
-            SafetyGuard.check(vitals)
-        except DangerSignException as e:
-            logger.warning("Safety Override Triggered: %s", str(e))
-            result = TriageResult(
-                status=TriageStatus.RED,
-                confidence=1.0,
-                reasoning=str(e),
-                action_recommendation=WHORespiratoryProtocol.get_action(TriageStatus.RED, vitals.age_months)
-            )
-            return self._finalize_result(result, start_time)
+        override = self._check_safety(vitals)
+        if override is not None:
+            return self._finalize_result(override, start_time)
 
         # H2: Input Validation
-        if not audio_path:
-            raise ValueError("audio_path must be provided")
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        self._validate_audio(audio_path)
 
+        deadline = Deadline()
         try:
-            # Step 1: Extract audio embeddings via HeAR
-            logger.info("Processing audio file: %s", audio_path)
-            embedding = self.hear_encoder.encode(audio_path)
-            
-            # Step 2: Generate clinical reasoning via MedGemma
-            logger.info("Generating clinical reasoning for patient: age=%s mo, RR=%s", vitals.age_months, vitals.respiratory_rate)
-            result = self.medgemma_reasoning.generate(embedding, vitals)
+            with deadline.activate():
+                # Step 1: Extract audio embeddings via HeAR
+                logger.info("Processing audio file: %s", describe_audio_source(audio_path))
+                embedding = self.hear_encoder.encode(audio_path)
+                
+                # Step 2: Generate clinical reasoning via MedGemma
+                logger.info("Generating clinical reasoning for patient: age=%s mo, RR=%s", vitals.age_months, vitals.respiratory_rate)
+                result = self.medgemma_reasoning.generate(embedding, vitals)
             
             # H5: Protocol Enforcement - Override/Enrich with standard WHO actions
             result.action_recommendation = WHORespiratoryProtocol.get_action(result.status, vitals.age_months)
             
-            return self._finalize_result(result, start_time)
+            return self._finalize_result(result, start_time, deadline)
 
         except LowQualityError as e:
-            logger.warning("Audio Quality Error: %s", str(e))
-            result = TriageResult(
-                status=TriageStatus.INCONCLUSIVE,
-                confidence=0.0,
-                reasoning=f"Inconclusive: {str(e)}. Please re-record in a quieter environment.",
-                action_recommendation=WHORespiratoryProtocol.get_action(TriageStatus.INCONCLUSIVE, vitals.age_months)
-            )
-            return self._finalize_result(result, start_time)
+            result = self._inconclusive_result(e, vitals)
+            return self._finalize_result(result, start_time, deadline)
         except Exception as e:
             # H4: Wrap generic errors with context
             logger.exception("Pipeline component failed")
             raise RuntimeError(f"AuraMedAgent: Pipeline execution failed: {str(e)}") from e
+
+    @audit_resources
+    def predict_stream(self, session: "HeARStreamSession", vitals: PatientVitals) -> TriageResult:
+        """
+        Triage a live recording captured through a HeARStreamSession.
+        
+        The session has already embedded every full 2-second window while the
+        CHW was recording, so only the final window and reasoning remain.
+        
+        Args:
+            session: Streaming session opened with `hear_encoder.open_stream()`.
+            vitals: Patient vitals including age, respiratory rate, and danger signs.
+            
+        Returns:
+            TriageResult: The structured triage outcome.
+            
+        Raises:
+            ValueError: If inputs are invalid.
+            RuntimeError: If the pipeline fails with context.
+        """
+        start_time = time.perf_counter()
+        
+        # H1: Safety Check First (Architecture Mandate)
+        override = self._check_safety(vitals)
+        if override is not None:
+            return self._finalize_result(override, start_time)
+
+        deadline = Deadline()
+        try:
+            with deadline.activate():
+                embedding = session.finalize()
+                result = self.medgemma_reasoning.generate(embedding, vitals)
+            
+            # H5: Protocol Enforcement - Override/Enrich with standard WHO actions
+            result.action_recommendation = WHORespiratoryProtocol.get_action(result.status, vitals.age_months)
+            
+            return self._finalize_result(result, start_time, deadline)
+
+        except LowQualityError as e:
+            result = self._inconclusive_result(e, vitals)
+            return self._finalize_result(result, start_time, deadline)
+        except Exception as e:
+            # H4: Wrap generic errors with context
+            logger.exception("Streaming pipeline component failed")
+            raise RuntimeError(f"AuraMedAgent: Streaming pipeline execution failed: {str(e)}") from e
+
+    @audit_resources
+    def predict_batch(self, requests: Sequence[Tuple[AudioSource, PatientVitals]]) -> List[TriageResult]:
+        """
+        Run the diagnostic pipeline for a whole queue of patients.
+        
+        Safety overrides and input validation are applied per request exactly
+        as in `predict()`. The remaining recordings are encoded with a single
+        HeAR call, classified with a single ClinicalClassifier call and sent
+        through batched MedGemma generation.
+        
+        Args:
+            requests: Sequence of (audio, vitals) pairs; audio as in `predict()`.
+            
+        Returns:
+            List[TriageResult]: One result per request, in input order. The
+            reported latency is the wall time of the whole batch, which runs
+            under one Deadline scaled by the number of recordings it encodes
+            (see `Deadline.for_batch`), so every request keeps its own budget.
+            
+        Raises:
+            ValueError: If any input is invalid.
+            FileNotFoundError: If any audio file doesn't exist.
+            RuntimeError: If the pipeline fails with context.
+        """
+        start_time = time.perf_counter()
+        results: List[Optional[TriageResult]] = [None] * len(requests)
+        
+        pending = []
+        for i, (audio_path, vitals) in enumerate(requests):
+            override = self._check_safety(vitals)
+            if override is not None:
+                results[i] = override
+                continue
+            self._validate_audio(audio_path)
+            pending.append(i)
+
+        deadline = Deadline.for_batch(len(pending))
+        try:
+            if pending:
+                logger.info("Processing batch of %d audio files", len(pending))
+                with deadline.activate():
+                    encoded = self.hear_encoder.encode_batch([requests[i][0] for i in pending])
+                
+                to_generate = []
+                for i, outcome in zip(pending, encoded):
+                    vitals = requests[i][1]
+                    if isinstance(outcome, LowQualityError):
+                        results[i] = self._inconclusive_result(outcome, vitals)
+                    else:
+                        to_generate.append((i, outcome))
+                
+                if to_generate:
+                    with deadline.activate():
+                        generated = self.medgemma_reasoning.generate_batch(
+                            [embedding for _, embedding in to_generate],
+                            [requests[i][1] for i, _ in to_generate]
+                        )
+                    for (i, _), result in zip(to_generate, generated):
+                        # H5: Protocol Enforcement - Override/Enrich with standard WHO actions
+                        result.action_recommendation = WHORespiratoryProtocol.get_action(
+                            result.status, requests[i][1].age_months
+                        )
+                        results[i] = result
+        except Exception as e:
+            # H4: Wrap generic errors with context
+            logger.exception("Batch pipeline component failed")
+            raise RuntimeError(f"AuraMedAgent: Batch pipeline execution failed: {str(e)}") from e
+        
+        return [self._finalize_result(result, start_time, deadline) for result in results]
+
+    def _check_safety(self, vitals: PatientVitals) -> Optional[TriageResult]:
+        """
+        Validate vitals and apply the danger-sign override.
+        
+        Returns:
+            A RED TriageResult if danger signs are present, otherwise None.
+            
+        Raises:
+            ValueError: If vitals is not a PatientVitals instance.
+        """
+        if not isinstance(vitals, PatientVitals):
+            raise ValueError("vitals must be an instance of PatientVitals")
+            
+        try:
+            SafetyGuard.check(vitals)
+        except DangerSignException as e:
+            logger.warning("Safety Override Triggered: %s", str(e))
+            return TriageResult(
+                status=TriageStatus.RED,
+                confidence=1.0,
+                reasoning=str(e),
+                action_recommendation=WHORespiratoryProtocol.get_action(TriageStatus.RED, vitals.age_months),
+                triage_path=TriagePath.SAFETY_OVERRIDE
+            )
+        return None
+
+    @staticmethod
+    def _validate_audio(audio_path: AudioSource) -> None:
+        """Raise if the audio input is missing or unsupported, or is a path that does not exist."""
+        if audio_path is None or (isinstance(audio_path, (str, bytes, bytearray)) and not audio_path):
+            raise ValueError("audio_path must be provided")
+        if isinstance(audio_path, (str, os.PathLike)):
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        elif isinstance(audio_path, tuple):
+            if len(audio_path) != 2 or not isinstance(audio_path[0], np.ndarray):
+                raise ValueError("Decoded audio must be a (waveform, sample_rate) pair")
+        elif not isinstance(audio_path, (bytes, bytearray, memoryview)) and not hasattr(audio_path, "read"):
+            raise ValueError(f"Unsupported audio input of type {type(audio_path).__name__}")
+
+    @staticmethod
+    def _inconclusive_result(error: LowQualityError, vitals: PatientVitals) -> TriageResult:
+        """Build the INCONCLUSIVE result returned when the audio quality gate fails."""
+        logger.warning("Audio Quality Error: %s", str(error))
+        return TriageResult(
+            status=TriageStatus.INCONCLUSIVE,
+            confidence=0.0,
+            reasoning=f"Inconclusive: {str(error)}. Please re-record in a quieter environment.",
+            action_recommendation=WHORespiratoryProtocol.get_action(TriageStatus.INCONCLUSIVE, vitals.age_months),
+            triage_path=TriagePath.QUALITY_GATE
+        )
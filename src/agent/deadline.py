@@ -0,0 +1,132 @@
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Mapping, Optional
+
+from src.config import MAX_INFERENCE_TIME_SEC, STAGE_BUDGETS_SEC
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages with a time budget, in execution order
+STAGES = ("decode", "hear", "classifier", "generation")
+
+_active_deadline: ContextVar[Optional["Deadline"]] = ContextVar("auramed_deadline", default=None)
+
+
+class Deadline:
+    """
+    End-to-end time budget for one `predict` call.
+
+    Each stage gets its configured budget plus any slack left by earlier
+    stages: the time allowed for a stage is whatever remains of the total
+    after reserving the budgets of the stages that follow it. Generation,
+    the last stage, therefore receives all the remaining time.
+
+    The deadline is activated for the duration of a predict call so that the
+    encoder and reasoning engine can consult it without changing their
+    call signatures:
+
+        deadline = Deadline()
+        with deadline.activate():
+            embedding = encoder.encode(path)       # times "decode" and "hear"
+            result = reasoning.generate(embedding, vitals)
+    """
+
+    def __init__(
+        self,
+        total_sec: float = MAX_INFERENCE_TIME_SEC,
+        budgets: Optional[Mapping[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.total_sec = total_sec
+        self.budgets: Dict[str, float] = dict(budgets or STAGE_BUDGETS_SEC)
+        self._clock = clock
+        self.started_at = clock()
+        self.timings: Dict[str, float] = {}
+        self.overruns = []
+        self.degraded = False
+
+    @classmethod
+    def for_batch(
+        cls,
+        size: int,
+        total_sec: float = MAX_INFERENCE_TIME_SEC,
+        budgets: Optional[Mapping[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ) -> "Deadline":
+        """
+        Deadline for `size` requests processed together (e.g. `predict_batch`).
+
+        The total and every stage budget are multiplied by the batch size, so
+        each request keeps its own share instead of the whole batch competing
+        for a single request's budget.
+        """
+        scale = max(1, size)
+        budgets = budgets or STAGE_BUDGETS_SEC
+        return cls(
+            total_sec=total_sec * scale,
+            budgets={name: budget * scale for name, budget in budgets.items()},
+            clock=clock
+        )
+
+    @staticmethod
+    def current() -> Optional["Deadline"]:
+        """Return the deadline active in this context, if any."""
+        return _active_deadline.get()
+
+    @contextmanager
+    def activate(self) -> Iterator["Deadline"]:
+        """Make this the current deadline for the enclosed block."""
+        token = _active_deadline.set(self)
+        try:
+            yield self
+        finally:
+            _active_deadline.reset(token)
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.total_sec - self.elapsed())
+
+    def budget_for(self, stage: str) -> float:
+        """Seconds the given stage may use before later stages are squeezed."""
+        later = STAGES[STAGES.index(stage) + 1:] if stage in STAGES else ()
+        reserve = sum(self.budgets.get(name, 0.0) for name in later)
+        return max(0.0, self.remaining() - reserve)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[float]:
+        """Time a stage, yielding its budget and recording any overrun."""
+        budget = self.budget_for(name)
+        start = self._clock()
+        try:
+            yield budget
+        finally:
+            spent = self._clock() - start
+            self.timings[name] = self.timings.get(name, 0.0) + spent
+            if spent > budget:
+                self.overruns.append(name)
+                logger.warning("Stage '%s' overran its budget (%.2fs > %.2fs)", name, spent, budget)
+
+    def usage_stats(self) -> Dict[str, float]:
+        """Per-stage timings and degradation flag for TriageResult.usage_stats."""
+        stats = {f"stage_{name}_sec": round(spent, 3) for name, spent in self.timings.items()}
+        stats["deadline_exceeded"] = 1.0 if self.degraded else 0.0
+        return stats
+
+
+@contextmanager
+def deadline_stage(name: str) -> Iterator[Optional[float]]:
+    """
+    Time `name` against the active deadline, if any.
+
+    Yields the stage budget in seconds, or None when no deadline is active.
+    """
+    deadline = Deadline.current()
+    if deadline is None:
+        yield None
+        return
+    with deadline.stage(name) as budget:
+        yield budget
@@ -0,0 +1,260 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.agent.core import AuraMedAgent
+from src.agent.protocols import WHORespiratoryProtocol
+from src.agent.deadline import Deadline, deadline_stage
+from src.datatypes import PatientVitals, TriageResult, LowQualityError
+from src.utils.audio import AudioSource
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stage names, in execution order
+STAGES = ("decode", "encode", "prompt", "generate", "finalize")
+
+_SHUTDOWN = object()
+
+
+@dataclass
+class _Job:
+    """A triage request travelling through the pipeline."""
+    audio_path: AudioSource
+    vitals: PatientVitals
+    future: Future
+    start_time: float
+    payload: Any = None
+    result: Optional[TriageResult] = None
+    deadline: Optional[Deadline] = None
+
+
+@dataclass
+class _StageStats:
+    processed: int = 0
+    busy_sec: float = 0.0
+    max_queue_depth: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class PipelinedTriageRunner:
+    """
+    Stage-pipelined executor for AuraMedAgent.
+
+    Each stage runs on its own thread and is connected to the next by a
+    bounded queue:
+
+        decode/resample → HeAR encode → classifier + prompt → generate → finalize
+
+    While request k is generating, request k+1 is already being decoded and
+    encoded, so the CPU and the accelerator are kept busy at the same time.
+    The bounded queues provide back-pressure: a slow generation stage stalls
+    upstream stages instead of accumulating decoded audio in memory.
+
+    Every request runs under its own Deadline, started at `submit` and
+    activated around each of its stages, so time spent queued between stages
+    counts against its MAX_INFERENCE_TIME_SEC budget as in `predict`.
+
+    Usage:
+        with PipelinedTriageRunner(agent) as runner:
+            results = runner.run(queue)
+            print(runner.stats())
+    """
+
+    def __init__(self, agent: Optional[AuraMedAgent] = None, queue_size: int = 2):
+        """
+        Initialize the runner.
+
+        Args:
+            agent: Agent whose encoder and reasoning engine are used.
+            queue_size: Capacity of each inter-stage queue.
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.agent = agent or AuraMedAgent()
+        self.queue_size = queue_size
+
+        self._queues: Dict[str, queue.Queue] = {name: queue.Queue(maxsize=queue_size) for name in STAGES}
+        self._stats: Dict[str, _StageStats] = {name: _StageStats() for name in STAGES}
+        self._handlers: Dict[str, Callable[[_Job], None]] = {
+            "decode": self._decode,
+            "encode": self._encode,
+            "prompt": self._prompt,
+            "generate": self._generate,
+            "finalize": self._finalize,
+        }
+        self._threads: List[threading.Thread] = []
+        self._started_at: Optional[float] = None
+
+    def __enter__(self) -> "PipelinedTriageRunner":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start one worker thread per stage."""
+        if self._threads:
+            return
+        self._started_at = time.perf_counter()
+        for index, name in enumerate(STAGES):
+            downstream = self._queues[STAGES[index + 1]] if index + 1 < len(STAGES) else None
+            thread = threading.Thread(
+                target=self._stage_loop,
+                args=(name, downstream),
+                name=f"auramed-{name}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("PipelinedTriageRunner started (%d stages, queue_size=%d)", len(STAGES), self.queue_size)
+
+    def close(self) -> None:
+        """Drain in-flight requests and stop the stage threads."""
+        if not self._threads:
+            return
+        self._queues[STAGES[0]].put(_SHUTDOWN)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, audio_path: AudioSource, vitals: PatientVitals) -> "Future[TriageResult]":
+        """
+        Enqueue one triage request.
+
+        Safety overrides and input validation are applied immediately, as in
+        `AuraMedAgent.predict`. Blocks while the decode queue is full.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            FileNotFoundError: If the audio file doesn't exist.
+        """
+        if not self._threads:
+            raise RuntimeError("PipelinedTriageRunner is not started")
+
+        future: Future = Future()
+        job = _Job(audio_path=audio_path, vitals=vitals, future=future, start_time=time.perf_counter())
+
+        # H1: Safety Check First (Architecture Mandate)
+        job.result = self.agent._check_safety(vitals)
+        if job.result is None:
+            # H2: Input Validation
+            self.agent._validate_audio(audio_path)
+            job.deadline = Deadline()
+
+        self._queues[STAGES[0]].put(job)
+        return future
+
+    def run(self, requests: Sequence[Tuple[AudioSource, PatientVitals]]) -> List[TriageResult]:
+        """
+        Triage a whole queue through the pipeline and return results in order.
+
+        Raises:
+            RuntimeError: If any request fails with a pipeline error.
+        """
+        started_here = not self._threads
+        if started_here:
+            self.start()
+        try:
+            futures = [self.submit(audio_path, vitals) for audio_path, vitals in requests]
+            return [future.result() for future in futures]
+        finally:
+            if started_here:
+                self.close()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Report per-stage queue depth and utilisation.
+
+        Returns:
+            dict: stage -> {queue_depth, max_queue_depth, processed, busy_sec, utilisation},
+                  where utilisation is the fraction of wall time since start()
+                  the stage spent working.
+        """
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        report = {}
+        for name in STAGES:
+            stats = self._stats[name]
+            with stats.lock:
+                report[name] = {
+                    "queue_depth": self._queues[name].qsize(),
+                    "max_queue_depth": stats.max_queue_depth,
+                    "processed": stats.processed,
+                    "busy_sec": round(stats.busy_sec, 3),
+                    "utilisation": round(stats.busy_sec / elapsed, 3) if elapsed > 0 else 0.0,
+                }
+        return report
+
+    # ── Stage loop ──────────────────────────────────────────────────────
+
+    def _stage_loop(self, name: str, downstream: Optional[queue.Queue]) -> None:
+        inbox = self._queues[name]
+        stats = self._stats[name]
+        handler = self._handlers[name]
+
+        while True:
+            job = inbox.get()
+            if job is _SHUTDOWN:
+                if downstream is not None:
+                    downstream.put(_SHUTDOWN)
+                return
+
+            with stats.lock:
+                stats.max_queue_depth = max(stats.max_queue_depth, inbox.qsize() + 1)
+
+            # Failed jobs and jobs already resolved (safety override, quality
+            # gate) pass straight through to finalize
+            if not job.future.done() and (job.result is None or name == "finalize"):
+                busy_start = time.perf_counter()
+                try:
+                    if job.deadline is not None:
+                        with job.deadline.activate():
+                            handler(job)
+                    else:
+                        handler(job)
+                except LowQualityError as e:
+                    job.result = self.agent._inconclusive_result(e, job.vitals)
+                except Exception as e:
+                    # H4: Wrap generic errors with context
+                    logger.exception("Pipeline stage '%s' failed", name)
+                    job.future.set_exception(
+                        RuntimeError(f"PipelinedTriageRunner: Stage '{name}' failed: {str(e)}")
+                    )
+                with stats.lock:
+                    stats.busy_sec += time.perf_counter() - busy_start
+                    stats.processed += 1
+
+            if downstream is not None:
+                downstream.put(job)
+
+    # ── Stage handlers ──────────────────────────────────────────────────
+
+    def _decode(self, job: _Job) -> None:
+        """Look up the embedding cache, then load, resample, quality-gate and normalize."""
+        job.payload = self.agent.hear_encoder.decode(job.audio_path)
+
+    def _encode(self, job: _Job) -> None:
+        """Run HeAR over the decoded recording (a no-op on a cache hit)."""
+        job.payload = self.agent.hear_encoder.embed_decoded(job.payload)
+
+    def _prompt(self, job: _Job) -> None:
+        """Classify the embedding and build the MedGemma prompt."""
+        with deadline_stage("classifier"):
+            job.payload = self.agent.medgemma_reasoning.build_prompt(job.payload, job.vitals)
+
+    def _generate(self, job: _Job) -> None:
+        """Run MedGemma generation (or the rule-based fallback)."""
+        result = self.agent.medgemma_reasoning.generate_from_prompt(job.payload, job.vitals)
+        # H5: Protocol Enforcement - Override/Enrich with standard WHO actions
+        result.action_recommendation = WHORespiratoryProtocol.get_action(result.status, job.vitals.age_months)
+        job.result = result
+
+    def _finalize(self, job: _Job) -> None:
+        """Attach latency stats and resolve the caller's future."""
+        job.payload = None
+        job.future.set_result(self.agent._finalize_result(job.result, job.start_time, job.deadline))
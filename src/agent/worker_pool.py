@@ -0,0 +1,524 @@
+"""
+Multi-process serving for CPU-only edge boxes.
+
+A single Python process cannot keep every core busy with the numpy, librosa
+and TensorFlow parts of the pipeline. TriageWorkerPool forks one "zygote"
+process that loads the models once (through a ModelRegistry) and then forks
+the N workers, including replacements for workers that die or hang. The
+workers inherit the read-only weights copy-on-write instead of each loading
+their own copy.
+
+Forking a process that has other threads running, or that has run
+TensorFlow/torch inference, can deadlock the child on a lock some thread
+held at fork time. So the zygote is forked before the pool starts its own
+threads and before any model is loaded in the parent. It stays
+single-threaded and never runs inference. Each worker warms its models
+itself after the fork. Start the pool from the main thread, before the
+process starts threads of its own.
+
+Each worker has its own socket to the parent instead of sharing queues
+with the other workers, so killing a stuck worker cannot leave a shared
+queue lock held.
+
+Fork-based sharing requires the 'fork' start method (Linux). CUDA contexts
+do not survive fork, so the pool is intended for CPU-only deployments.
+"""
+
+import gc
+import os
+import time
+import signal
+import socket
+import logging
+import threading
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing import reduction
+from multiprocessing.connection import Connection, wait
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.agent.core import AuraMedAgent
+from src.models.registry import ModelRegistry, HEAR, CLASSIFIER, PROJECTION, MEDGEMMA
+from src.datatypes import PatientVitals, TriageResult
+from src.config import WORKER_POOL_SIZE, WORKER_HEARTBEAT_TIMEOUT_SEC, WORKER_JOB_TIMEOUT_SEC
+from src.utils.audio import AudioSource
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL_SEC = 0.5
+_STOP = None
+_IDLE = -1
+
+
+def _zygote_main(registry, preload, control, heartbeats) -> None:
+    """Zygote loop: load the models once, then fork a worker per request."""
+    # Exited workers are reaped at once; the parent sees them exit through their socket
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    # No inference here (not even HEAR_WARMUP_AT_LOAD): the workers warm up
+    registry.defer_warmup = True
+    try:
+        for name in preload:
+            registry.get(name)
+        # The shared batcher runs a thread: stop it here and restart it per worker
+        hear = registry.get(HEAR) if registry.is_loaded(HEAR) else None
+        shared_batching = getattr(hear, "batcher", None) is not None
+        if shared_batching:
+            hear.disable_shared_batching()
+    except Exception as e:
+        control.send(("error", RuntimeError(f"TriageWorkerPool: loading models failed: {e!r}")))
+        return
+    control.send(("ready", dict(registry.load_times)))
+
+    # Move everything allocated so far out of the GC's reach so collections
+    # in the workers don't touch (and copy) the shared pages.
+    gc.freeze()
+
+    while True:
+        try:
+            worker_id = control.recv()
+            if worker_id is _STOP:
+                return
+            fd = reduction.recv_handle(control)
+        except (EOFError, OSError):
+            # Parent is gone
+            return
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                control.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                _worker_main(worker_id, registry, preload, Connection(fd), heartbeats, shared_batching)
+            except BaseException:
+                logger.exception("Worker %d crashed", worker_id)
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(fd)
+        control.send(pid)
+
+
+def _worker_main(worker_id, registry, preload, conn, heartbeats, shared_batching) -> None:
+    """Worker loop: warm the inherited models, then serve jobs sent over `conn`."""
+    start = time.perf_counter()
+    registry.defer_warmup = False
+    if shared_batching:
+        registry.get(HEAR).enable_shared_batching()
+    registry.warmup(preload)
+    agent = AuraMedAgent(registry=registry)
+    conn.send(("ready", _IDLE, None, time.perf_counter() - start))
+
+    while True:
+        heartbeats[worker_id] = time.time()
+        try:
+            if not conn.poll(_POLL_INTERVAL_SEC):
+                continue
+            job = conn.recv()
+        except (EOFError, OSError):
+            # Pool is gone
+            return
+        if job is _STOP:
+            return
+
+        job_id, audio_path, vitals = job
+        start = time.perf_counter()
+        try:
+            result = agent.predict(audio_path, vitals)
+            message = ("done", job_id, result, time.perf_counter() - start)
+        except Exception as e:
+            message = ("error", job_id, e, time.perf_counter() - start)
+
+        try:
+            conn.send(message)
+        except OSError:
+            return
+        except Exception as e:
+            # Unpicklable exception: report it as text
+            conn.send(("error", job_id, RuntimeError(repr(e)), message[3]))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@dataclass
+class _Worker:
+    """Parent-side state of one worker process."""
+    pid: int
+    conn: Connection
+    # Job being served, or _IDLE
+    job_id: int = _IDLE
+    # When the current job (or the initial warmup) started; 0.0 when idle
+    busy_since: float = 0.0
+    # Socket closed: the process exited
+    exited: bool = False
+    # A thread is sending on `conn`, which must stay open until it is done
+    sending: bool = False
+
+
+class TriageWorkerPool:
+    """
+    Pool of forked triage workers sharing zygote-loaded models copy-on-write.
+
+    Provides health checks (process liveness, heartbeat, per-job timeout),
+    automatic restarts, and per-worker telemetry.
+
+    Usage:
+        with TriageWorkerPool(num_workers=4) as pool:
+            results = pool.map(queue)
+            print(pool.telemetry())
+    """
+
+    def __init__(
+        self,
+        num_workers: int = WORKER_POOL_SIZE,
+        registry: Optional[ModelRegistry] = None,
+        preload: Iterable[str] = (HEAR, CLASSIFIER, PROJECTION, MEDGEMMA),
+        heartbeat_timeout: float = WORKER_HEARTBEAT_TIMEOUT_SEC,
+        job_timeout: float = WORKER_JOB_TIMEOUT_SEC
+    ):
+        """
+        Initialize the pool (processes are forked by `start`).
+
+        Args:
+            num_workers: Number of worker processes.
+            registry: Registry whose models are shared with the workers. It
+                      should not have loaded models in this process yet.
+            preload: Registry models loaded by the zygote before forking.
+            heartbeat_timeout: Seconds an idle worker may go without a heartbeat.
+            job_timeout: Seconds a single job (or a new worker's warmup) may run
+                         before its worker is killed.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+
+        self.num_workers = num_workers
+        self.registry = registry or ModelRegistry()
+        self.preload = list(preload)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.job_timeout = job_timeout
+
+        self._ctx = mp.get_context("fork")
+        self._heartbeats = self._ctx.Array("d", num_workers, lock=False)
+        self._zygote: Optional[mp.Process] = None
+        self._control: Optional[Connection] = None
+
+        self._workers: List[Optional[_Worker]] = [None] * num_workers
+        # Killed workers whose connections the results thread has yet to close
+        self._retired: List[_Worker] = []
+        self._pending: Deque[Tuple[int, AudioSource, PatientVitals]] = deque()
+        self._futures: Dict[int, Future] = {}
+        self._telemetry: Dict[int, Dict[str, float]] = {
+            i: {"jobs": 0, "errors": 0, "busy_sec": 0.0, "last_latency_sec": 0.0, "restarts": 0}
+            for i in range(num_workers)
+        }
+        self._lock = threading.Lock()
+        self._next_job_id = 0
+        self._running = False
+        self._threads: List[threading.Thread] = []
+
+    def __enter__(self) -> "TriageWorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Fork the zygote, let it load the shared models, then fork the workers."""
+        if self._running:
+            return
+        if threading.active_count() > 1:
+            logger.warning(
+                "TriageWorkerPool started with %d threads running; the zygote may inherit "
+                "a lock held by one of them", threading.active_count()
+            )
+        loaded = [name for name in self.preload if self.registry.is_loaded(name)]
+        if loaded:
+            logger.warning("TriageWorkerPool: %s already loaded in the parent; the zygote "
+                           "inherits them instead of loading them single-threaded", loaded)
+
+        control, zygote_control = self._ctx.Pipe()
+        self._zygote = self._ctx.Process(
+            target=_zygote_main,
+            args=(self.registry, self.preload, zygote_control, self._heartbeats),
+            name="auramed-zygote",
+            daemon=True
+        )
+        self._zygote.start()
+        zygote_control.close()
+        self._control = control
+        try:
+            status, payload = control.recv()
+        except EOFError:
+            status, payload = "error", RuntimeError("TriageWorkerPool: zygote exited while loading models")
+        if status == "error":
+            self._zygote.join()
+            raise payload
+        logger.info("Worker pool zygote models ready: %s", payload)
+
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._collect_results, name="auramed-pool-results", daemon=True),
+            threading.Thread(target=self._monitor, name="auramed-pool-monitor", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info("TriageWorkerPool started with %d workers", self.num_workers)
+
+    def close(self) -> None:
+        """Finish the submitted jobs, then stop all workers and the zygote."""
+        if not self._running:
+            return
+        self._running = False
+        # The threads keep dispatching, collecting and restarting until every
+        # future is resolved (a stuck job is bounded by job_timeout)
+        for thread in self._threads:
+            thread.join()
+
+        with self._lock:
+            workers = [worker for worker in self._workers if worker is not None]
+            retired, self._retired = self._retired, []
+            pending, self._futures = self._futures, {}
+        for worker in retired:
+            worker.conn.close()
+        for worker in workers:
+            try:
+                worker.conn.send(_STOP)
+            except OSError:
+                pass
+        deadline = time.monotonic() + 5
+        for worker in workers:
+            while _pid_alive(worker.pid) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self._kill(worker.pid)
+            worker.conn.close()
+
+        try:
+            self._control.send(_STOP)
+        except OSError:
+            pass
+        self._zygote.join(timeout=5)
+        if self._zygote.is_alive():
+            self._zygote.terminate()
+            self._zygote.join()
+        self._control.close()
+
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("TriageWorkerPool closed before the job finished"))
+
+    def submit(self, audio_path: AudioSource, vitals: PatientVitals) -> "Future[TriageResult]":
+        """
+        Queue a triage job and return a future for its result.
+
+        In-memory audio is pickled to the worker, so pass bytes or a decoded
+        (waveform, sample_rate) pair rather than an open file object. Sending
+        it to an idle worker happens in this call and, if that worker has
+        stopped reading, blocks until the monitor replaces it.
+        """
+        if not self._running:
+            raise RuntimeError("TriageWorkerPool is not started")
+        future: Future = Future()
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._futures[job_id] = future
+            self._pending.append((job_id, audio_path, vitals))
+        self._dispatch()
+        return future
+
+    def map(self, requests: Sequence[Tuple[AudioSource, PatientVitals]]) -> List[TriageResult]:
+        """Triage every request across the pool, returning results in order."""
+        futures = [self.submit(audio_path, vitals) for audio_path, vitals in requests]
+        return [future.result() for future in futures]
+
+    def telemetry(self) -> Dict[int, Dict[str, float]]:
+        """
+        Per-worker telemetry.
+
+        Returns:
+            dict: worker id -> {pid, alive, busy, heartbeat_age_sec, jobs,
+                  errors, busy_sec, last_latency_sec, restarts}
+        """
+        now = time.time()
+        report = {}
+        with self._lock:
+            for worker_id, worker in enumerate(self._workers):
+                stats = dict(self._telemetry[worker_id])
+                stats.update({
+                    "pid": worker.pid if worker is not None else 0,
+                    "alive": bool(worker is not None and not worker.exited and _pid_alive(worker.pid)),
+                    "busy": worker is not None and worker.job_id != _IDLE,
+                    "heartbeat_age_sec": round(now - self._heartbeats[worker_id], 3),
+                    "busy_sec": round(stats["busy_sec"], 3),
+                })
+                report[worker_id] = stats
+        return report
+
+    # ── Internals ───────────────────────────────────────────────────────
+
+    def _spawn(self, worker_id: int) -> None:
+        """Have the zygote fork a worker connected to a fresh socket."""
+        parent_end, worker_end = socket.socketpair()
+        try:
+            self._control.send(worker_id)
+            reduction.send_handle(self._control, worker_end.fileno(), self._zygote.pid)
+            pid = self._control.recv()
+        finally:
+            worker_end.close()
+        self._heartbeats[worker_id] = time.time()
+        # Busy until the worker reports its warmup done
+        worker = _Worker(pid=pid, conn=Connection(parent_end.detach()), busy_since=time.time())
+        with self._lock:
+            self._workers[worker_id] = worker
+
+    @staticmethod
+    def _kill(pid: int) -> None:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def _dispatch(self) -> None:
+        """
+        Send pending jobs to idle workers. Call without the lock held.
+
+        Jobs are assigned under the lock but sent after releasing it: a send
+        to a hung worker can block until the monitor kills that worker, and
+        the monitor needs the lock to do so.
+        """
+        with self._lock:
+            assigned = []
+            for worker in self._workers:
+                if not self._pending:
+                    break
+                if worker is None or worker.exited or worker.busy_since:
+                    continue
+                job = self._pending.popleft()
+                worker.job_id = job[0]
+                worker.busy_since = time.time()
+                worker.sending = True
+                assigned.append((worker, job))
+
+        for worker, job in assigned:
+            try:
+                worker.conn.send(job)
+            except OSError:
+                # Died (or was killed) before taking the job: the monitor
+                # restarts it, and the job waits for another worker unless the
+                # restart has already failed it
+                with self._lock:
+                    worker.sending = False
+                    worker.exited = True
+                    if worker.job_id == job[0]:
+                        worker.job_id = _IDLE
+                        worker.busy_since = 0.0
+                    if job[0] in self._futures:
+                        self._pending.appendleft(job)
+                self._dispatch()
+            else:
+                with self._lock:
+                    worker.sending = False
+
+    def _collect_results(self) -> None:
+        while self._running or self._futures:
+            with self._lock:
+                # Only this thread reads the connections, so it closes the
+                # retired ones, once no send is still using them
+                closing = [worker for worker in self._retired if not worker.sending]
+                self._retired = [worker for worker in self._retired if worker.sending]
+                connections = {
+                    worker.conn: (worker_id, worker) for worker_id, worker in enumerate(self._workers)
+                    if worker is not None and not worker.exited
+                }
+            for worker in closing:
+                worker.conn.close()
+            ready = wait(list(connections), timeout=_POLL_INTERVAL_SEC)
+
+            for conn in ready:
+                worker_id, worker = connections[conn]
+                try:
+                    kind, job_id, payload, latency = conn.recv()
+                except (EOFError, OSError):
+                    with self._lock:
+                        worker.exited = True
+                    continue
+                self._handle(worker_id, worker, kind, job_id, payload, latency)
+
+    def _handle(self, worker_id: int, worker: _Worker, kind: str, job_id: int, payload, latency: float) -> None:
+        with self._lock:
+            worker.job_id = _IDLE
+            worker.busy_since = 0.0
+            future = None
+            if kind != "ready":
+                stats = self._telemetry[worker_id]
+                stats["jobs"] += 1
+                stats["busy_sec"] += latency
+                stats["last_latency_sec"] = round(latency, 3)
+                if kind == "error":
+                    stats["errors"] += 1
+                future = self._futures.pop(job_id, None)
+        self._dispatch()
+
+        if future is None or future.done():
+            return
+        if kind == "done":
+            future.set_result(payload)
+        else:
+            future.set_exception(payload)
+
+    def _monitor(self) -> None:
+        while self._running or self._futures:
+            time.sleep(_POLL_INTERVAL_SEC)
+            now = time.time()
+            for worker_id in range(self.num_workers):
+                with self._lock:
+                    worker = self._workers[worker_id]
+                if worker is None:
+                    continue
+                reason = None
+                if worker.exited or not _pid_alive(worker.pid):
+                    reason = "process exited"
+                elif worker.busy_since and now - worker.busy_since > self.job_timeout:
+                    task = "warmup" if worker.job_id == _IDLE else "job"
+                    reason = f"{task} exceeded {self.job_timeout:.0f}s"
+                elif not worker.busy_since and now - self._heartbeats[worker_id] > self.heartbeat_timeout:
+                    reason = "heartbeat lost"
+                if reason is not None:
+                    self._restart(worker_id, reason)
+
+    def _restart(self, worker_id: int, reason: str) -> None:
+        logger.warning("Restarting worker %d: %s", worker_id, reason)
+        with self._lock:
+            worker = self._workers[worker_id]
+            # No more jobs for it while it is replaced
+            worker.exited = True
+            job_id = worker.job_id
+            future = self._futures.pop(job_id, None) if job_id != _IDLE else None
+            self._telemetry[worker_id]["restarts"] += 1
+            if future is not None:
+                self._telemetry[worker_id]["errors"] += 1
+            self._retired.append(worker)
+        # A send blocked on this worker fails once the process is gone
+        self._kill(worker.pid)
+
+        try:
+            # Jobs go to the replacement once it reports ready; the monitor
+            # never sends, so a hung worker cannot block it
+            self._spawn(worker_id)
+        finally:
+            # Failed once the replacement is in place
+            if future is not None and not future.done():
+                future.set_exception(RuntimeError(f"TriageWorkerPool: worker {worker_id} failed ({reason})"))
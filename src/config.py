@@ -10,12 +10,69 @@ HAS_GPU = torch.cuda.is_available()
 MAX_RAM_GB = 4.0
 MAX_INFERENCE_TIME_SEC = 10.0
 
+# --- Per-Stage Time Budgets (seconds) ---
+# Budgets sum to less than MAX_INFERENCE_TIME_SEC; time a stage leaves unused
+# rolls over to the stages after it, so generation gets whatever remains.
+STAGE_BUDGETS_SEC = {
+    "decode": 1.0,
+    "hear": 2.0,
+    "classifier": 0.5,
+    "generation": 6.0,
+}
+# Below this much remaining time MedGemma is skipped for the rule-based path
+MIN_GENERATION_BUDGET_SEC = 1.0
+
+# --- Concurrency Budget ---
+# Resident footprint of the loaded models (INT4 MedGemma ~2.5GB + HeAR + SVM)
+# and the working set of one in-flight triage (decoded audio, chunks, prompt).
+MODEL_RESIDENT_RAM_GB = 3.0
+PER_REQUEST_RAM_GB = 0.25
+# Number of triages allowed in flight at once without exceeding MAX_RAM_GB
+MAX_CONCURRENT_TRIAGES = max(1, int((MAX_RAM_GB - MODEL_RESIDENT_RAM_GB) / PER_REQUEST_RAM_GB))
+# Worker threads for decode + HeAR + classifier in the async front-end
+ASYNC_CPU_WORKERS = min(MAX_CONCURRENT_TRIAGES, os.cpu_count() or 1)
+
+# --- Worker Pool (CPU-only multi-process serving) ---
+WORKER_POOL_SIZE = max(1, os.cpu_count() or 1)
+WORKER_HEARTBEAT_TIMEOUT_SEC = 15.0  # Idle worker silent for this long is restarted
+WORKER_JOB_TIMEOUT_SEC = 3 * MAX_INFERENCE_TIME_SEC  # Stuck job → worker is killed
+
+# --- Triage Server (python -m src.serve) ---
+SERVE_HOST = os.environ.get("AURA_SERVE_HOST", "0.0.0.0")  # Reachable from the clinic LAN
+SERVE_PORT = int(os.environ.get("AURA_SERVE_PORT", "8080"))
+SERVE_MAX_BATCH_SIZE = 8
+SERVE_MAX_BATCH_WAIT_MS = 25  # Max time the first request of a batch waits for company
+SERVE_MAX_BODY_BYTES = 8 * 1024 * 1024
+
 # --- Model Paths ---
 # MedGemma 1.5 4B-IT: latest generation (Gemma 3 based), stronger clinical
 # reasoning with expanded medical imaging + EHR understanding.
 # INT4 quantization (BitsAndBytes) brings effective VRAM to ~2.5GB,
 # fitting within Colab T4 and edge-deployment budgets.
 MEDGEMMA_MODEL_PATH = "google/medgemma-1.5-4b-it"
+HEAR_HF_MODEL_ID = "google/hear"
+
+# --- Local Model Store (offline-first) ---
+# Pinned artifacts are fetched once with `python -m src.models.model_store prefetch`
+# and always loaded from disk afterwards; loading never downloads unless
+# AURA_ALLOW_MODEL_DOWNLOAD=1 (the default only on Colab/Kaggle notebooks).
+MODEL_STORE_DIR = os.environ.get(
+    "AURA_MODEL_STORE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "aura-med", "models")
+)
+MODEL_STORE_ALLOW_DOWNLOAD = os.environ.get("AURA_ALLOW_MODEL_DOWNLOAD", "1" if IS_COLAB or IS_KAGGLE else "0") == "1"
+MODEL_STORE_VERIFY_CHECKSUMS = os.environ.get("AURA_MODEL_STORE_VERIFY", "0") == "1"  # Full SHA-256 at load (slow)
+# Artifact name -> (HuggingFace repo, pinned revision: a commit hash in production)
+MODEL_ARTIFACTS = {
+    "hear": (HEAR_HF_MODEL_ID, os.environ.get("AURA_HEAR_REVISION", "main")),
+    "medgemma": (MEDGEMMA_MODEL_PATH, os.environ.get("AURA_MEDGEMMA_REVISION", "main")),
+}
+
+# --- Confidence-Gated Fast Path ---
+# Unambiguous cases skip MedGemma: a confident ClinicalClassifier label that
+# agrees with a respiratory rate clearly on one side of the WHO age threshold.
+FAST_PATH_ENABLED = True
+FAST_PATH_MIN_CONFIDENCE = 0.90      # Minimum classifier probability
+FAST_PATH_RR_MARGIN_BPM = 5          # Minimum distance from the fast-breathing threshold
 
 # --- Dataset Paths ---
 if IS_COLAB:
@@ -26,6 +83,31 @@ else:
 # --- HeAR Audio Encoder Settings ---
 HEAR_EMBEDDING_DIM = 512             # Real HeAR output dimension
 HEAR_CHUNK_DURATION_SEC = 2.0        # HeAR processes 2-second segments
+HEAR_MAX_BATCH_SIZE = 16             # Max 2-second chunks per HeAR call (longer inputs are split)
+HEAR_HOP_DURATION_SEC = 2.0          # Chunk stride; < HEAR_CHUNK_DURATION_SEC gives overlapping chunks
+HEAR_POOLING = "mean"                # Chunk pooling: "mean" (valid-sample weighted), "max" or "energy"
+HEAR_SHARED_BATCHING = False         # Batch chunks across concurrent encode() calls (real model only)
+HEAR_BATCHER_MAX_WAIT_MS = 5         # Max time a chunk waits for a shared batch to fill
+
+# --- HeAR Runtime Backend ---
+# "savedmodel" (TensorFlow, needs a GPU box to load by default), or a converted
+# CPU runtime loaded from HEAR_BACKEND_PATH: "tflite" or "onnx"
+HEAR_BACKEND = os.environ.get("AURA_HEAR_BACKEND", "savedmodel")
+HEAR_BACKEND_PATH = os.environ.get("AURA_HEAR_BACKEND_PATH")
+HEAR_BACKEND_THREADS = int(os.environ.get("AURA_HEAR_BACKEND_THREADS", "0"))  # 0 = runtime default
+# Batch shapes HeAR is pre-traced and warmed for; batches are zero-padded up to
+# the next bucket (5 = one full 10 s clip, so the common case needs no padding)
+HEAR_BATCH_BUCKETS = (1, 2, 5, 8, 16)
+HEAR_WARMUP_AT_LOAD = True
+
+# --- HeAR Embedding Cache ---
+HEAR_CACHE_MAX_ENTRIES = 256         # In-memory LRU capacity (~0.5MB at 512 float32)
+HEAR_CACHE_SHARD_ROWS = 1024         # Embeddings per memory-mapped shard on disk
+HEAR_CACHE_DIR = os.environ.get("AURA_HEAR_CACHE_DIR")  # Persistent tier (disabled if unset)
+
+# --- Dataset Embedding Store (per-chunk, for validation / retraining) ---
+EMBEDDING_STORE_DIR = os.environ.get("AURA_EMBEDDING_STORE_DIR", os.path.join("data", "embeddings"))
+EMBEDDING_STORE_SHARD_ROWS = 4096    # Rows per memory-mapped shard (8MB at 512 float32)
 
 # --- Projection Layer Settings ---
 PROJECTION_INPUT_DIM = HEAR_EMBEDDING_DIM  # Match HeAR output
@@ -34,11 +116,30 @@ PROJECTION_INPUT_DIM = HEAR_EMBEDDING_DIM  # Match HeAR output
 SAMPLE_RATE = 16000
 MAX_AUDIO_DURATION_SEC = 10
 MIN_AUDIO_DURATION_SEC = 1.0
+AUDIO_BUFFER_POOL_SIZE = 8           # Idle padding buffers kept per (length, dtype)
+
+# --- Resampling (polyphase FIR, filter banks cached per rate pair) ---
+RESAMPLE_ZERO_CROSSINGS = 10         # Sinc zero crossings per side (quality vs. taps)
+RESAMPLE_KAISER_BETA = 5.0           # Kaiser window shape
+RESAMPLE_BLOCK_FRAMES = 8192         # Max output samples per phase block
+
+# --- Decode Pool (process-based, shared-memory outputs) ---
+DECODE_POOL_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Leave a core for HeAR
+DECODE_POOL_PREFETCH = 8             # Shared-memory slots = max recordings decoded ahead
 
 # --- Noise Gate Settings (RMS thresholds) ---
 NOISE_RMS_UPPER_THRESHOLD = 0.8
 NOISE_RMS_LOWER_THRESHOLD = 0.001
 
+# --- Per-Chunk Quality Gate ---
+# Chunks failing the RMS, clipping or SNR gate are dropped before HeAR; the
+# recording is rejected only when no chunk is usable.
+QUALITY_CHUNK_GATING = True
+QUALITY_FRAME_SEC = 0.025            # Frame length for energy variance / SNR
+QUALITY_CLIP_LEVEL = 0.99            # |sample| at or above this counts as clipped
+QUALITY_MAX_CLIPPING_RATIO = 0.01    # Max fraction of clipped samples per chunk
+QUALITY_MIN_SNR_DB = 0.0             # Min loud-vs-quiet frame energy ratio (0 disables)
+
 # --- Demo / Fallback Mode ---
 # Only use mock mode if no GPU is available (e.g., local dev without GPU)
 IS_DEMO_MODE = not HAS_GPU
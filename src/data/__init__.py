@@ -1,3 +1,4 @@
 from src.data.icbhi_loader import ICBHIDataset
+from src.data.embedding_store import EmbeddingStore
 
-__all__ = ["ICBHIDataset"]
+__all__ = ["ICBHIDataset", "EmbeddingStore"]
@@ -0,0 +1,216 @@
+"""
+Memory-mapped store of per-chunk HeAR embeddings for dataset-scale reuse.
+
+Validation runs and retraining embed the same ICBHI recordings over and
+over. The store keeps every chunk/cycle embedding of a recording as
+consecutive float32 rows in fixed-size memory-mapped shards, so a later run
+reads them back instead of calling HeAR, and random or range reads never
+load the whole store into RAM.
+
+    store = EmbeddingStore("data/embeddings")
+    entry = store.entry("101_1b1_Al_sc_Meditron", revision)
+    if entry is None:
+        entry = store.put("101_1b1_Al_sc_Meditron", revision, embeddings, offsets, labels)
+    X = store.read_range(entry.row, entry.row + entry.count)
+
+Storage is a ShardedRowStore (see src.utils.shard_store), so several jobs
+may fill one store on a shared Modal volume. Index records, one per
+(recording, model revision):
+    {"recording_id", "revision", "row", "count", "offsets", "labels"}
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import HEAR_EMBEDDING_DIM, EMBEDDING_STORE_SHARD_ROWS
+from src.utils.shard_store import ShardedRowStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoreEntry:
+    """
+    Index record of one recording's embeddings.
+
+    Attributes:
+        recording_id: Recording name (e.g. the ICBHI file stem).
+        revision: HeAR model revision the embeddings were computed with.
+        row: Global row of the first embedding.
+        count: Number of consecutive rows (one per chunk or cycle).
+        offsets: (start_sec, end_sec) of the audio behind each row.
+        labels: Optional per-row integer labels (e.g. ICBHI cycle annotations).
+    """
+    recording_id: str
+    revision: str
+    row: int
+    count: int
+    offsets: List[Tuple[float, float]]
+    labels: Optional[List[int]] = None
+
+    @property
+    def stop(self) -> int:
+        return self.row + self.count
+
+
+class EmbeddingStore:
+    """
+    Append-only per-chunk embedding store backed by memory-mapped shards.
+
+    Thread-safe, and process-safe where fcntl is available.
+    """
+
+    INDEX_FILE = ShardedRowStore.INDEX_FILE
+
+    def __init__(self, root: str, dim: int = HEAR_EMBEDDING_DIM, shard_rows: int = EMBEDDING_STORE_SHARD_ROWS):
+        """
+        Open (or create) a store.
+
+        Args:
+            root: Store directory.
+            dim: Embedding dimension.
+            shard_rows: Rows per memory-mapped shard.
+        """
+        self.root = root
+        self.dim = dim
+        self.shard_rows = shard_rows
+        self._entries: Dict[Tuple[str, str], StoreEntry] = {}
+        self._rows = ShardedRowStore(root, dim, shard_rows, self._on_record)
+        logger.info("Embedding store index loaded: %d recordings, %d rows from %s",
+                    len(self._entries), len(self._rows), self.root)
+
+    def _on_record(self, record: Dict[str, Any]) -> int:
+        record = dict(record, offsets=[tuple(offset) for offset in record["offsets"]])
+        entry = StoreEntry(**record)
+        self._entries[(entry.recording_id, entry.revision)] = entry
+        return entry.stop
+
+    # ── Index ───────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        """Total number of embedding rows."""
+        return len(self._rows)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return self.entry(*key) is not None
+
+    def refresh(self) -> None:
+        """Pick up recordings other processes have stored since the last look."""
+        self._rows.refresh()
+
+    def entry(self, recording_id: str, revision: str) -> Optional[StoreEntry]:
+        entry = self._entries.get((recording_id, revision))
+        if entry is None:
+            # Another process may have stored it since we last looked
+            self._rows.refresh()
+            entry = self._entries.get((recording_id, revision))
+        return entry
+
+    def entries(self, revision: Optional[str] = None) -> List[StoreEntry]:
+        """All index records (for one model revision if given), in row order."""
+        entries = [e for e in self._entries.values() if revision is None or e.revision == revision]
+        return sorted(entries, key=lambda e: e.row)
+
+    def rows(self, revision: str) -> np.ndarray:
+        """Global row numbers of every embedding computed with `revision`."""
+        entries = self.entries(revision)
+        if not entries:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(e.row, e.stop) for e in entries])
+
+    # ── Reads ───────────────────────────────────────────────────────────
+
+    def get(self, recording_id: str, revision: str) -> Optional[np.ndarray]:
+        """Return a copy of a recording's (count, dim) embeddings, or None."""
+        entry = self.entry(recording_id, revision)
+        if entry is None:
+            return None
+        return self.read_range(entry.row, entry.stop)
+
+    def read_range(self, start: int, stop: int) -> np.ndarray:
+        """
+        Read consecutive rows [start, stop) into a new (stop - start, dim) array.
+
+        Only the touched pages of the touched shards are read from disk.
+        """
+        return self._rows.read_range(start, stop)
+
+    def read_rows(self, rows: Sequence[int]) -> np.ndarray:
+        """
+        Read arbitrary rows (e.g. a shuffled training batch), in the given order.
+
+        Args:
+            rows: Global row numbers.
+
+        Returns:
+            np.ndarray: (len(rows), dim) float32 array.
+        """
+        return self._rows.read_rows(rows)
+
+    # ── Writes ──────────────────────────────────────────────────────────
+
+    def put(
+        self,
+        recording_id: str,
+        revision: str,
+        embeddings: np.ndarray,
+        offsets: Sequence[Tuple[float, float]],
+        labels: Optional[Sequence[int]] = None
+    ) -> StoreEntry:
+        """
+        Append a recording's per-chunk embeddings.
+
+        An existing entry for the same recording and revision (stored by this
+        or another process) is returned unchanged.
+
+        Args:
+            recording_id: Recording name.
+            revision: HeAR model revision.
+            embeddings: (count, dim) embeddings.
+            offsets: (start_sec, end_sec) per row.
+            labels: Optional integer label per row.
+
+        Returns:
+            StoreEntry: The index record.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        if len(offsets) != len(embeddings) or (labels is not None and len(labels) != len(embeddings)):
+            raise ValueError("offsets and labels must have one entry per embedding row")
+
+        with self._rows.writing():
+            existing = self._entries.get((recording_id, revision))
+            if existing is not None:
+                return existing
+
+            self._rows.append(embeddings, lambda row: asdict(StoreEntry(
+                recording_id=recording_id,
+                revision=revision,
+                row=row,
+                count=len(embeddings),
+                offsets=[(round(float(a), 3), round(float(b), 3)) for a, b in offsets],
+                labels=[int(label) for label in labels] if labels is not None else None,
+            )))
+            return self._entries[(recording_id, revision)]
+
+    def get_or_compute(
+        self,
+        recording_id: str,
+        revision: str,
+        compute: Callable[[], Tuple[np.ndarray, Sequence[Tuple[float, float]], Optional[Sequence[int]]]]
+    ) -> StoreEntry:
+        """
+        Return a recording's entry, computing and storing it on a miss.
+
+        Args:
+            recording_id: Recording name.
+            revision: HeAR model revision.
+            compute: Returns (embeddings, offsets, labels); only called on a miss.
+        """
+        entry = self.entry(recording_id, revision)
+        if entry is None:
+            embeddings, offsets, labels = compute()
+            entry = self.put(recording_id, revision, embeddings, offsets, labels)
+        return entry
@@ -18,6 +18,8 @@ import logging
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass
 
+import numpy as np
+
 from src.datatypes import PatientVitals, TriageStatus
 
 logger = logging.getLogger(__name__)
@@ -40,6 +42,76 @@ DEFAULT_VITALS_SICK = PatientVitals(age_months=540, respiratory_rate=28, danger_
 DEFAULT_VITALS_HEALTHY = PatientVitals(age_months=540, respiratory_rate=16, danger_signs=False) # Adult default
 
 
+# Cycle labels from the crackle/wheeze annotation flags (same order as ClinicalClassifier.LABELS)
+CYCLE_LABELS = ["Normal", "Crackle", "Wheeze", "Both"]
+
+
+@dataclass
+class RespiratoryCycle:
+    """One annotated breathing cycle of an ICBHI recording."""
+    start: float
+    end: float
+    label: int  # Index into CYCLE_LABELS
+
+
+def read_cycle_annotations(annotation_path: str) -> List[RespiratoryCycle]:
+    """
+    Parse an ICBHI annotation file (one "start end crackle wheeze" line per cycle).
+    
+    Args:
+        annotation_path: Path to the recording's .txt file.
+        
+    Returns:
+        List of cycles; malformed lines are skipped.
+    """
+    cycles = []
+    with open(annotation_path, "r") as f:
+        for line in f:
+            parts = line.strip().split()
+            if len(parts) < 4:
+                continue
+            try:
+                start, end = float(parts[0]), float(parts[1])
+                crackle, wheeze = int(parts[2]), int(parts[3])
+            except ValueError:
+                continue
+            # 0=Normal, 1=Crackle, 2=Wheeze, 3=Both
+            cycles.append(RespiratoryCycle(start=start, end=end, label=crackle + 2 * wheeze))
+    return cycles
+
+
+def cycle_windows(
+    audio: np.ndarray,
+    cycles: List[RespiratoryCycle],
+    sr: int,
+    window: int
+) -> Tuple[np.ndarray, List[RespiratoryCycle]]:
+    """
+    Cut each cycle out of a recording, trimmed or zero-padded to `window` samples.
+    
+    Args:
+        audio: The full recording.
+        cycles: Annotated cycles.
+        sr: Sample rate of `audio`.
+        window: Samples per output row (HeAR: 32000).
+        
+    Returns:
+        tuple: (array of shape (n, window), the n cycles kept). Cycles with no
+               audio (e.g. past the end of the file) are dropped.
+    """
+    rows, kept = [], []
+    for cycle in cycles:
+        segment = audio[int(cycle.start * sr):int(cycle.end * sr)][:window]
+        if len(segment) == 0:
+            continue
+        row = np.zeros(window, dtype=np.float32)
+        row[:len(segment)] = segment
+        rows.append(row)
+        kept.append(cycle)
+    windows = np.stack(rows) if rows else np.empty((0, window), dtype=np.float32)
+    return windows, kept
+
+
 @dataclass
 class ICBHISample:
     """A single sample from the ICBHI dataset."""
@@ -197,6 +269,15 @@ class ICBHIDataset:
         total = sum(len(v) for v in self.samples_by_diagnosis.values())
         logger.info("Indexed %d audio files across %d diagnoses", total, len(self.samples_by_diagnosis))
     
+    @staticmethod
+    def annotation_path(audio_path: str) -> str:
+        """Path of the cycle annotation file next to a recording."""
+        return os.path.splitext(audio_path)[0] + ".txt"
+    
+    def recordings(self) -> List[str]:
+        """All indexed audio paths, sorted."""
+        return sorted(path for files in self.samples_by_diagnosis.values() for path in files)
+    
     def get_diagnosis_counts(self) -> Dict[str, int]:
         """Return a dict of diagnosis -> number of audio files."""
         return {k: len(v) for k, v in sorted(self.samples_by_diagnosis.items())}
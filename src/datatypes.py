@@ -9,6 +9,14 @@ class TriageStatus(str, Enum):
     RED = "RED"
     INCONCLUSIVE = "INCONCLUSIVE"
 
+class TriagePath(str, Enum):
+    SAFETY_OVERRIDE = "SAFETY_OVERRIDE"  # SafetyGuard danger-sign override
+    QUALITY_GATE = "QUALITY_GATE"        # Audio rejected before inference
+    FAST_PATH = "FAST_PATH"              # Unambiguous case resolved without MedGemma
+    LLM = "LLM"                          # MedGemma generation
+    RULE_BASED = "RULE_BASED"            # Deterministic WHO rules (no LLM available)
+    DEADLINE_FALLBACK = "DEADLINE_FALLBACK"  # WHO rules after the time budget ran out
+
 class AgeGroup(str, Enum):
     INFANT = "INFANT"            # 0-1 mo
     YOUNG_CHILD = "YOUNG_CHILD"  # 2-11 mo
@@ -50,10 +58,22 @@ class LowQualityError(Exception):
     """Raised when audio quality/duration is insufficient."""
     pass
 
+class AudioDecodeError(LowQualityError):
+    """Raised when a recording cannot be decoded (corrupt or unsupported audio)."""
+    pass
+
 class LowConfidenceError(Exception):
     """Raised when model confidence is below threshold."""
     pass
 
+class DeadlineExceeded(Exception):
+    """Raised when a pipeline stage exhausts its time budget."""
+    pass
+
+class ModelUnavailableError(Exception):
+    """Raised when a model artifact is missing from (or corrupt in) the local model store."""
+    pass
+
 class EdgeConstraintViolation(Exception):
     """Raised when resource usage exceeds edge limits."""
     pass
@@ -84,4 +104,5 @@ class TriageResult:
     reasoning: str
     usage_stats: Optional[Dict[str, float]] = None
     action_recommendation: Optional[str] = None
+    triage_path: Optional[TriagePath] = None
 
@@ -1,5 +1,7 @@
 from .hear_encoder import HeAREncoder
 from .medgemma import MedGemmaReasoning
 from .projection import ProjectionLayer
+from .embedding_cache import EmbeddingCache
+from .registry import ModelRegistry, get_model_registry
 
-__all__ = ["HeAREncoder", "MedGemmaReasoning", "ProjectionLayer"]
+__all__ = ["HeAREncoder", "MedGemmaReasoning", "ProjectionLayer", "EmbeddingCache", "ModelRegistry", "get_model_registry"]
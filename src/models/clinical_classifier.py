@@ -2,7 +2,7 @@ import os
 import joblib
 import numpy as np
 import torch
-from typing import Tuple
+from typing import List, Sequence, Tuple, Union
 
 class ClinicalClassifier:
     """
@@ -65,3 +65,37 @@ class ClinicalClassifier:
         confidence = probs[idx]
         
         return label, description, float(confidence)
+
+    def predict_batch(self, embeddings: Sequence[Union[torch.Tensor, np.ndarray]]) -> List[Tuple[str, str, float]]:
+        """
+        Classify several HeAR embeddings with a single scaler/SVM pass.
+        
+        Args:
+            embeddings: Sequence of (1, 512) or (512,) embeddings.
+            
+        Returns:
+            list: One (label, description, confidence) tuple per embedding.
+        """
+        if not self.model_loaded:
+            return [("Unknown", "Clinical model not loaded.", 0.0) for _ in embeddings]
+        if len(embeddings) == 0:
+            return []
+
+        rows = []
+        for embedding in embeddings:
+            if isinstance(embedding, torch.Tensor):
+                x = embedding.detach().cpu().numpy()
+            else:
+                x = np.asarray(embedding)
+            rows.append(x.reshape(1, -1))
+        
+        x_scaled = self.scaler.transform(np.concatenate(rows, axis=0))
+        
+        indices = self.svm.predict(x_scaled)
+        probs = self.svm.predict_proba(x_scaled)
+        
+        results = []
+        for row, idx in enumerate(indices):
+            label = self.LABELS[idx]
+            results.append((label, self.DESCRIPTIONS[label], float(probs[row][idx])))
+        return results
@@ -0,0 +1,211 @@
+"""
+Content-addressed cache for HeAR embeddings.
+
+Embeddings are keyed by the SHA-256 of the audio bytes together with the
+HeAR model revision and the segmentation parameters, so a re-submitted
+recording (e.g. after a vitals correction) skips decoding and HeAR
+inference entirely, while a model upgrade or a change in chunking never
+serves stale vectors.
+
+Two tiers:
+  - a bounded in-memory LRU
+  - an optional persistent tier: fixed-size float32 .npy shards opened as
+    memory maps, plus an append-only JSONL index (key → shard, row)
+
+The persistent tier is a ShardedRowStore (see src.utils.shard_store), so it
+may be shared by several processes (e.g. the forked TriageWorkerPool
+workers); readers pick up other processes' entries on a miss.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from src.config import HEAR_EMBEDDING_DIM, HEAR_CACHE_MAX_ENTRIES, HEAR_CACHE_SHARD_ROWS
+from src.utils.shard_store import ShardedRowStore
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK_BYTES = 1 << 20
+
+
+def hash_audio_file(audio_path: str) -> str:
+    """Return the SHA-256 hex digest of an audio file's bytes."""
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_audio_source(source: Union[str, memoryview, Tuple[np.ndarray, int]]) -> str:
+    """
+    Return the SHA-256 hex digest of a resolved audio source (see `resolve_audio_source`).
+
+    Raw bytes hash exactly like the file they came from, so an upload and
+    the same recording on disk share a cache entry. Decoded waveforms hash
+    their float32 samples and sample rate.
+    """
+    if isinstance(source, str):
+        return hash_audio_file(source)
+    digest = hashlib.sha256()
+    if isinstance(source, tuple):
+        waveform, sample_rate = source
+        digest.update(f"decoded:{sample_rate}:".encode())
+        digest.update(np.ascontiguousarray(waveform, dtype=np.float32).data)
+    else:
+        digest.update(source)
+    return digest.hexdigest()
+
+
+class _ShardedEmbeddingStore:
+    """
+    Persistent tier: one ShardedRowStore row per key.
+
+    Index records are {"key", "shard", "row"}, with the row's position inside
+    its shard.
+    """
+
+    def __init__(self, root: str, dim: int, shard_rows: int):
+        self.shard_rows = shard_rows
+        self._index: Dict[str, int] = {}
+        self._rows = ShardedRowStore(root, dim, shard_rows, self._on_record)
+        if self._index:
+            logger.info("Embedding cache index loaded: %d entries from %s", len(self._index), root)
+
+    def _on_record(self, record: Dict[str, Any]) -> int:
+        row = int(record["shard"]) * self.shard_rows + int(record["row"])
+        self._index[record["key"]] = row
+        return row + 1
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._index.get(key)
+        if row is None:
+            # Another process may have stored it since we last looked
+            self._rows.refresh()
+            row = self._index.get(key)
+            if row is None:
+                return None
+        return self._rows.read_range(row, row + 1)
+
+    def put(self, key: str, embedding: np.ndarray) -> None:
+        if key in self._index:
+            return
+        with self._rows.writing():
+            if key in self._index:
+                return
+            self._rows.append(embedding, lambda row: {
+                "key": key, "shard": row // self.shard_rows, "row": row % self.shard_rows
+            })
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU + optional on-disk) cache of (1, 512) HeAR embeddings.
+
+    Thread-safe; counters are exposed through `stats()`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = HEAR_CACHE_MAX_ENTRIES,
+        persist_dir: Optional[str] = None,
+        shard_rows: int = HEAR_CACHE_SHARD_ROWS,
+        dim: int = HEAR_EMBEDDING_DIM
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Capacity of the in-memory LRU tier.
+            persist_dir: Directory for the persistent tier (disabled if None).
+            shard_rows: Embeddings per on-disk shard.
+            dim: Embedding dimension.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.dim = dim
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disk = _ShardedEmbeddingStore(persist_dir, dim, shard_rows) if persist_dir else None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(content_hash: str, model_revision: str, segmentation: Dict[str, Any]) -> str:
+        """
+        Build a cache key from the audio content hash, HeAR revision and segmentation parameters.
+        """
+        params = json.dumps(segmentation, sort_keys=True)
+        return hashlib.sha256(f"{content_hash}|{model_revision}|{params}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return a copy of the cached (1, dim) embedding, or None on a miss."""
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return embedding.copy()
+
+            if self._disk is not None:
+                embedding = self._disk.get(key)
+                if embedding is not None:
+                    self._remember(key, embedding)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return embedding.copy()
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, embedding: np.ndarray) -> None:
+        """Store a (1, dim) embedding in both tiers."""
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(1, self.dim)
+        with self._lock:
+            self._remember(key, embedding)
+            if self._disk is not None:
+                self._disk.put(key, embedding)
+
+    def _remember(self, key: str, embedding: np.ndarray) -> None:
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the persistent tier is left intact)."""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk) if self._disk is not None else 0,
+            }
@@ -0,0 +1,219 @@
+"""
+Runtime backends for HeAR inference.
+
+HeAREncoder only needs "(N, 32000) float32 chunks in, (N, 512) embeddings
+out". This module provides that behind a small interface:
+
+  - "savedmodel": the official google/hear TensorFlow SavedModel (default)
+  - "tflite":     a converted .tflite file run by tflite_runtime (or tf.lite)
+  - "onnx":       a converted .onnx file run by ONNX Runtime on CPU
+
+The converted runtimes load from a local file, start in a fraction of the
+time and use a fraction of the RAM of full TensorFlow, which matters on
+CPU-only edge devices. See scripts/export_hear_backend.py for conversion.
+"""
+
+import os
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Sequence, Type
+
+import numpy as np
+
+from src.config import (
+    HEAR_BACKEND,
+    HEAR_BACKEND_PATH,
+    HEAR_BACKEND_THREADS,
+    HEAR_HF_MODEL_ID,
+    SAMPLE_RATE,
+    HEAR_CHUNK_DURATION_SEC
+)
+from src.models.model_store import get_model_store
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SAMPLES = int(SAMPLE_RATE * HEAR_CHUNK_DURATION_SEC)
+
+
+class HeARBackend(ABC):
+    """Runs HeAR over a batch of 2-second chunks."""
+
+    name: str = ""
+
+    def __init__(self):
+        # Identifies the weights; part of the embedding cache key
+        self.revision = self.name
+
+    @abstractmethod
+    def infer(self, chunks: np.ndarray) -> np.ndarray:
+        """
+        Embed a batch of chunks.
+
+        Args:
+            chunks: float32 array of shape (N, 32000).
+
+        Returns:
+            np.ndarray: Embeddings of shape (N, 512).
+        """
+
+    def prepare(self, batch_sizes: Sequence[int]) -> None:
+        """Build whatever the runtime needs ahead of time for these batch sizes."""
+
+    @staticmethod
+    def _file_revision(name: str, path: str) -> str:
+        """
+        Revision of a converted model file, without hashing it at load time.
+
+        A file recorded in the model store is identified by its manifest
+        checksum; any other file by its size and modification time.
+        """
+        checksum = get_model_store().file_checksum(path)
+        if checksum is not None:
+            version = checksum[:12]
+        else:
+            stat = os.stat(path)
+            version = f"{stat.st_size}-{stat.st_mtime_ns}"
+        return f"{name}:{os.path.basename(path)}@{version}"
+
+
+class SavedModelBackend(HeARBackend):
+    """The official TensorFlow SavedModel, prefetched into the local model store."""
+
+    name = "savedmodel"
+
+    def __init__(self, model_dir: Optional[str] = None, model=None):
+        """
+        Args:
+            model_dir: Local SavedModel directory (resolved from the model store when None).
+            model: An already loaded SavedModel (skips loading).
+        """
+        super().__init__()
+        if model is None:
+            import tensorflow as tf
+
+            if model_dir is None:
+                store = get_model_store()
+                model_dir = store.resolve("hear")
+                self.revision = f"{HEAR_HF_MODEL_ID}@{store.record('hear').revision}"
+            else:
+                # HuggingFace snapshot directories are named after the commit hash
+                self.revision = f"{HEAR_HF_MODEL_ID}@{os.path.basename(os.path.normpath(model_dir))}"
+
+            print(f"🔄 Loading HeAR SavedModel...")
+            model = tf.saved_model.load(model_dir)
+            logger.info("HeAR SavedModel loaded from %s", model_dir)
+        self.model = model
+        # Looked up once instead of on every call
+        self._serving = model.signatures["serving_default"]
+        self._concrete: Dict[int, object] = {}
+
+    def prepare(self, batch_sizes: Sequence[int]) -> None:
+        """Trace one fixed-shape concrete function per batch size."""
+        import tensorflow as tf
+
+        serving = self._serving
+        for batch_size in batch_sizes:
+            if batch_size in self._concrete:
+                continue
+            spec = tf.TensorSpec((batch_size, CHUNK_SAMPLES), tf.float32)
+            self._concrete[batch_size] = tf.function(
+                lambda x: serving(x=x)['output_0']
+            ).get_concrete_function(spec)
+
+    def infer(self, chunks: np.ndarray) -> np.ndarray:
+        import tensorflow as tf
+
+        x = tf.constant(chunks, dtype=tf.float32)
+        concrete = self._concrete.get(len(chunks))
+        if concrete is not None:
+            return concrete(x).numpy()
+        return self._serving(x=x)['output_0'].numpy()
+
+
+class TFLiteBackend(HeARBackend):
+    """A converted .tflite model run by the standalone TFLite interpreter."""
+
+    name = "tflite"
+
+    def __init__(self, path: str, num_threads: int = HEAR_BACKEND_THREADS):
+        super().__init__()
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            # Full TensorFlow also ships the interpreter
+            from tensorflow.lite import Interpreter
+
+        self.interpreter = Interpreter(model_path=path, num_threads=num_threads)
+        self._input = self.interpreter.get_input_details()[0]["index"]
+        self._output = self.interpreter.get_output_details()[0]["index"]
+        self._batch_size: Optional[int] = None
+        # The interpreter holds per-call state and is not thread-safe
+        self._lock = threading.Lock()
+        self.revision = self._file_revision(self.name, path)
+
+    def infer(self, chunks: np.ndarray) -> np.ndarray:
+        chunks = np.ascontiguousarray(chunks, dtype=np.float32)
+        with self._lock:
+            if self._batch_size != len(chunks):
+                self.interpreter.resize_tensor_input(self._input, list(chunks.shape))
+                self.interpreter.allocate_tensors()
+                self._batch_size = len(chunks)
+            self.interpreter.set_tensor(self._input, chunks)
+            self.interpreter.invoke()
+            return np.array(self.interpreter.get_tensor(self._output))
+
+
+class ONNXBackend(HeARBackend):
+    """A converted .onnx model run by ONNX Runtime's CPU provider."""
+
+    name = "onnx"
+
+    def __init__(self, path: str, num_threads: int = HEAR_BACKEND_THREADS):
+        super().__init__()
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input = self.session.get_inputs()[0].name
+        self.revision = self._file_revision(self.name, path)
+
+    def infer(self, chunks: np.ndarray) -> np.ndarray:
+        chunks = np.ascontiguousarray(chunks, dtype=np.float32)
+        return self.session.run(None, {self._input: chunks})[0]
+
+
+BACKENDS: Dict[str, Type[HeARBackend]] = {
+    SavedModelBackend.name: SavedModelBackend,
+    TFLiteBackend.name: TFLiteBackend,
+    ONNXBackend.name: ONNXBackend,
+}
+
+
+def load_backend(name: str = HEAR_BACKEND, path: Optional[str] = HEAR_BACKEND_PATH) -> HeARBackend:
+    """
+    Create a HeAR backend by name.
+
+    Args:
+        name: "savedmodel", "tflite" or "onnx".
+        path: Model file for converted backends (a SavedModel directory for
+              "savedmodel"; resolved from the local model store when None).
+
+    Raises:
+        ValueError: If the backend is unknown or a converted backend has no file.
+        FileNotFoundError: If the model file does not exist.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HeAR backend '{name}'. Available: {list(BACKENDS)}")
+    if name == SavedModelBackend.name:
+        return SavedModelBackend(model_dir=path)
+    if not path:
+        raise ValueError(f"HeAR backend '{name}' needs a local model file (set AURA_HEAR_BACKEND_PATH)")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"HeAR model file not found: {path}")
+
+    backend = BACKENDS[name](path)
+    logger.info("HeAR %s backend loaded from %s", name, path)
+    return backend
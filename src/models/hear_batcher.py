@@ -0,0 +1,229 @@
+"""
+Cross-request batching of HeAR chunk inference.
+
+Under concurrent load every `HeAREncoder.encode` call would otherwise send
+its own handful of 2-second chunks to the serving signature. The batcher
+sits in front of the signature instead: callers enqueue their chunks, a
+single worker thread packs chunks from many callers into fixed-shape
+(batch_size, 32000) batches, and the per-chunk embeddings are routed back
+to each caller's future.
+
+    batcher = HeARChunkBatcher(encoder._infer_chunks, batch_size=16)
+    batcher.start()
+    embeddings = batcher.submit(chunks).result()   # (n_chunks, 512)
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import HEAR_MAX_BATCH_SIZE, HEAR_BATCHER_MAX_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+_SHUTDOWN = object()
+
+
+@dataclass
+class _ChunkRequest:
+    """One caller's chunks and the buffer their embeddings are gathered into."""
+    chunks: np.ndarray
+    future: Future
+    enqueued_at: float
+    embeddings: Optional[np.ndarray] = None
+    next_chunk: int = 0
+    done_chunks: int = 0
+
+
+class HeARChunkBatcher:
+    """
+    Shared service that batches HeAR chunks across concurrent callers.
+
+    A batch is run once it holds `batch_size` chunks or the oldest waiting
+    chunk has waited `max_wait_ms`. A caller's chunks may be split across
+    consecutive batches; its future resolves when all of them are embedded.
+    """
+
+    def __init__(
+        self,
+        infer_fn: Callable[[np.ndarray], np.ndarray],
+        batch_size: int = HEAR_MAX_BATCH_SIZE,
+        max_wait_ms: float = HEAR_BATCHER_MAX_WAIT_MS,
+        pad_batches: bool = True
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            infer_fn: Maps an (N, chunk_samples) array to (N, dim) embeddings.
+            batch_size: Chunks per inference call.
+            max_wait_ms: Longest a chunk waits for the batch to fill.
+            pad_batches: Zero-pad partial batches to `batch_size` rows so the
+                         model always sees the same input shape.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.infer_fn = infer_fn
+        self.batch_size = batch_size
+        self.max_wait_sec = max_wait_ms / 1000.0
+        self.pad_batches = pad_batches
+
+        self._inbox: "queue.Queue[object]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.chunks = 0
+        self.padded_chunks = 0
+        self.requests = 0
+
+    def __enter__(self) -> "HeARChunkBatcher":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="auramed-hear-batcher", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Embed everything already submitted, then stop the worker."""
+        if self._thread is None:
+            return
+        self._inbox.put(_SHUTDOWN)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, chunks: np.ndarray) -> "Future[np.ndarray]":
+        """
+        Queue a recording's chunks.
+
+        Args:
+            chunks: Array of shape (n_chunks, chunk_samples).
+
+        Returns:
+            Future resolving to the (n_chunks, dim) per-chunk embeddings.
+        """
+        if self._thread is None:
+            raise RuntimeError("HeARChunkBatcher is not started")
+        future: Future = Future()
+        chunks = np.asarray(chunks, dtype=np.float32)
+        if len(chunks) == 0:
+            future.set_exception(ValueError("No chunks to embed"))
+            return future
+        self._inbox.put(_ChunkRequest(chunks=chunks, future=future, enqueued_at=time.perf_counter()))
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        """Batch counts and the average fraction of each batch holding real chunks."""
+        with self._lock:
+            slots = self.chunks + self.padded_chunks
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "chunks": self.chunks,
+                "padded_chunks": self.padded_chunks,
+                "mean_chunks_per_batch": round(self.chunks / self.batches, 2) if self.batches else 0.0,
+                "fill_ratio": round(self.chunks / slots, 3) if slots else 0.0,
+            }
+
+    # ── Worker ──────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        pending: Deque[_ChunkRequest] = deque()
+        shutting_down = False
+
+        while True:
+            if not pending:
+                if shutting_down:
+                    return
+                item = self._inbox.get()
+                if item is _SHUTDOWN:
+                    return
+                pending.append(item)
+
+            # Fill the batch until it is full or the oldest chunk's wait runs out
+            window_ends = pending[0].enqueued_at + self.max_wait_sec
+            while not shutting_down and self._queued_chunks(pending) < self.batch_size:
+                timeout = window_ends - time.perf_counter()
+                try:
+                    item = self._inbox.get(timeout=timeout) if timeout > 0 else self._inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _SHUTDOWN:
+                    shutting_down = True
+                else:
+                    pending.append(item)
+
+            self._run_batch(pending)
+
+    @staticmethod
+    def _queued_chunks(pending: Deque[_ChunkRequest]) -> int:
+        return sum(len(request.chunks) - request.next_chunk for request in pending)
+
+    def _run_batch(self, pending: Deque[_ChunkRequest]) -> None:
+        # Take up to batch_size chunks, oldest requests first
+        slices: List[Tuple[_ChunkRequest, int, int]] = []
+        parts = []
+        taken = 0
+        for request in pending:
+            if taken == self.batch_size:
+                break
+            start = request.next_chunk
+            stop = min(len(request.chunks), start + self.batch_size - taken)
+            if stop > start:
+                slices.append((request, start, stop))
+                parts.append(request.chunks[start:stop])
+                request.next_chunk = stop
+                taken += stop - start
+
+        batch = np.concatenate(parts, axis=0) if len(parts) > 1 else parts[0]
+        padding = self.batch_size - taken if self.pad_batches else 0
+        if padding:
+            batch = np.concatenate([batch, np.zeros((padding, batch.shape[1]), dtype=np.float32)], axis=0)
+
+        try:
+            embeddings = np.asarray(self.infer_fn(batch))[:taken]
+        except Exception as e:
+            logger.exception("HeAR chunk batch failed")
+            failed = {id(request): request for request, _, _ in slices}
+            for request in failed.values():
+                if not request.future.done():
+                    request.future.set_exception(e)
+                pending.remove(request)
+            return
+
+        row = 0
+        for request, start, stop in slices:
+            if request.embeddings is None:
+                request.embeddings = np.empty((len(request.chunks), embeddings.shape[1]), dtype=np.float32)
+            request.embeddings[start:stop] = embeddings[row:row + stop - start]
+            row += stop - start
+            request.done_chunks += stop - start
+
+        with self._lock:
+            self.batches += 1
+            self.chunks += taken
+            self.padded_chunks += padding
+
+        # Resolve callers whose chunks are all embedded
+        while pending and pending[0].done_chunks == len(pending[0].chunks):
+            request = pending.popleft()
+            with self._lock:
+                self.requests += 1
+            request.future.set_result(request.embeddings)
@@ -1,23 +1,58 @@
+import os
+import time
 import logging
 import torch
 import numpy as np
-from typing import Union
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
 from src.config import (
     HEAR_EMBEDDING_DIM,
     HEAR_CHUNK_DURATION_SEC,
+    HEAR_MAX_BATCH_SIZE,
+    HEAR_BATCHER_MAX_WAIT_MS,
+    HEAR_HOP_DURATION_SEC,
+    HEAR_POOLING,
+    HEAR_BACKEND,
+    HEAR_BACKEND_PATH,
+    HEAR_BATCH_BUCKETS,
+    HEAR_WARMUP_AT_LOAD,
+    QUALITY_CHUNK_GATING,
     NOISE_RMS_UPPER_THRESHOLD, 
     NOISE_RMS_LOWER_THRESHOLD,
     MIN_AUDIO_DURATION_SEC,
+    MAX_AUDIO_DURATION_SEC,
     SAMPLE_RATE,
     IS_DEMO_MODE
 )
-from src.utils.audio import load_audio, normalize_duration
-from src.datatypes import LowQualityError
+from src.utils.audio import AudioSource, BufferPool, describe_audio_source, load_audio, normalize_duration, resolve_audio_source
+from src.utils.segmentation import Segments, frame_windows, pool_embeddings, POOLING_MODES
+from src.utils.quality import analyze_segments, gate_params
+from src.utils.decode_pool import DecodePool
+from src.models.embedding_cache import EmbeddingCache, hash_audio_source
+from src.models.hear_batcher import HeARChunkBatcher
+from src.models.hear_backends import HeARBackend, load_backend
+from src.agent.deadline import deadline_stage
+from src.datatypes import AudioDecodeError, LowQualityError
+
+if TYPE_CHECKING:
+    from src.models.hear_stream import HeARStreamSession
 
 logger = logging.getLogger(__name__)
 
-# HuggingFace model ID for HeAR (official Google release)
-HEAR_HF_MODEL_ID = "google/hear"
+
+@dataclass
+class DecodedRecording:
+    """
+    A recording after `HeAREncoder.decode`, waiting for `embed_decoded`.
+    
+    On a cache hit `embedding` is already set and there is no waveform;
+    otherwise `waveform` is a pooled buffer owned by the encoder.
+    """
+    cache_key: Optional[str] = None
+    embedding: Optional[torch.Tensor] = None
+    waveform: Optional[np.ndarray] = None
+    sample_rate: int = SAMPLE_RATE
+    valid_samples: Optional[int] = None
 
 
 class HeAREncoder:
@@ -27,14 +62,64 @@ class HeAREncoder:
     Extracts 512-dimensional embeddings from audio using Google's HeAR model
     loaded from HuggingFace via from_pretrained_keras.
     Falls back to deterministic mock embeddings when model is unavailable.
+    
+    An optional EmbeddingCache short-circuits re-submitted recordings.
     """
     
-    def __init__(self):
-        """Initialize the HeAR encoder, loading the real model if available."""
+    def __init__(
+        self,
+        cache: Optional[EmbeddingCache] = None,
+        max_batch_size: int = HEAR_MAX_BATCH_SIZE,
+        hop_sec: float = HEAR_HOP_DURATION_SEC,
+        pooling: str = HEAR_POOLING,
+        backend: Optional[HeARBackend] = None,
+        decode_pool: Optional[DecodePool] = None,
+        warmup_at_load: Optional[bool] = None
+    ):
+        """
+        Initialize the HeAR encoder, loading the real model if available.
+        
+        Args:
+            cache: Optional embedding cache keyed by audio content, model
+                   revision and segmentation parameters.
+            max_batch_size: Maximum number of 2-second chunks per HeAR call.
+            hop_sec: Seconds between chunk starts (< 2.0 gives overlapping chunks).
+            pooling: How chunk embeddings are combined: "mean", "max" or "energy".
+            backend: An already loaded runtime backend (skips loading).
+            decode_pool: Started DecodePool that `encode_batch` decodes files
+                         in, ahead of the quality gate (None decodes inline).
+            warmup_at_load: Run `warmup` once the model is loaded (None follows
+                            HEAR_WARMUP_AT_LOAD).
+        
+        Without a GPU the encoder runs in demo mode, unless HEAR_BACKEND
+        selects a converted CPU runtime (TFLite/ONNX).
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if not 0 < hop_sec <= HEAR_CHUNK_DURATION_SEC:
+            raise ValueError(f"hop_sec must be in (0, {HEAR_CHUNK_DURATION_SEC}]")
+        if pooling not in POOLING_MODES:
+            raise ValueError(f"Unknown pooling mode '{pooling}'. Available: {POOLING_MODES}")
+        
         self.model = None
+        self.model_revision = "mock"
         self.embedding_dim = HEAR_EMBEDDING_DIM
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.hop_sec = hop_sec
+        self.pooling = pooling
+        self.batcher: Optional[HeARChunkBatcher] = None
+        # Fixed batch shapes the backend is traced and warmed for
+        self.batch_buckets = sorted({b for b in HEAR_BATCH_BUCKETS if b < max_batch_size} | {max_batch_size})
+        self.warmup_stats: Dict[int, Dict[str, float]] = {}
+        # Padding buffers for short recordings, reused across encode calls
+        self.buffer_pool = BufferPool()
+        self.decode_pool = decode_pool
+        self.warmup_at_load = HEAR_WARMUP_AT_LOAD if warmup_at_load is None else warmup_at_load
         
-        if not IS_DEMO_MODE:
+        if backend is not None:
+            self._use_backend(backend)
+        elif not IS_DEMO_MODE or HEAR_BACKEND != "savedmodel":
             self._load_model()
         else:
             logger.info("HeAR Encoder initialized in DEMO mode (no GPU). Using mock embeddings.")
@@ -42,25 +127,15 @@ class HeAREncoder:
     
     def _load_model(self):
         """
-        Load the real HeAR model from HuggingFace Hub.
+        Load the real HeAR model through the configured runtime backend.
         
-        Downloads the SavedModel via snapshot_download, then loads it
-        with tf.saved_model.load. Compatible with all huggingface_hub versions.
+        By default this is the official SavedModel, resolved offline from the
+        local model store (see src.models.model_store); HEAR_BACKEND can select a
+        converted TFLite/ONNX file instead (see src.models.hear_backends).
         """
         try:
-            import tensorflow as tf
-            from huggingface_hub import snapshot_download
-            
-            logger.info("Loading HeAR Encoder from HuggingFace: %s", HEAR_HF_MODEL_ID)
-            print(f"🔄 Downloading HeAR model from HuggingFace ({HEAR_HF_MODEL_ID})...")
-            
-            # Download the full model repository
-            model_dir = snapshot_download(HEAR_HF_MODEL_ID)
-            
-            print(f"🔄 Loading HeAR SavedModel...")
-            self.model = tf.saved_model.load(model_dir)
-            
-            logger.info("HeAR Encoder loaded successfully from %s", model_dir)
+            self._use_backend(load_backend(HEAR_BACKEND, HEAR_BACKEND_PATH))
+            logger.info("HeAR Encoder loaded successfully (%s)", self.model_revision)
             print("✅ HeAR Encoder loaded successfully.")
         except ImportError as e:
             logger.error("Missing dependency for HeAR: %s", str(e))
@@ -69,6 +144,45 @@ class HeAREncoder:
             logger.error("Failed to load HeAR model: %s", str(e))
             print(f"⚠️ HeAR model load failed: {e}. Using mock embeddings.")
 
+    def _use_backend(self, backend: HeARBackend) -> None:
+        self.model = backend
+        self.model_revision = backend.revision
+        backend.prepare(self.batch_buckets)
+        if self.warmup_at_load:
+            self.warmup()
+
+    def warmup(self) -> Dict[int, Dict[str, float]]:
+        """
+        Run silent input through every batch bucket, twice.
+        
+        The first call per shape pays the runtime's graph preparation and
+        allocation; doing it at load keeps that cost away from the first
+        patient of the day.
+        
+        Returns:
+            dict: bucket size -> {"cold_ms": first call, "warm_ms": second call}
+        """
+        if self.model is None:
+            return {}
+        chunk_samples = int(SAMPLE_RATE * HEAR_CHUNK_DURATION_SEC)
+        for bucket in self.batch_buckets:
+            silence = np.zeros((bucket, chunk_samples), dtype=np.float32)
+            timings = []
+            for _ in range(2):
+                start = time.perf_counter()
+                self.model.infer(silence)
+                timings.append(round((time.perf_counter() - start) * 1000, 2))
+            self.warmup_stats[bucket] = {"cold_ms": timings[0], "warm_ms": timings[1]}
+        logger.info("HeAR warmup (ms per bucket, cold/warm): %s", self.warmup_stats)
+        return self.warmup_stats
+
+    def _bucket_for(self, n: int) -> int:
+        """Smallest bucket holding `n` chunks (n <= max_batch_size)."""
+        for bucket in self.batch_buckets:
+            if bucket >= n:
+                return bucket
+        return n
+
     def _detect_noise(self, waveform: Union[torch.Tensor, np.ndarray]) -> float:
         """
         Estimate noise level in the waveform using RMS.
@@ -83,10 +197,34 @@ class HeAREncoder:
             wf_np = waveform.numpy()
         else:
             wf_np = waveform
+        wf_np = np.ravel(wf_np)
+        if wf_np.size == 0:
+            return 0.0
             
-        rms = np.sqrt(np.mean(wf_np**2))
+        # Dot product: no squared copy of the waveform
+        rms = np.sqrt(np.dot(wf_np, wf_np) / wf_np.size)
         return float(rms)
 
+    def _gate_chunks(self, segments: Segments, sr: int) -> Segments:
+        """
+        Drop chunks that fail the per-chunk quality gate (see src.utils.quality).
+        
+        A clipped or silent stretch costs only its own chunks instead of the
+        whole recording, and never reaches HeAR.
+        
+        Raises:
+            LowQualityError: If no chunk is usable.
+        """
+        if not QUALITY_CHUNK_GATING:
+            return segments
+        quality = analyze_segments(segments, sr)
+        kept = int(np.count_nonzero(quality.usable))
+        if kept == 0:
+            raise LowQualityError(quality.rejection_message())
+        if kept < len(quality):
+            logger.info("Quality gate dropped %d of %d HeAR chunks", len(quality) - kept, len(quality))
+        return segments.select(quality.usable)
+
     def _segment_audio(self, waveform: np.ndarray, sr: int) -> np.ndarray:
         """
         Segment audio into fixed-length chunks for HeAR processing.
@@ -101,36 +239,76 @@ class HeAREncoder:
         Returns:
             np.ndarray: Array of shape (N, chunk_samples) containing audio chunks.
         """
-        chunk_samples = int(sr * HEAR_CHUNK_DURATION_SEC)
-        chunks = []
+        chunk_samples, hop_samples = self._window_params(sr)
+        return frame_windows(waveform, chunk_samples, hop_samples).as_array()
+
+    def _window_params(self, sr: int) -> Tuple[int, int]:
+        return int(sr * HEAR_CHUNK_DURATION_SEC), int(sr * self.hop_sec)
+
+    def _segment_valid(self, waveform: np.ndarray, sr: int, valid_samples: Optional[int] = None) -> Segments:
+        """
+        Segment only the chunks that hold real audio.
         
-        for i in range(0, len(waveform), chunk_samples):
-            chunk = waveform[i:i + chunk_samples]
-            if len(chunk) < chunk_samples:
-                # Zero-pad short final chunk
-                chunk = np.pad(chunk, (0, chunk_samples - len(chunk)), mode='constant')
-            chunks.append(chunk)
+        `normalize_duration` zero-pads short recordings to MAX_AUDIO_DURATION_SEC;
+        chunks made purely of that padding are dropped instead of being sent
+        through HeAR and averaged into the result.
         
-        return np.array(chunks, dtype=np.float32)
+        Args:
+            waveform: Normalized waveform.
+            sr: Sample rate.
+            valid_samples: Number of leading samples that are real audio. When
+                           None, the trailing run of exact zeros is treated as
+                           padding.
+            
+        Returns:
+            Segments: Strided chunk views plus per-chunk count of valid samples.
+        """
+        if valid_samples is None:
+            nonzero = np.flatnonzero(waveform)
+            valid_samples = int(nonzero[-1]) + 1 if nonzero.size else 0
+        chunk_samples, hop_samples = self._window_params(sr)
+        return frame_windows(waveform, chunk_samples, hop_samples, valid_samples=valid_samples)
 
-    def encode(self, audio_path: str) -> torch.Tensor:
+    def _pool(self, embeddings: np.ndarray, segments: Segments) -> np.ndarray:
+        """Pool per-chunk embeddings with the configured mode (see `pool_embeddings`)."""
+        energies = segments.energies() if self.pooling == "energy" else None
+        return pool_embeddings(embeddings, segments.valid, self.pooling, energies)
+
+    def preprocess(self, audio_path: AudioSource) -> Tuple[np.ndarray, int]:
         """
-        Extract embeddings from audio file using HeAR.
+        Load, quality-gate and duration-normalize a recording.
         
-        Pipeline: Load → Validate → Segment → Encode → Average → Return
+        Pipeline: Load → Validate → Normalize
         
         Args:
-            audio_path: Path to .wav file
+            audio_path: Path to .wav file, or the recording in memory (bytes,
+                        file-like object or decoded (waveform, sample_rate)).
             
         Returns:
-            torch.Tensor: Embedding of shape (1, 512)
+            tuple: (normalized_waveform, sample_rate)
             
         Raises:
             FileNotFoundError: If audio file not found
             LowQualityError: If audio is shorter than threshold or too noisy/silent
+            AudioDecodeError: If the audio cannot be decoded (a LowQualityError)
+        """
+        waveform, sr, _ = self._preprocess(audio_path)
+        return waveform, sr
+
+    def _preprocess(self, audio_path: AudioSource, pool: Optional[BufferPool] = None) -> Tuple[np.ndarray, int, int]:
         """
-        # 1. Load audio and resample to 16kHz
-        waveform, sr = load_audio(audio_path, sr=SAMPLE_RATE)
+        `preprocess`, also returning how many leading samples are real audio.
+        
+        With `pool`, short recordings are padded into a leased buffer that the
+        caller must release once HeAR has consumed the waveform.
+        """
+        # 1. Load audio and resample to 16kHz (only the first MAX_AUDIO_DURATION_SEC is decoded)
+        try:
+            waveform, sr = load_audio(audio_path, sr=SAMPLE_RATE, duration=MAX_AUDIO_DURATION_SEC)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise self._decode_error(e) from e
         
         # 2. Validate duration
         if len(waveform) < sr * MIN_AUDIO_DURATION_SEC:
@@ -146,47 +324,323 @@ class HeAREncoder:
             raise LowQualityError("Audio recording contains no clear signal (too silent)")
 
         # 4. Normalize duration to max seconds (truncation/padding)
-        normalized_waveform = normalize_duration(waveform, target_length=10.0, sr=sr)
+        normalized_waveform = normalize_duration(waveform, target_length=MAX_AUDIO_DURATION_SEC, sr=sr, pool=pool)
+        valid_samples = min(len(waveform), len(normalized_waveform))
+        return normalized_waveform, sr, valid_samples
+
+    @staticmethod
+    def _decode_error(error: Exception) -> AudioDecodeError:
+        return AudioDecodeError(f"Audio recording could not be decoded ({type(error).__name__}: {error})")
+
+    def embed(self, waveform: np.ndarray, sr: int, valid_samples: Optional[int] = None) -> torch.Tensor:
+        """
+        Extract the mean HeAR embedding from an already preprocessed waveform.
         
-        # 5. Extract embedding
+        Args:
+            waveform: Normalized waveform as returned by `preprocess`.
+            sr: Sample rate.
+            valid_samples: Leading samples that are real audio (see `_segment_valid`).
+            
+        Returns:
+            torch.Tensor: Embedding of shape (1, 512)
+            
+        Raises:
+            LowQualityError: If no chunk passes the per-chunk quality gate
+        """
         if self.model is not None:
-            return self._encode_real(normalized_waveform, sr)
+            return self._encode_real(waveform, sr, valid_samples)
         else:
             return self._encode_mock()
+
+    def encode(self, audio_path: AudioSource) -> torch.Tensor:
+        """
+        Extract embeddings from audio file using HeAR.
+        
+        Pipeline: Load → Validate → Segment → Encode → Average → Return
+        
+        Equivalent to `embed_decoded(decode(audio_path))`.
+        
+        Args:
+            audio_path: Path to .wav file, or the recording in memory (bytes,
+                        file-like object or decoded (waveform, sample_rate)).
+            
+        Returns:
+            torch.Tensor: Embedding of shape (1, 512)
+            
+        Raises:
+            FileNotFoundError: If audio file not found
+            LowQualityError: If audio is shorter than threshold or too noisy/silent
+        """
+        return self.embed_decoded(self.decode(audio_path))
+
+    def decode(self, audio_path: AudioSource) -> DecodedRecording:
+        """
+        First half of `encode`: cache lookup, then load, validate and normalize.
+        
+        Callers that run the two halves separately (e.g. on different pipeline
+        threads) must hand every result to `embed_decoded`, or to `release`
+        if it will not be embedded, so its padding buffer returns to the pool.
+        
+        Raises:
+            FileNotFoundError: If audio file not found
+            LowQualityError: If audio is shorter than threshold or too noisy/silent
+        """
+        # Read file-like input once, so hashing and decoding share the buffer
+        audio_path = resolve_audio_source(audio_path)
+        cache_key = self._cache_key(audio_path)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("HeAR embedding cache hit for %s", describe_audio_source(audio_path))
+                return DecodedRecording(cache_key=cache_key, embedding=torch.from_numpy(cached).float())
+        
+        with deadline_stage("decode"):
+            waveform, sr, valid_samples = self._preprocess(audio_path, pool=self.buffer_pool)
+        return DecodedRecording(cache_key=cache_key, waveform=waveform, sample_rate=sr, valid_samples=valid_samples)
+
+    def embed_decoded(self, decoded: DecodedRecording) -> torch.Tensor:
+        """
+        Second half of `encode`: embed a decoded recording and cache the result.
+        
+        Raises:
+            LowQualityError: If no chunk passes the per-chunk quality gate
+        """
+        if decoded.embedding is not None:
+            return decoded.embedding
+        try:
+            with deadline_stage("hear"):
+                embedding = self.embed(decoded.waveform, decoded.sample_rate, decoded.valid_samples)
+        finally:
+            self.release(decoded)
+        
+        if decoded.cache_key is not None:
+            self.cache.put(decoded.cache_key, self._to_numpy(embedding))
+        decoded.embedding = embedding
+        return embedding
+
+    def release(self, decoded: DecodedRecording) -> None:
+        """Return a decoded recording's padding buffer to the pool."""
+        if decoded.waveform is not None:
+            self.buffer_pool.release(decoded.waveform)
+            decoded.waveform = None
+
+    @property
+    def segmentation_params(self) -> Dict[str, Any]:
+        """Parameters that determine how a recording is turned into pooled HeAR chunks."""
+        return {
+            "sample_rate": SAMPLE_RATE,
+            "chunk_sec": HEAR_CHUNK_DURATION_SEC,
+            "max_duration_sec": MAX_AUDIO_DURATION_SEC,
+            "hop_sec": self.hop_sec,
+            "pooling": self.pooling,
+            # Which chunks are pooled (or whether the recording is rejected)
+            "quality_gate": gate_params() if QUALITY_CHUNK_GATING else None,
+        }
+
+    def _cache_key(self, audio_path: AudioSource) -> Optional[str]:
+        """Content-addressed cache key, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        return EmbeddingCache.make_key(
+            hash_audio_source(audio_path), self.model_revision, self.segmentation_params
+        )
+
+    @staticmethod
+    def _to_numpy(embedding: Union[torch.Tensor, np.ndarray]) -> np.ndarray:
+        if isinstance(embedding, torch.Tensor):
+            return embedding.detach().cpu().numpy()
+        return np.asarray(embedding)
+
+    def encode_batch(self, audio_paths: Sequence[AudioSource]) -> List[Union[torch.Tensor, LowQualityError]]:
+        """
+        Extract embeddings for several recordings with shared HeAR calls.
+        
+        Every chunk of every recording that passes the quality gate is stacked
+        into one (N, 32000) array and run through `_infer_chunks`, which sends
+        it in batches of at most `max_batch_size` rows, each padded up to a
+        pre-traced bucket shape. The number of backend calls therefore depends
+        on the total chunk count, not on how many recordings are submitted.
+        
+        Args:
+            audio_paths: Paths to .wav files or in-memory recordings (see `encode`).
+            
+        Returns:
+            list: One entry per input, in order. Either a (1, 512) embedding
+                  or the LowQualityError raised by that recording's quality gate
+                  (an AudioDecodeError if it could not be decoded).
+            
+        Raises:
+            FileNotFoundError: If any audio file is not found
+        """
+        results: List[Union[torch.Tensor, LowQualityError, None]] = [None] * len(audio_paths)
+        cache_keys: List[Optional[str]] = [None] * len(audio_paths)
+        prepared = []
+        
+        try:
+            with deadline_stage("decode"):
+                pending = []
+                for i, audio_path in enumerate(audio_paths):
+                    audio_path = resolve_audio_source(audio_path)
+                    cache_keys[i] = self._cache_key(audio_path)
+                    if cache_keys[i] is not None:
+                        cached = self.cache.get(cache_keys[i])
+                        if cached is not None:
+                            results[i] = torch.from_numpy(cached).float()
+                            continue
+                    pending.append((i, audio_path))
+                
+                if self.decode_pool is not None and self.decode_pool.running:
+                    # Files decode in the pool's workers, running ahead of the
+                    # gate; in-memory recordings are already decoded or cheap
+                    files = [(i, source) for i, source in pending if isinstance(source, str)]
+                    pending = [(i, source) for i, source in pending if not isinstance(source, str)]
+                    items = self.decode_pool.imap(source for _, source in files)
+                    try:
+                        for (i, _), item in zip(files, items):
+                            with item:
+                                try:
+                                    decoded = item.result()
+                                except FileNotFoundError:
+                                    raise
+                                except Exception as e:
+                                    # A corrupt file fails on its own, like a quality gate rejection
+                                    results[i] = self._decode_error(e)
+                                    continue
+                                self._prepare_into(prepared, results, i, decoded, in_shared_memory=True)
+                    finally:
+                        # Reclaims the slots of decodes still in flight on error
+                        items.close()
+                for i, audio_path in pending:
+                    self._prepare_into(prepared, results, i, audio_path)
+            
+            prepared.sort(key=lambda entry: entry[0])
+            return self._encode_prepared(results, cache_keys, list(prepared))
+        finally:
+            # Padding buffers go back to the pool once HeAR has consumed them
+            for _, waveform, *_ in prepared:
+                self.buffer_pool.release(waveform)
+
+    def _prepare_into(self, prepared, results, i, audio_path, in_shared_memory: bool = False) -> None:
+        """
+        Preprocess one recording for `encode_batch`.
+        
+        With `in_shared_memory`, `audio_path` is a decoded pair that lives in a
+        DecodePool slot; the waveform is moved into a pooled buffer so the
+        slot can be handed back before HeAR runs.
+        """
+        try:
+            waveform, sr, valid_samples = self._preprocess(audio_path, pool=self.buffer_pool)
+        except LowQualityError as e:
+            results[i] = e
+            return
+        if in_shared_memory and np.shares_memory(waveform, audio_path[0]):
+            owned = self.buffer_pool.acquire(len(waveform), waveform.dtype)
+            owned[:] = waveform
+            waveform = owned
+        prepared.append((i, waveform, sr, valid_samples))
+
+    def _encode_prepared(self, results, cache_keys, prepared) -> List[Union[torch.Tensor, LowQualityError]]:
+        """HeAR half of `encode_batch`: gate, stack and embed the decoded recordings."""
+        if not prepared:
+            return results
+        
+        if self.model is None:
+            for i, *_ in prepared:
+                results[i] = self._encode_mock()
+            self._store_batch(results, cache_keys, prepared)
+            return results
+        
+        segmented = []
+        for entry in list(prepared):
+            i, waveform, sr, valid = entry
+            try:
+                segmented.append(self._gate_chunks(self._segment_valid(waveform, sr, valid), sr))
+            except LowQualityError as e:
+                results[i] = e
+                prepared.remove(entry)
+        if not prepared:
+            return results
+        
+        stacked = np.concatenate([segments.as_array() for segments in segmented], axis=0)
+        logger.info(
+            "Processing %d audio chunks from %d recordings through HeAR",
+            len(stacked), len(prepared)
+        )
+        with deadline_stage("hear"):
+            embeddings = self._infer_chunks(stacked)  # (N, 512)
+        
+        offset = 0
+        for (i, *_), segments in zip(prepared, segmented):
+            count = len(segments)
+            avg_embedding = self._pool(embeddings[offset:offset + count], segments)
+            results[i] = torch.from_numpy(avg_embedding).float()
+            offset += count
+        
+        self._store_batch(results, cache_keys, prepared)
+        return results
+
+    def _store_batch(self, results, cache_keys, prepared) -> None:
+        """Write freshly computed batch embeddings to the cache."""
+        for i, *_ in prepared:
+            if cache_keys[i] is not None:
+                self.cache.put(cache_keys[i], self._to_numpy(results[i]))
+
+    def _infer_chunks(self, chunks: np.ndarray) -> np.ndarray:
+        """
+        Run the HeAR backend over a stack of chunks.
+        
+        Chunks are sent as (N, chunk_samples) batches of at most
+        `max_batch_size` rows, so a 10 s clip is one call instead of five.
+        Each batch is zero-padded up to the nearest pre-traced bucket shape
+        and the padding rows are dropped from the output.
+        
+        Args:
+            chunks: Array of shape (N, chunk_samples).
+            
+        Returns:
+            np.ndarray: Per-chunk embeddings of shape (N, 512).
+        """
+        outputs = []
+        for start in range(0, len(chunks), self.max_batch_size):
+            batch = chunks[start:start + self.max_batch_size]
+            bucket = self._bucket_for(len(batch))
+            if bucket > len(batch):
+                padded = np.zeros((bucket, batch.shape[1]), dtype=np.float32)
+                padded[:len(batch)] = batch
+                outputs.append(self.model.infer(padded)[:len(batch)])
+            else:
+                outputs.append(self.model.infer(batch))
+        return outputs[0] if len(outputs) == 1 else np.concatenate(outputs, axis=0)
     
-    def _encode_real(self, waveform: np.ndarray, sr: int) -> torch.Tensor:
+    def _encode_real(self, waveform: np.ndarray, sr: int, valid_samples: Optional[int] = None) -> torch.Tensor:
         """
         Extract real embeddings using the loaded HeAR model.
         
         Segments audio into 2-second chunks, extracts per-chunk embeddings
-        via the model's serving signature, and returns the mean embedding.
+        via the runtime backend in batched calls, and returns the
+        pooled embedding (by default the mean weighted by each chunk's real,
+        non-padding samples). Chunks that are pure padding or fail the
+        per-chunk quality gate are never sent to HeAR.
         
-        Based on Google's official HeAR example notebook:
+        The SavedModel backend follows Google's official HeAR example notebook:
           infer = model.signatures["serving_default"]
           output = infer(x=tf.constant(chunk, dtype=tf.float32))
           embedding = output['output_0']
+        The signature accepts (N, 32000) as well as (1, 32000) inputs.
         """
-        import tensorflow as tf
-        
-        # Segment into 2-second chunks
-        chunks = self._segment_audio(waveform, sr)
+        # Segment into 2-second chunks and stack them into one (N, 32000) batch
+        segments = self._gate_chunks(self._segment_valid(waveform, sr, valid_samples), sr)
+        chunks = segments.as_array()
         logger.info("Processing %d audio chunks through HeAR", len(chunks))
         
-        # Get the serving inference function
-        infer = self.model.signatures["serving_default"]
-        
-        # Extract embeddings for each chunk
-        all_embeddings = []
-        for chunk in chunks:
-            # HeAR expects shape (1, 32000) — one 2-second clip at 16kHz
-            input_tensor = np.expand_dims(chunk, axis=0)
-            output = infer(x=tf.constant(input_tensor, dtype=tf.float32))
-            embedding = output['output_0'].numpy()  # shape (1, 512)
-            all_embeddings.append(embedding)
+        if self.batcher is not None:
+            # Shared with concurrent encode() calls
+            stacked = self.batcher.submit(chunks).result()
+        else:
+            stacked = self._infer_chunks(chunks)  # (N, 512)
         
-        # Stack and average across chunks
-        stacked = np.concatenate(all_embeddings, axis=0)  # (N, 512)
-        avg_embedding = np.mean(stacked, axis=0, keepdims=True)  # (1, 512)
+        # Pool across chunks (valid-sample weighted mean by default)
+        avg_embedding = self._pool(stacked, segments)  # (1, 512)
         
         # Convert to PyTorch tensor
         result = torch.from_numpy(avg_embedding).float()
@@ -194,6 +648,32 @@ class HeAREncoder:
         
         return result
     
+    def open_stream(self, sample_rate: int = SAMPLE_RATE) -> "HeARStreamSession":
+        """Start a streaming session that embeds live PCM input window by window."""
+        from src.models.hear_stream import HeARStreamSession
+        return HeARStreamSession(self, sample_rate=sample_rate)
+    
+    def enable_shared_batching(self, max_wait_ms: float = HEAR_BATCHER_MAX_WAIT_MS) -> HeARChunkBatcher:
+        """
+        Route chunk inference through a HeARChunkBatcher shared by all callers.
+        
+        Concurrent `encode`/`embed` calls then have their chunks packed into
+        common fixed-shape batches of `max_batch_size` rows.
+        
+        Returns:
+            HeARChunkBatcher: The running batcher (see its `stats()`).
+        """
+        if self.batcher is None:
+            self.batcher = HeARChunkBatcher(self._infer_chunks, batch_size=self.max_batch_size, max_wait_ms=max_wait_ms)
+            self.batcher.start()
+        return self.batcher
+    
+    def disable_shared_batching(self) -> None:
+        """Stop the shared batcher and go back to per-call inference."""
+        batcher, self.batcher = self.batcher, None
+        if batcher is not None:
+            batcher.close()
+    
     def _encode_mock(self) -> torch.Tensor:
         """
         Return mock embeddings for demo/testing (no GPU available).
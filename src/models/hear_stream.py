@@ -0,0 +1,253 @@
+"""
+Streaming HeAR encoding for live microphone input.
+
+Instead of waiting for a complete WAV file, a HeARStreamSession accepts PCM
+frames as they are recorded, keeps them in a ring buffer and embeds every
+2-second window as soon as it fills (on a background thread, so the audio
+callback never blocks on HeAR). When the CHW stops recording, `finalize`
+only has to embed the last partial window:
+
+    session = encoder.open_stream()
+    for frames in microphone:            # int16 or float32 PCM at 16 kHz
+        session.push(frames)
+        show(session.quality_stats())
+    embedding = session.finalize()        # (1, 512), same as encode()
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List
+
+import numpy as np
+import torch
+
+from src.config import (
+    SAMPLE_RATE,
+    HEAR_CHUNK_DURATION_SEC,
+    MIN_AUDIO_DURATION_SEC,
+    MAX_AUDIO_DURATION_SEC,
+    NOISE_RMS_UPPER_THRESHOLD,
+    NOISE_RMS_LOWER_THRESHOLD,
+    QUALITY_CHUNK_GATING
+)
+from src.agent.deadline import deadline_stage
+from src.datatypes import LowQualityError
+from src.utils.segmentation import pool_embeddings
+from src.utils.quality import ChunkQuality, analyze_chunk
+
+if TYPE_CHECKING:
+    from src.models.hear_encoder import HeAREncoder
+
+logger = logging.getLogger(__name__)
+
+
+class _RingBuffer:
+    """Fixed-capacity float32 FIFO of audio samples."""
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._start = 0
+        self.size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def write(self, samples: np.ndarray) -> None:
+        if self.size + len(samples) > self.capacity:
+            raise OverflowError("Ring buffer overflow")
+        end = (self._start + self.size) % self.capacity
+        first = min(len(samples), self.capacity - end)
+        self._data[end:end + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self.size += len(samples)
+
+    def peek(self, n: int) -> np.ndarray:
+        """Return (a copy of) the oldest `n` samples without removing them."""
+        n = min(n, self.size)
+        first = min(n, self.capacity - self._start)
+        out = np.empty(n, dtype=np.float32)
+        out[:first] = self._data[self._start:self._start + first]
+        out[first:] = self._data[:n - first]
+        return out
+
+    def discard(self, n: int) -> None:
+        n = min(n, self.size)
+        self._start = (self._start + n) % self.capacity
+        self.size -= n
+
+
+class HeARStreamSession:
+    """
+    Incremental HeAR encoding of one live recording.
+
+    The result of `finalize` matches `HeAREncoder.encode` on the same audio:
+    audio beyond MAX_AUDIO_DURATION_SEC is ignored, windows follow the
+    encoder's hop and pooling mode, and the same duration and RMS quality
+    gates apply.
+    """
+
+    def __init__(self, encoder: "HeAREncoder", sample_rate: int = SAMPLE_RATE):
+        """
+        Initialize the session.
+
+        Args:
+            encoder: Encoder whose model embeds each window.
+            sample_rate: Sample rate of the pushed frames (must match HeAR's 16 kHz).
+        """
+        if sample_rate != SAMPLE_RATE:
+            raise ValueError(f"Streaming input must be {SAMPLE_RATE} Hz PCM (got {sample_rate} Hz)")
+
+        self.encoder = encoder
+        self.sample_rate = sample_rate
+        self.window_samples = int(sample_rate * HEAR_CHUNK_DURATION_SEC)
+        self.hop_samples = int(sample_rate * encoder.hop_sec)
+        self.max_samples = int(sample_rate * MAX_AUDIO_DURATION_SEC)
+
+        self._buffer = _RingBuffer(2 * self.window_samples)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auramed-hear-stream")
+        # One future per usable full window, with its energy for energy pooling
+        self._pending: List[Future] = []
+        self._energies: List[float] = []
+        self._windows_submitted = 0
+        # Quality statistics of every full window, usable or not
+        self._window_stats: List[Dict[str, float]] = []
+        self._closed = False
+
+        # Quality statistics over every pushed sample (as _detect_noise on the full file)
+        self.total_samples = 0
+        self._sum_squares = 0.0
+        self._peak = 0.0
+
+    def push(self, frames: np.ndarray) -> None:
+        """
+        Append PCM frames. int16 input is scaled to [-1, 1].
+
+        Every complete 2-second window is handed to the background thread.
+        """
+        if self._closed:
+            raise RuntimeError("HeARStreamSession is already finalized")
+
+        frames = np.asarray(frames)
+        if frames.dtype == np.int16:
+            frames = frames.astype(np.float32) / 32768.0
+        frames = frames.astype(np.float32, copy=False).reshape(-1)
+        if frames.size == 0:
+            return
+
+        with self._lock:
+            self._sum_squares += float(np.dot(frames, frames))
+            self._peak = max(self._peak, float(np.max(np.abs(frames))))
+
+            # Only the first MAX_AUDIO_DURATION_SEC are embedded, as in encode()
+            keep = max(0, min(frames.size, self.max_samples - self.total_samples))
+            self.total_samples += frames.size
+            frames = frames[:keep]
+
+            while frames.size:
+                space = self._buffer.capacity - self._buffer.size
+                self._buffer.write(frames[:space])
+                frames = frames[space:]
+                while self._buffer.size >= self.window_samples:
+                    # Overlapping windows keep their last (window - hop) samples buffered
+                    self._submit_window(self._buffer.peek(self.window_samples))
+                    self._buffer.discard(self.hop_samples)
+
+    def _submit_window(self, window: np.ndarray) -> None:
+        self._windows_submitted += 1
+        if not self._usable(window, len(window)):
+            return
+        self._energies.append(float(np.dot(window, window)))
+        if self.encoder.model is not None:
+            self._pending.append(self._executor.submit(self._embed_window, window))
+
+    def _usable(self, samples: np.ndarray, valid: int) -> bool:
+        """Record the window's quality and apply the encoder's per-chunk gate."""
+        self._window_stats.append(analyze_chunk(samples, self.sample_rate))
+        if not QUALITY_CHUNK_GATING:
+            return True
+        return bool(ChunkQuality.from_stats(self._window_stats[-1:], np.array([valid])).usable[0])
+
+    def _embed_window(self, window: np.ndarray) -> np.ndarray:
+        return self.encoder._infer_chunks(window[None, :])[0]
+
+    @property
+    def duration_sec(self) -> float:
+        return self.total_samples / self.sample_rate
+
+    def quality_stats(self) -> Dict[str, float]:
+        """Live recording statistics, e.g. for a "keep recording" indicator."""
+        with self._lock:
+            rms = float(np.sqrt(self._sum_squares / self.total_samples)) if self.total_samples else 0.0
+            return {
+                "duration_sec": round(self.duration_sec, 3),
+                "rms": rms,
+                "peak": self._peak,
+                "windows_ready": sum(f.done() for f in self._pending) if self.encoder.model is not None else len(self._energies),
+                "windows_dropped": self._windows_submitted - len(self._energies),
+                "too_short": self.duration_sec < MIN_AUDIO_DURATION_SEC,
+                "too_noisy": rms > NOISE_RMS_UPPER_THRESHOLD,
+                "too_silent": rms < NOISE_RMS_LOWER_THRESHOLD,
+            }
+
+    def finalize(self) -> torch.Tensor:
+        """
+        Finish the recording and return the mean embedding.
+
+        Returns:
+            torch.Tensor: Embedding of shape (1, 512)
+
+        Raises:
+            LowQualityError: If the recording is too short, too noisy or too silent.
+        """
+        if self._closed:
+            raise RuntimeError("HeARStreamSession is already finalized")
+        self._closed = True
+
+        try:
+            stats = self.quality_stats()
+            if stats["too_short"]:
+                raise LowQualityError(
+                    f"Audio recording is too short (minimum {MIN_AUDIO_DURATION_SEC} second required)"
+                )
+            if stats["too_noisy"]:
+                raise LowQualityError("Audio recording is too noisy or distorted")
+            if stats["too_silent"]:
+                raise LowQualityError("Audio recording contains no clear signal (too silent)")
+
+            with deadline_stage("hear"):
+                if self.encoder.model is None:
+                    return self.encoder._encode_mock()
+
+                embeddings = [future.result() for future in self._pending]
+                valid = [self.window_samples] * len(embeddings)
+                energies = list(self._energies)
+
+                # Only the partial tail window is left: samples not covered by
+                # any full window, zero-padded to a full window
+                kept = min(self.total_samples, self.max_samples)
+                n_full = self._windows_submitted
+                covered = (n_full - 1) * self.hop_samples + self.window_samples if n_full else 0
+                if covered < kept or not n_full:
+                    tail = self._buffer.peek(self._buffer.size)
+                    if self._usable(tail, tail.size):
+                        padded = np.zeros((1, self.window_samples), dtype=np.float32)
+                        padded[0, :tail.size] = tail
+                        embeddings.append(self.encoder._infer_chunks(padded)[0])
+                        valid.append(tail.size)
+                        energies.append(float(np.dot(tail, tail)))
+
+                if not embeddings:
+                    quality = ChunkQuality.from_stats(self._window_stats, np.ones(len(self._window_stats)))
+                    raise LowQualityError(quality.rejection_message())
+
+                pooled = pool_embeddings(
+                    np.stack(embeddings), np.array(valid), self.encoder.pooling, np.array(energies)
+                )
+
+            logger.info("Streaming HeAR embedding finalized from %d windows", len(embeddings))
+            return torch.from_numpy(pooled).float()
+        finally:
+            self._executor.shutdown(wait=False)
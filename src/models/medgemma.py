@@ -1,14 +1,39 @@
 import torch
 import re
+import time
 import logging
-from src.config import MEDGEMMA_MODEL_PATH, IS_DEMO_MODE, HEAR_EMBEDDING_DIM
-from src.datatypes import PatientVitals, TriageResult, TriageStatus, get_fast_breathing_threshold, is_pediatric
+import threading
+from typing import List, Optional, Sequence, Tuple, Union
+from src.config import (
+    MEDGEMMA_MODEL_PATH,
+    IS_DEMO_MODE,
+    HEAR_EMBEDDING_DIM,
+    FAST_PATH_ENABLED,
+    FAST_PATH_MIN_CONFIDENCE,
+    FAST_PATH_RR_MARGIN_BPM,
+    MIN_GENERATION_BUDGET_SEC
+)
+from src.datatypes import (
+    PatientVitals,
+    TriageResult,
+    TriageStatus,
+    TriagePath,
+    DeadlineExceeded,
+    get_fast_breathing_threshold,
+    is_pediatric
+)
 from src.agent.protocols import WHORespiratoryProtocol
+from src.agent.deadline import Deadline, deadline_stage
 from src.models.projection import ProjectionLayer
 from src.models.clinical_classifier import ClinicalClassifier
+from src.models.model_store import get_model_store
 
 logger = logging.getLogger(__name__)
 
+# Output of the CPU-side stage: a prompt for MedGemma, a finished fast-path
+# result, or None when only the rule-based fallback is available
+PreparedPrompt = Union[str, TriageResult, None]
+
 
 class MedGemmaReasoning:
     """
@@ -22,20 +47,38 @@ class MedGemmaReasoning:
     - Combined with patient vitals in a clinical prompt
     - MedGemma generates chain-of-thought reasoning and triage decision
     - Adheres to WHO IMCI (pediatric) and IMAI (adult) guidelines
+    
+    Confidence-gated cascade: when the classifier is confident and the
+    respiratory rate is clearly on one side of the WHO threshold, the case is
+    resolved by protocol without calling MedGemma; only borderline cases are
+    escalated to the LLM.
     """
     
-    def __init__(self, device: str = "cuda" if torch.cuda.is_available() else "cpu"):
+    def __init__(
+        self,
+        device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        fast_path: bool = FAST_PATH_ENABLED,
+        fast_path_min_confidence: float = FAST_PATH_MIN_CONFIDENCE,
+        fast_path_rr_margin: int = FAST_PATH_RR_MARGIN_BPM,
+        classifier: Optional[ClinicalClassifier] = None,
+        projection: Optional[ProjectionLayer] = None
+    ):
         self.device = device
         self.model = None
         self.processor = None
+        self.fast_path = fast_path
+        self.fast_path_min_confidence = fast_path_min_confidence
+        self.fast_path_rr_margin = fast_path_rr_margin
+        # Serializes generate calls when one instance is shared across agents/threads
+        self._generate_lock = threading.Lock()
         
         # Projection layer: bridges HeAR audio space → clinical feature space
-        self.projection = ProjectionLayer(
+        self.projection = projection or ProjectionLayer(
             input_dim=HEAR_EMBEDDING_DIM,
             output_dim=2560
         )
         # Clinical Classifier: Trained linear probe for adventitious sounds
-        self.classifier = ClinicalClassifier()
+        self.classifier = classifier or ClinicalClassifier()
         
         if hasattr(self.projection, 'eval'):
             self.projection.eval()  # Inference-only (no training in demo)
@@ -53,8 +96,10 @@ class MedGemmaReasoning:
         try:
             from transformers import AutoModelForImageTextToText, AutoProcessor, BitsAndBytesConfig
             
-            print(f"Loading MedGemma from {MEDGEMMA_MODEL_PATH}...")
-            logger.info("Loading MedGemma from %s", MEDGEMMA_MODEL_PATH)
+            # Resolved from the local model store: start-up never touches the hub
+            model_path = get_model_store().resolve("medgemma")
+            print(f"Loading MedGemma from {model_path}...")
+            logger.info("Loading MedGemma (%s) from %s", MEDGEMMA_MODEL_PATH, model_path)
             
             quantization_config = BitsAndBytesConfig(
                 load_in_4bit=True,
@@ -63,9 +108,14 @@ class MedGemmaReasoning:
                 bnb_4bit_use_double_quant=True,
             )
             
-            self.processor = AutoProcessor.from_pretrained(MEDGEMMA_MODEL_PATH)
+            self.processor = AutoProcessor.from_pretrained(model_path, local_files_only=True)
+            # Decoder-only batched generation needs left padding so every
+            # prompt ends at the same position
+            if hasattr(self.processor, "tokenizer"):
+                self.processor.tokenizer.padding_side = "left"
             self.model = AutoModelForImageTextToText.from_pretrained(
-                MEDGEMMA_MODEL_PATH,
+                model_path,
+                local_files_only=True,
                 quantization_config=quantization_config,
                 device_map="auto",
                 torch_dtype=torch.bfloat16,
@@ -95,17 +145,193 @@ class MedGemmaReasoning:
         Returns:
             TriageResult with status, confidence, reasoning, and action
         """
-        if self.model is None or self.processor is None:
+        with deadline_stage("classifier"):
+            prompt = self.build_prompt(embedding, vitals)
+        return self.generate_from_prompt(prompt, vitals)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the MedGemma model and processor are available for generation."""
+        return self.model is not None and self.processor is not None
+
+    def build_prompt(self, embedding: torch.Tensor, vitals: PatientVitals) -> PreparedPrompt:
+        """
+        CPU-side half of `generate`: classify the embedding and build the prompt.
+        
+        Returns:
+            The clinical prompt; a finished TriageResult when the fast path
+            resolves the case; or None when MedGemma is not loaded (the
+            rule-based fallback needs no prompt).
+        """
+        if not self.is_loaded:
+            return None
+
+        # 1. Classify audio embedding
+        classification = self.classifier.predict(embedding)
+        
+        # 2. Skip the LLM for unambiguous cases
+        fast_result = self._fast_path_result(classification, vitals)
+        if fast_result is not None:
+            return fast_result
+        
+        # 3. Construct clinical prompt with audio + vitals
+        return self._construct_prompt(vitals, self._format_audio_summary(classification))
+
+    def generate_from_prompt(self, prompt: PreparedPrompt, vitals: PatientVitals) -> TriageResult:
+        """
+        Accelerator-side half of `generate`: run MedGemma on a prepared prompt.
+        
+        Args:
+            prompt: Output of `build_prompt` (a fast-path result is returned
+                    as-is; None selects the rule-based path)
+            vitals: PatientVitals object with clinical data
+            
+        Returns:
+            TriageResult with status, confidence and reasoning
+        """
+        if isinstance(prompt, TriageResult):
+            return prompt
+        if prompt is None or not self.is_loaded:
             return self._mock_generate(vitals)
+        
+        budget = self._generation_budget()
+        if budget is not None and budget < MIN_GENERATION_BUDGET_SEC:
+            return self._deadline_fallback(vitals)
+        
+        try:
+            with deadline_stage("generation"):
+                response = self._run_generation([self._build_messages(prompt)], max_time=budget)[0]
+            result = self._parse_response(response)
+            result.triage_path = TriagePath.LLM
+            return result
+            
+        except DeadlineExceeded as e:
+            logger.warning("MedGemma generation stopped: %s", str(e))
+            return self._deadline_fallback(vitals)
+        except Exception as e:
+            logger.error("MedGemma inference error: %s", str(e))
+            # Fallback to mock on runtime errors to avoid crashing the demo
+            logger.warning("Falling back to mock reasoning due to inference error")
+            return self._mock_generate(vitals)
+
+    def generate_batch(
+        self,
+        embeddings: Sequence[torch.Tensor],
+        vitals_list: Sequence[PatientVitals]
+    ) -> List[TriageResult]:
+        """
+        Generate triage results for several patients at once.
+        
+        All embeddings are classified in one ClinicalClassifier call; cases
+        the fast path cannot resolve are sent through a single padded
+        `model.generate` call.
+        
+        Args:
+            embeddings: (1, 512) tensors from HeAR encoder, one per patient
+            vitals_list: PatientVitals objects, aligned with embeddings
+            
+        Returns:
+            List of TriageResult, in input order
+        """
+        if len(embeddings) != len(vitals_list):
+            raise ValueError("embeddings and vitals_list must have the same length")
+        if not vitals_list:
+            return []
+        
+        if not self.is_loaded:
+            return [self._mock_generate(vitals) for vitals in vitals_list]
+        
+        results: List[Optional[TriageResult]] = [None] * len(vitals_list)
+        escalated = []
+        with deadline_stage("classifier"):
+            for i, (vitals, classification) in enumerate(zip(vitals_list, self.classifier.predict_batch(embeddings))):
+                results[i] = self._fast_path_result(classification, vitals)
+                if results[i] is None:
+                    escalated.append((i, self._construct_prompt(vitals, self._format_audio_summary(classification))))
+        
+        if not escalated:
+            return results
+        
+        budget = self._generation_budget()
+        try:
+            if budget is not None and budget < MIN_GENERATION_BUDGET_SEC:
+                raise DeadlineExceeded(f"only {budget:.2f}s left for generation")
+            with deadline_stage("generation"):
+                responses = self._run_generation(
+                    [self._build_messages(prompt) for _, prompt in escalated], max_time=budget
+                )
+            for (i, _), response in zip(escalated, responses):
+                results[i] = self._parse_response(response)
+                results[i].triage_path = TriagePath.LLM
+            
+        except DeadlineExceeded as e:
+            logger.warning("MedGemma batched generation stopped: %s", str(e))
+            for i, _ in escalated:
+                results[i] = self._deadline_fallback(vitals_list[i])
+        except Exception as e:
+            logger.error("MedGemma batched inference error: %s", str(e))
+            logger.warning("Falling back to mock reasoning for %d patients", len(escalated))
+            for i, _ in escalated:
+                results[i] = self._mock_generate(vitals_list[i])
+        
+        return results
 
-        # 1. Summarize audio embedding as text features
-        audio_summary = self._summarize_embedding(embedding)
+    def _fast_path_result(
+        self,
+        classification: Tuple[str, str, float],
+        vitals: PatientVitals
+    ) -> Optional[TriageResult]:
+        """
+        Resolve unambiguous cases by WHO protocol without calling MedGemma.
+        
+        A case is unambiguous when the classifier confidence clears
+        `fast_path_min_confidence` and the respiratory rate is at least
+        `fast_path_rr_margin` bpm on the side of the age threshold that agrees
+        with the acoustic label:
+          - "Normal" and RR well below threshold → GREEN
+          - adventitious sounds and RR well above threshold → YELLOW
+        Anything else (including any danger sign) is escalated.
+        """
+        if not self.fast_path:
+            return None
+        
+        label, description, confidence = classification
+        if confidence < self.fast_path_min_confidence or vitals.danger_sign_details:
+            return None
         
-        # 2. Construct clinical prompt with audio + vitals
-        prompt = self._construct_prompt(vitals, audio_summary)
+        threshold = get_fast_breathing_threshold(vitals.age_months)
+        protocol = "IMCI" if is_pediatric(vitals.age_months) else "IMAI"
+        rr = vitals.respiratory_rate
         
-        # 3. Format as chat messages for MedGemma
-        messages = [
+        if label == "Normal" and rr <= threshold - self.fast_path_rr_margin:
+            status = TriageStatus.GREEN
+            reasoning = (
+                f"{description} (classification confidence: {confidence:.0%}). "
+                f"No fast breathing ({rr} bpm, threshold for age: {threshold} bpm) "
+                f"or danger signs detected. No pneumonia per WHO {protocol} criteria."
+            )
+        elif label in ("Crackle", "Wheeze", "Both") and rr >= threshold + self.fast_path_rr_margin:
+            status = TriageStatus.YELLOW
+            reasoning = (
+                f"{description} (classification confidence: {confidence:.0%}). "
+                f"Fast breathing detected ({rr} bpm, threshold for age: {threshold} bpm). "
+                f"Consistent with respiratory pathology per WHO {protocol} criteria."
+            )
+        else:
+            return None
+        
+        logger.info("Fast path resolved triage: status=%s, label=%s, confidence=%.2f", status.value, label, confidence)
+        return TriageResult(
+            status=status,
+            confidence=confidence,
+            reasoning=reasoning,
+            action_recommendation=WHORespiratoryProtocol.get_action(status, vitals.age_months),
+            triage_path=TriagePath.FAST_PATH
+        )
+
+    def _build_messages(self, prompt: str) -> List[dict]:
+        """Format a clinical prompt as chat messages for MedGemma."""
+        return [
             {
                 "role": "system",
                 "content": [{"type": "text", "text": (
@@ -121,56 +347,114 @@ class MedGemmaReasoning:
                 "content": [{"type": "text", "text": prompt}]
             }
         ]
+
+    def _generation_budget(self) -> Optional[float]:
+        """Seconds left for generation under the active deadline (None if unbounded)."""
+        deadline = Deadline.current()
+        return deadline.budget_for("generation") if deadline is not None else None
+
+    def _deadline_fallback(self, vitals: PatientVitals) -> TriageResult:
+        """Rule-based result used when the time budget runs out before MedGemma answers."""
+        deadline = Deadline.current()
+        if deadline is not None:
+            deadline.degraded = True
+        result = self._mock_generate(vitals)
+        result.reasoning = f"{result.reasoning} (Time budget exhausted; WHO rule-based assessment used.)"
+        result.triage_path = TriagePath.DEADLINE_FALLBACK
+        return result
+
+    def _run_generation(self, conversations: List[List[dict]], max_time: Optional[float] = None) -> List[str]:
+        """
+        Tokenize one or more conversations, generate, and return cleaned responses.
         
-        try:
-            # 4. Tokenize with chat template
-            inputs = self.processor.apply_chat_template(
-                messages,
-                add_generation_prompt=True,
-                tokenize=True,
-                return_dict=True,
-                return_tensors="pt"
-            ).to(self.model.device)
-            
-            input_len = inputs["input_ids"].shape[-1]
-            
-            # 5. Generate response (deterministic, no sampling)
-            #    Use 2048 tokens to allow room for MedGemma's thinking + answer
-            with torch.inference_mode():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=2048,
-                    do_sample=False,
-                )
+        Prompts are left-padded into a single batch so the model decodes all
+        patients in one `generate` call.
+        
+        Args:
+            conversations: Chat messages, one list per patient
+            max_time: Generation time budget in seconds (unbounded if None)
             
-            # 6. Decode only new tokens
-            generated_tokens = outputs[0][input_len:]
+        Raises:
+            DeadlineExceeded: If generation was stopped by the time budget
+        """
+        generate_kwargs = {}
+        if max_time is not None:
+            from transformers import MaxTimeCriteria, StoppingCriteriaList
+            generate_kwargs["stopping_criteria"] = StoppingCriteriaList([MaxTimeCriteria(max_time=max_time)])
+        
+        # 1. Tokenize with chat template
+        inputs = self.processor.apply_chat_template(
+            conversations,
+            add_generation_prompt=True,
+            tokenize=True,
+            return_dict=True,
+            return_tensors="pt",
+            padding=True
+        ).to(self.model.device)
+        
+        input_len = inputs["input_ids"].shape[-1]
+        
+        # 2. Generate response (deterministic, no sampling)
+        #    Use 2048 tokens to allow room for MedGemma's thinking + answer
+        generation_start = time.monotonic()
+        with self._generate_lock, torch.inference_mode():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=2048,
+                do_sample=False,
+                **generate_kwargs,
+            )
+        
+        # A truncated answer is unusable: let the caller degrade to the rule path.
+        # Running past the budget only means MaxTimeCriteria cut generation
+        # short if some sequence never reached an end-of-sequence token.
+        if max_time is not None and time.monotonic() - generation_start >= max_time:
+            if not all(self._reached_eos(sequence[input_len:]) for sequence in outputs):
+                raise DeadlineExceeded(f"generation budget of {max_time:.2f}s exhausted")
+        
+        # 3. Decode only new tokens
+        responses = []
+        for sequence in outputs:
+            generated_tokens = sequence[input_len:]
             response = self.processor.decode(generated_tokens, skip_special_tokens=True)
-            
-            # 7. Strip MedGemma 1.5 thinking tokens and internal reasoning
-            response = re.sub(r'<unused\d+>', '', response)
-            response = re.sub(r'^\s*thought\b', '', response, flags=re.IGNORECASE).strip()
-            
-            # 8. Extract only the clinical answer (skip thinking sections)
-            #    MedGemma often emits planning text before REASONING:/STATUS:
-            reasoning_idx = response.upper().find('REASONING:')
-            if reasoning_idx > 0:
-                response = response[reasoning_idx:]
-            
-            logger.info("MedGemma response length: %d chars", len(response))
-            return self._parse_response(response)
-            
-        except Exception as e:
-            logger.error("MedGemma inference error: %s", str(e))
-            # Fallback to mock on runtime errors to avoid crashing the demo
-            logger.warning("Falling back to mock reasoning due to inference error")
-            return self._mock_generate(vitals)
+            responses.append(self._clean_response(response))
+        return responses
+
+    def _reached_eos(self, generated_tokens) -> bool:
+        """Whether a generated sequence contains an end-of-sequence token."""
+        eos = getattr(getattr(self.model, "generation_config", None), "eos_token_id", None)
+        if eos is None:
+            eos = getattr(getattr(self.processor, "tokenizer", None), "eos_token_id", None)
+        if eos is None:
+            # Unknown EOS: assume the time limit is what stopped generation
+            return False
+        eos_ids = set(eos) if isinstance(eos, (list, tuple)) else {eos}
+        tokens = generated_tokens.tolist() if hasattr(generated_tokens, "tolist") else list(generated_tokens)
+        return any(token in eos_ids for token in tokens)
+
+    def _clean_response(self, response: str) -> str:
+        """Strip MedGemma 1.5 thinking tokens and planning text before the answer."""
+        response = re.sub(r'<unused\d+>', '', response)
+        response = re.sub(r'^\s*thought\b', '', response, flags=re.IGNORECASE).strip()
+        
+        # Extract only the clinical answer (skip thinking sections)
+        # MedGemma often emits planning text before REASONING:/STATUS:
+        reasoning_idx = response.upper().find('REASONING:')
+        if reasoning_idx > 0:
+            response = response[reasoning_idx:]
+        
+        logger.info("MedGemma response length: %d chars", len(response))
+        return response
 
     def _summarize_embedding(self, embedding: torch.Tensor) -> str:
         """Run through trained ClinicalClassifier to get semantic labels."""
         # Run through trained Linear Probe classifier
-        label, description, confidence = self.classifier.predict(embedding)
-        
+        return self._format_audio_summary(self.classifier.predict(embedding))
+
+    @staticmethod
+    def _format_audio_summary(classification: Tuple[str, str, float]) -> str:
+        """Describe a ClinicalClassifier output as text for the prompt."""
+        _, description, confidence = classification
         return (
             f"Acoustic cough analysis: {description} "
             f"(Classification confidence: {confidence:.0%})"
@@ -328,5 +612,6 @@ CONFIDENCE: 0.85"""
             status=status,
             confidence=1.0 if status == TriageStatus.RED else 0.85,
             reasoning=reasoning,
-            action_recommendation=WHORespiratoryProtocol.get_action(status, vitals.age_months)
+            action_recommendation=WHORespiratoryProtocol.get_action(status, vitals.age_months),
+            triage_path=TriagePath.RULE_BASED
         )
@@ -0,0 +1,337 @@
+"""
+Offline-first local store for pinned model artifacts.
+
+Loading HeAR or MedGemma by HuggingFace repo ID resolves through the hub on
+every start, which on an offline edge device means slow timeouts or a
+failed load. Instead, artifacts are fetched once into a local directory and
+recorded in a manifest with their resolved commit and per-file checksums:
+
+    python -m src.models.model_store prefetch            # once, with network
+    python -m src.models.model_store verify              # optional, full SHA-256
+
+At start-up models resolve to a local path from the manifest alone:
+
+    model_dir = get_model_store().resolve("hear")
+
+Layout:
+    <root>/manifest.json        {"artifacts": {name: record}}
+    <root>/<name>/...           the artifact's files
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.config import (
+    MODEL_STORE_DIR,
+    MODEL_STORE_ALLOW_DOWNLOAD,
+    MODEL_STORE_VERIFY_CHECKSUMS,
+    MODEL_ARTIFACTS
+)
+from src.datatypes import ModelUnavailableError
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK_BYTES = 1 << 20
+# Download bookkeeping written by huggingface_hub inside local_dir
+_IGNORED_DIRS = {".cache", ".git"}
+
+
+@dataclass
+class ArtifactRecord:
+    """
+    One prefetched artifact.
+
+    Attributes:
+        name: Artifact name (e.g. "hear").
+        repo_id: HuggingFace repository it was fetched from.
+        revision: Commit hash the files were fetched at.
+        requested_revision: Revision that was asked for (branch, tag or hash).
+        path: Directory relative to the store root.
+        files: Relative file path -> {"size": bytes, "sha256": hex digest}.
+        fetched_at: Unix time of the prefetch.
+    """
+    name: str
+    repo_id: str
+    revision: str
+    requested_revision: str
+    path: str
+    files: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    fetched_at: float = 0.0
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _list_files(directory: str) -> List[str]:
+    files = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if d not in _IGNORED_DIRS)
+        for filename in sorted(filenames):
+            files.append(os.path.relpath(os.path.join(dirpath, filename), directory))
+    return files
+
+
+class ModelStore:
+    """Manifest-backed directory of pinned model artifacts."""
+
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(
+        self,
+        root: str = MODEL_STORE_DIR,
+        artifacts: Optional[Dict[str, Tuple[str, str]]] = None,
+        allow_download: bool = MODEL_STORE_ALLOW_DOWNLOAD,
+        verify_checksums: bool = MODEL_STORE_VERIFY_CHECKSUMS
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory.
+            artifacts: Artifact name -> (repo_id, pinned revision).
+            allow_download: Prefetch a missing artifact on `resolve` instead of
+                            raising (off by default: start-up stays offline).
+            verify_checksums: Re-hash every file on `resolve` (slow for
+                              MedGemma; by default only sizes are checked).
+        """
+        self.root = root
+        self.artifacts = dict(MODEL_ARTIFACTS if artifacts is None else artifacts)
+        self.allow_download = allow_download
+        self.verify_checksums = verify_checksums
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, self.MANIFEST_FILE)
+
+    def records(self) -> Dict[str, ArtifactRecord]:
+        """All artifacts in the manifest (empty if nothing was prefetched)."""
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return {name: ArtifactRecord(**record) for name, record in manifest.get("artifacts", {}).items()}
+
+    def record(self, name: str) -> Optional[ArtifactRecord]:
+        return self.records().get(name)
+
+    def resolve(self, name: str) -> str:
+        """
+        Return the local directory of a prefetched artifact, without network access.
+
+        Args:
+            name: Artifact name from MODEL_ARTIFACTS.
+
+        Returns:
+            str: Absolute path to the artifact's files.
+
+        Raises:
+            ModelUnavailableError: If the artifact was never prefetched, was
+                fetched at a different pinned revision, or its files are
+                missing or corrupt.
+        """
+        record = self.record(name)
+        if record is None:
+            if not self.allow_download:
+                raise ModelUnavailableError(
+                    f"Model '{name}' is not in the local model store ({self.root}). "
+                    f"Run once with network access: python -m src.models.model_store prefetch {name}"
+                )
+            record = self.prefetch(name)
+
+        if name in self.artifacts:
+            pinned = self.artifacts[name][1]
+            if pinned not in (record.revision, record.requested_revision):
+                raise ModelUnavailableError(
+                    f"Model '{name}' in the local store is at {record.revision}, but {pinned} is pinned. "
+                    f"Run: python -m src.models.model_store prefetch {name}"
+                )
+
+        problems = self.verify(name, checksums=self.verify_checksums, record=record)
+        if problems:
+            raise ModelUnavailableError(f"Model '{name}' in the local store is damaged: {'; '.join(problems[:3])}")
+
+        path = os.path.abspath(os.path.join(self.root, record.path))
+        logger.info("Resolved model '%s' locally: %s (%s)", name, path, record.revision)
+        return path
+
+    def verify(self, name: str, checksums: bool = True, record: Optional[ArtifactRecord] = None) -> List[str]:
+        """
+        Check an artifact's files against the manifest.
+
+        Args:
+            name: Artifact name.
+            checksums: Re-hash every file (otherwise only existence and size).
+            record: Manifest record (read from disk when None).
+
+        Returns:
+            list: One message per missing or mismatched file (empty if intact).
+        """
+        record = record or self.record(name)
+        if record is None:
+            return [f"'{name}' is not in the manifest"]
+
+        base = os.path.join(self.root, record.path)
+        problems = []
+        for relpath, expected in record.files.items():
+            path = os.path.join(base, relpath)
+            if not os.path.isfile(path):
+                problems.append(f"{relpath} is missing")
+            elif os.path.getsize(path) != expected["size"]:
+                problems.append(f"{relpath} has size {os.path.getsize(path)}, expected {expected['size']}")
+            elif checksums and _sha256(path) != expected["sha256"]:
+                problems.append(f"{relpath} checksum mismatch")
+        return problems
+
+    def file_checksum(self, path: str) -> Optional[str]:
+        """
+        Manifest SHA-256 of a file inside a stored artifact, without re-hashing it.
+
+        Returns:
+            str: Hex digest, or None if the file is not recorded in the manifest.
+        """
+        path = os.path.abspath(path)
+        for record in self.records().values():
+            base = os.path.abspath(os.path.join(self.root, record.path))
+            relpath = os.path.relpath(path, base)
+            if relpath.startswith(os.pardir):
+                continue
+            expected = record.files.get(relpath)
+            if expected is not None:
+                return str(expected["sha256"])
+        return None
+
+    def prefetch(self, name: str) -> ArtifactRecord:
+        """
+        Download an artifact at its pinned revision and record it in the manifest.
+
+        Args:
+            name: Artifact name from MODEL_ARTIFACTS.
+
+        Returns:
+            ArtifactRecord: The new manifest entry.
+        """
+        if name not in self.artifacts:
+            raise ValueError(f"Unknown model artifact '{name}'. Available: {list(self.artifacts)}")
+        from huggingface_hub import HfApi, snapshot_download
+
+        repo_id, requested = self.artifacts[name]
+        # Pin the exact commit so the files and the manifest always agree
+        revision = HfApi().model_info(repo_id, revision=requested).sha or requested
+        local_dir = os.path.join(self.root, name)
+        print(f"⬇️ Fetching {repo_id}@{revision[:12]} → {local_dir}")
+        snapshot_download(repo_id, revision=revision, local_dir=local_dir)
+        return self.register(name, local_dir, repo_id=repo_id, revision=revision, requested_revision=requested)
+
+    def register(
+        self,
+        name: str,
+        directory: str,
+        repo_id: str = "",
+        revision: str = "local",
+        requested_revision: Optional[str] = None
+    ) -> ArtifactRecord:
+        """
+        Checksum an artifact directory inside the store and add it to the manifest.
+
+        Also used to record artifacts copied in by hand (e.g. on a device
+        that never has network access).
+        """
+        directory = os.path.abspath(directory)
+        files = {
+            relpath: {"size": os.path.getsize(os.path.join(directory, relpath)),
+                      "sha256": _sha256(os.path.join(directory, relpath))}
+            for relpath in _list_files(directory)
+        }
+        if not files:
+            raise ModelUnavailableError(f"No files found for model '{name}' in {directory}")
+
+        record = ArtifactRecord(
+            name=name,
+            repo_id=repo_id,
+            revision=revision,
+            # A hand-copied artifact stands in for whatever revision is pinned
+            requested_revision=requested_revision or self.artifacts.get(name, ("", revision))[1],
+            path=os.path.relpath(directory, os.path.abspath(self.root)),
+            files=files,
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            records = self.records()
+            records[name] = record
+            self._write_manifest(records)
+        logger.info("Model '%s' recorded in the local store (%d files)", name, len(files))
+        return record
+
+    def _write_manifest(self, records: Dict[str, ArtifactRecord]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"artifacts": {name: asdict(r) for name, r in records.items()}}, f, indent=2)
+        # Atomic swap: a crash never leaves a half-written manifest
+        os.replace(tmp_path, self.manifest_path)
+
+
+_default_store: Optional[ModelStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_model_store() -> ModelStore:
+    """Return the process-wide model store rooted at MODEL_STORE_DIR."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ModelStore()
+        return _default_store
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Aura-Med local model store")
+    parser.add_argument("command", choices=["prefetch", "verify", "list"])
+    parser.add_argument("names", nargs="*", help="Artifacts (default: all pinned artifacts)")
+    parser.add_argument("--root", default=MODEL_STORE_DIR)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    store = ModelStore(root=args.root)
+    names = args.names or list(store.artifacts)
+
+    if args.command == "prefetch":
+        for name in names:
+            record = store.prefetch(name)
+            print(f"✅ {name}: {record.repo_id}@{record.revision} ({len(record.files)} files)")
+    elif args.command == "verify":
+        failed = False
+        for name in names:
+            problems = store.verify(name)
+            failed |= bool(problems)
+            print(f"❌ {name}: {'; '.join(problems)}" if problems else f"✅ {name}: intact")
+        if failed:
+            sys.exit(1)
+    else:
+        records = store.records()
+        for name in names:
+            record = records.get(name)
+            if record is None:
+                print(f"⚠️ {name}: not prefetched")
+            else:
+                size_mb = sum(f["size"] for f in record.files.values()) / 1e6
+                print(f"📦 {name}: {record.repo_id}@{record.revision} ({len(record.files)} files, {size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Process-wide registry of shared, lazily-loaded model instances.
+
+Every AuraMedAgent built without a registry loads its own HeAR SavedModel,
+4-bit MedGemma, ClinicalClassifier and ProjectionLayer. Processes that serve
+several clinics can instead hand all agents the same registry so each model
+is loaded once, on first use:
+
+    registry = get_model_registry()
+    registry.warmup()                       # optional: load + warm at startup
+    agent_a = AuraMedAgent(registry=registry)
+    agent_b = AuraMedAgent(registry=registry)   # shares agent_a's models
+"""
+
+import gc
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import torch
+
+from src.config import HEAR_EMBEDDING_DIM, HEAR_CACHE_DIR, HEAR_SHARED_BATCHING
+from src.models.hear_encoder import HeAREncoder
+from src.models.medgemma import MedGemmaReasoning
+from src.models.clinical_classifier import ClinicalClassifier
+from src.models.projection import ProjectionLayer
+from src.models.embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+HEAR = "hear"
+MEDGEMMA = "medgemma"
+CLASSIFIER = "classifier"
+PROJECTION = "projection"
+
+
+def _build_hear_encoder(warmup_at_load: Optional[bool] = None) -> HeAREncoder:
+    encoder = HeAREncoder(cache=EmbeddingCache(persist_dir=HEAR_CACHE_DIR), warmup_at_load=warmup_at_load)
+    # Every agent sharing this encoder also shares its chunk batches
+    if HEAR_SHARED_BATCHING and encoder.model is not None:
+        encoder.enable_shared_batching()
+    return encoder
+
+
+class ModelRegistry:
+    """
+    Loads each model at most once and hands out shared instances.
+
+    Loading is thread-safe (one lock per model, so loading MedGemma does not
+    block a concurrent HeAR lookup). The shared instances are safe to use
+    from several threads: HeAR inference and the SVM are stateless, the
+    embedding cache is locked, and MedGemmaReasoning serializes generate
+    calls internally.
+    """
+
+    def __init__(self, factories: Optional[Dict[str, Callable[["ModelRegistry"], Any]]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            factories: Optional overrides of the per-model constructors. Each
+                       factory receives the registry, so composite models can
+                       pull their dependencies from it.
+        """
+        self._factories: Dict[str, Callable[["ModelRegistry"], Any]] = {
+            HEAR: lambda registry: _build_hear_encoder(False if registry.defer_warmup else None),
+            CLASSIFIER: lambda registry: ClinicalClassifier(),
+            PROJECTION: lambda registry: ProjectionLayer(input_dim=HEAR_EMBEDDING_DIM, output_dim=2560),
+            MEDGEMMA: lambda registry: MedGemmaReasoning(
+                classifier=registry.get(CLASSIFIER),
+                projection=registry.get(PROJECTION)
+            ),
+        }
+        if factories:
+            self._factories.update(factories)
+
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.RLock] = {name: threading.RLock() for name in self._factories}
+        self.load_times: Dict[str, float] = {}
+        # Load models without running inference (e.g. in a process that forks
+        # workers); `warmup` then warms them where they are used
+        self.defer_warmup = False
+
+    @property
+    def names(self) -> List[str]:
+        """Names of all models the registry can provide."""
+        return list(self._factories)
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared instance for `name`, loading it on first use.
+
+        Raises:
+            KeyError: If no model is registered under `name`.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        if name not in self._factories:
+            raise KeyError(f"Unknown model '{name}'. Available: {self.names}")
+
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited
+            instance = self._instances.get(name)
+            if instance is None:
+                start = time.perf_counter()
+                logger.info("ModelRegistry: loading '%s'", name)
+                instance = self._factories[name](self)
+                self.load_times[name] = round(time.perf_counter() - start, 3)
+                self._instances[name] = instance
+                logger.info("ModelRegistry: '%s' loaded in %.2fs", name, self.load_times[name])
+        return instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def hear_encoder(self) -> HeAREncoder:
+        return self.get(HEAR)
+
+    def medgemma_reasoning(self) -> MedGemmaReasoning:
+        return self.get(MEDGEMMA)
+
+    def classifier(self) -> ClinicalClassifier:
+        return self.get(CLASSIFIER)
+
+    def projection(self) -> ProjectionLayer:
+        return self.get(PROJECTION)
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Load the given models (all by default) and warm HeAR's batch buckets.
+
+        HeAR is warmed with `HeAREncoder.warmup`, which feeds silence straight
+        to the backend; going through `embed` would hit the per-chunk quality
+        gate, which rejects silent input.
+
+        Returns:
+            dict: model name -> seconds spent loading and warming.
+        """
+        timings = {}
+        for name in (list(names) if names is not None else self.names):
+            start = time.perf_counter()
+            instance = self.get(name)
+            # Skipped when the encoder already warmed at load (HEAR_WARMUP_AT_LOAD)
+            if name == HEAR and not instance.warmup_stats:
+                instance.warmup()
+            timings[name] = round(time.perf_counter() - start, 3)
+        logger.info("ModelRegistry warmup: %s", timings)
+        return timings
+
+    def unload(self, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop the registry's references to the given models (all by default).
+
+        Agents that still hold a handle keep it alive; the next `get` reloads.
+        """
+        for name in (list(names) if names is not None else self.names):
+            with self._locks[name]:
+                if self._instances.pop(name, None) is not None:
+                    logger.info("ModelRegistry: unloaded '%s'", name)
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+_default_registry: Optional[ModelRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide default ModelRegistry."""
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = ModelRegistry()
+    return _default_registry
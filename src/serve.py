@@ -0,0 +1,368 @@
+"""
+Local triage server for clinic LANs.
+
+Stdlib-only HTTP/JSON front-end around a single AuraMedAgent, so one loaded
+set of models can serve every tablet in the clinic:
+
+    python -m src.serve --port 8080
+
+Endpoints:
+    POST /triage   JSON {"audio_b64": "<base64 WAV>", "vitals": {...}}
+                   or raw audio bytes (Content-Type audio/* or
+                   application/octet-stream) with vitals as query parameters,
+                   e.g. /triage?age_months=18&respiratory_rate=45
+    GET  /health   Liveness and batching statistics
+
+Concurrent requests are gathered into micro-batches (bounded by size and by
+the time the first request may wait) and sent through
+`AuraMedAgent.predict_batch`, so HeAR and the classifier run once per batch.
+If a batch fails, its requests are retried one by one so only the request
+at fault gets an error.
+Uploaded audio stays in memory from the request body to the encoder.
+"""
+
+import json
+import time
+import queue
+import base64
+import argparse
+import binascii
+import logging
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from src.agent.core import AuraMedAgent
+from src.utils.audio import AudioSource
+from src.datatypes import PatientVitals, TriageResult
+from src.config import (
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_MAX_BATCH_SIZE,
+    SERVE_MAX_BATCH_WAIT_MS,
+    SERVE_MAX_BODY_BYTES
+)
+
+logger = logging.getLogger(__name__)
+
+_SHUTDOWN = object()
+
+
+@dataclass
+class _BatchItem:
+    audio: AudioSource
+    vitals: PatientVitals
+    future: Future
+    enqueued_at: float
+
+
+@dataclass
+class BatchTiming:
+    """Per-request timing reported back to the client."""
+    queue_wait_ms: float
+    inference_ms: float
+    batch_size: int
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent triage requests into batches for `predict_batch`.
+
+    A batch is dispatched as soon as it holds `max_batch_size` requests or
+    its first request has waited `max_wait_ms`, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        agent: AuraMedAgent,
+        max_batch_size: int = SERVE_MAX_BATCH_SIZE,
+        max_wait_ms: float = SERVE_MAX_BATCH_WAIT_MS
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.agent = agent
+        self.max_batch_size = max_batch_size
+        self.max_wait_sec = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.max_observed_batch = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="auramed-batcher", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_SHUTDOWN)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, audio: AudioSource, vitals: PatientVitals) -> "Future[Tuple[TriageResult, BatchTiming]]":
+        """
+        Queue one request for the next batch.
+
+        Safety overrides and input validation are applied immediately so an
+        invalid request fails on its own instead of failing its batch.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            FileNotFoundError: If the audio file doesn't exist.
+        """
+        if self._thread is None:
+            raise RuntimeError("MicroBatcher is not started")
+
+        future: Future = Future()
+        # H1: Safety Check First (Architecture Mandate)
+        if self.agent._check_safety(vitals) is None:
+            # H2: Input Validation
+            self.agent._validate_audio(audio)
+        self._queue.put(_BatchItem(audio, vitals, future, time.perf_counter()))
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "max_batch_size": self.max_observed_batch,
+                "queue_depth": self._queue.qsize(),
+            }
+
+    def _collect(self, first: _BatchItem) -> Tuple[List[_BatchItem], bool]:
+        """Gather up to max_batch_size items within the wait window."""
+        batch = [first]
+        window_ends = first.enqueued_at + self.max_wait_sec
+        while len(batch) < self.max_batch_size:
+            timeout = window_ends - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _SHUTDOWN:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _SHUTDOWN:
+                return
+            batch, shutting_down = self._collect(first)
+            self._dispatch(batch)
+            if shutting_down:
+                return
+
+    def _dispatch(self, batch: List[_BatchItem]) -> None:
+        started = time.perf_counter()
+        try:
+            outcomes: List[Any] = self.agent.predict_batch([(item.audio, item.vitals) for item in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                logger.exception("Triage request failed")
+                outcomes = [e]
+            else:
+                # One bad request (e.g. an undecodable upload) must not fail
+                # every device batched with it: retry each request on its own
+                logger.warning("Micro-batch of %d failed (%s); retrying requests individually", len(batch), e)
+                outcomes = [self._predict_alone(item) for item in batch]
+        inference_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.max_observed_batch = max(self.max_observed_batch, len(batch))
+
+        for item, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                item.future.set_exception(outcome)
+                continue
+            timing = BatchTiming(
+                queue_wait_ms=round((started - item.enqueued_at) * 1000, 2),
+                inference_ms=round(inference_ms, 2),
+                batch_size=len(batch)
+            )
+            item.future.set_result((outcome, timing))
+
+    def _predict_alone(self, item: _BatchItem) -> Any:
+        """`predict` for one request of a failed batch; returns the result or the error."""
+        try:
+            return self.agent.predict(item.audio, item.vitals)
+        except Exception as e:
+            logger.exception("Triage request failed")
+            return e
+
+
+def result_to_json(result: TriageResult) -> Dict[str, Any]:
+    """Serialize a TriageResult for the HTTP response body."""
+    return {
+        "status": result.status.value,
+        "confidence": result.confidence,
+        "reasoning": result.reasoning,
+        "action_recommendation": result.action_recommendation,
+        "triage_path": result.triage_path.value if result.triage_path else None,
+        "usage_stats": result.usage_stats or {},
+    }
+
+
+class _BadRequest(Exception):
+    pass
+
+
+class TriageRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler; the server instance carries the MicroBatcher."""
+
+    server_version = "AuraMed/1.0"
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self) -> None:
+        if urlparse(self.path).path != "/health":
+            self._send_json(404, {"error": "Not found"})
+            return
+        self._send_json(200, {"status": "ok", "batching": self.server.batcher.stats()})
+
+    def do_POST(self) -> None:
+        received_at = time.perf_counter()
+        url = urlparse(self.path)
+        if url.path != "/triage":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            audio_bytes, vitals = self._parse_request(url.query)
+        except _BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            future = self.server.batcher.submit(audio_bytes, vitals)
+            result, timing = future.result()
+        except (ValueError, FileNotFoundError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        total_ms = round((time.perf_counter() - received_at) * 1000, 2)
+        self._send_json(200, result_to_json(result), headers={
+            "X-Queue-Wait-Ms": str(timing.queue_wait_ms),
+            "X-Inference-Ms": str(timing.inference_ms),
+            "X-Batch-Size": str(timing.batch_size),
+            "X-Total-Ms": str(total_ms),
+            "Server-Timing": f"queue;dur={timing.queue_wait_ms}, inference;dur={timing.inference_ms}, total;dur={total_ms}",
+        })
+
+    def _parse_request(self, query: str) -> Tuple[bytes, PatientVitals]:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise _BadRequest("Invalid Content-Length")
+        if length < 0:
+            raise _BadRequest("Invalid Content-Length")
+        if length == 0:
+            raise _BadRequest("Empty request body")
+        if length > SERVE_MAX_BODY_BYTES:
+            raise _BadRequest(f"Request body exceeds {SERVE_MAX_BODY_BYTES} bytes")
+        body = self.rfile.read(length)
+
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip()
+        if content_type == "application/json":
+            try:
+                payload = json.loads(body)
+                audio_bytes = base64.b64decode(payload["audio_b64"], validate=True)
+                vitals_data = payload["vitals"]
+            except (ValueError, KeyError, TypeError, binascii.Error) as e:
+                raise _BadRequest(f"Invalid JSON payload: {e}")
+        elif content_type.startswith("audio/") or content_type == "application/octet-stream":
+            audio_bytes = body
+            vitals_data = {key: values[-1] for key, values in parse_qs(query).items()}
+        else:
+            raise _BadRequest(f"Unsupported Content-Type '{content_type}'")
+
+        try:
+            vitals = PatientVitals(**vitals_data)
+        except Exception as e:
+            raise _BadRequest(f"Invalid vitals: {e}")
+        return audio_bytes, vitals
+
+    def _send_json(self, code: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TriageServer(ThreadingHTTPServer):
+    """Threaded HTTP server whose handlers share one MicroBatcher."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], batcher: MicroBatcher):
+        super().__init__(address, TriageRequestHandler)
+        self.batcher = batcher
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.batcher.close()
+
+
+def create_server(
+    agent: Optional[AuraMedAgent] = None,
+    host: str = SERVE_HOST,
+    port: int = SERVE_PORT,
+    max_batch_size: int = SERVE_MAX_BATCH_SIZE,
+    max_wait_ms: float = SERVE_MAX_BATCH_WAIT_MS
+) -> TriageServer:
+    """Build a TriageServer (with a started MicroBatcher) around `agent`."""
+    batcher = MicroBatcher(agent or AuraMedAgent(), max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    batcher.start()
+    return TriageServer((host, port), batcher)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Aura-Med local triage server")
+    parser.add_argument("--host", default=SERVE_HOST)
+    parser.add_argument("--port", type=int, default=SERVE_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=SERVE_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=SERVE_MAX_BATCH_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    print("🚀 Loading Aura-Med models...")
+    server = create_server(
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms
+    )
+    print(f"✅ Serving triage on http://{args.host}:{args.port}/triage "
+          f"(batch ≤ {args.max_batch_size}, wait ≤ {args.max_wait_ms:g} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,8 @@ image = (
         "torch",
         "kaggle"
     )
+    # Cycle parsing, the per-chunk embedding store and audio decoding/resampling
+    .add_local_python_source("src")
 )
 
 # 2. Main Training Class/Functions
@@ -36,7 +38,6 @@ image = (
 def train_model():
     import numpy as np
     import pandas as pd
-    import librosa
     import torch
     import tensorflow as tf
     from huggingface_hub import snapshot_download
@@ -120,6 +121,15 @@ def train_model():
     
     hear_model = tf.saved_model.load(model_dir)
     infer = hear_model.signatures["serving_default"]
+    # Snapshot directories are named after the commit hash
+    revision = f"{model_id}@{os.path.basename(os.path.normpath(model_dir))}"
+    
+    # Cycle embeddings persist on the volume; reruns only embed new recordings
+    from src.data.embedding_store import EmbeddingStore
+    from src.data.icbhi_loader import read_cycle_annotations, cycle_windows
+    from src.utils.audio import load_audio
+    store = EmbeddingStore("/data/hear_embeddings")
+    print(f"📦 Embedding store: {len(store)} cycles cached")
     
     # --- Step 3: Parse Annotations and Extract Embeddings ---
     print("🔍 Parsing ICBHI annotations and extracting embeddings...")
@@ -149,7 +159,7 @@ def train_model():
     y = []
     
     # Sample files to find labels
-    annotation_files = [f for f in os.listdir(audio_dir) if f.endswith(".txt")]
+    annotation_files = sorted(f for f in os.listdir(audio_dir) if f.endswith(".txt"))
     print(f"Found {len(annotation_files)} annotation files.")
     
     count = 0
@@ -163,54 +173,34 @@ def train_model():
         wav_path = os.path.join(audio_dir, base_name + ".wav")
         if not os.path.exists(wav_path):
             continue
-            
-        # Load audio (16kHz mono)
-        audio, _ = librosa.load(wav_path, sr=16000, mono=True)
         
-        # Read cycle annotations
-        with open(os.path.join(audio_dir, txt_file), 'r') as f:
-            for line in f:
-                parts = line.strip().split() # start, end, crackle, wheeze
-                if len(parts) < 4: continue
-                
-                try:
-                    start, end = float(parts[0]), float(parts[1])
-                    crackle, wheeze = int(parts[2]), int(parts[3])
-                except ValueError: continue
-                
-                # Derive label: 0=Normal, 1=Crackle, 2=Wheeze, 3=Both
-                if crackle == 1 and wheeze == 1: label = 3
-                elif crackle == 1: label = 1
-                elif wheeze == 1: label = 2
-                else: label = 0
-                
-                # Extract audio slice
-                start_idx = int(start * 16000)
-                end_idx = int(end * 16000)
-                cycle_audio = audio[start_idx:end_idx]
-                
-                if len(cycle_audio) == 0: continue
-                
-                # HeAR expects 2s (32000 samples)
-                target_len = 32000
-                if len(cycle_audio) > target_len:
-                    cycle_audio = cycle_audio[:target_len]
-                else:
-                    cycle_audio = np.pad(cycle_audio, (0, target_len - len(cycle_audio)))
-                
-                # HeAR Inference
-                input_tensor = np.expand_dims(cycle_audio, axis=0)
-                output = infer(x=tf.constant(input_tensor, dtype=tf.float32))
-                embedding = output['output_0'].numpy().squeeze() # (512,)
-                
-                X.append(embedding)
-                y.append(label)
-                count += 1
-                
-                if count % 100 == 0:
-                    print(f"Extracted {count} cycle embeddings...")
+        def embed_recording():
+            # Load audio (16kHz mono), cut out every annotated cycle as a 2s (32000) window
+            audio, _ = load_audio(wav_path, sr=16000)
+            cycles = read_cycle_annotations(os.path.join(audio_dir, txt_file))
+            windows, cycles = cycle_windows(audio, cycles, sr=16000, window=32000)
+            # HeAR Inference, batched per recording
+            embeddings = np.concatenate([
+                infer(x=tf.constant(windows[i:i + 16], dtype=tf.float32))['output_0'].numpy()
+                for i in range(0, len(windows), 16)
+            ]) if len(windows) else np.empty((0, 512), dtype=np.float32)
+            return embeddings, [(c.start, c.end) for c in cycles], [c.label for c in cycles]
+        
+        entry = store.get_or_compute(base_name, revision, embed_recording)
+        if entry.count == 0:
+            continue
+        take = min(entry.count, max_cycles - count)
+        X.append(store.read_range(entry.row, entry.row + take))
+        y.extend(entry.labels[:take])
+        
+        previous = count
+        count += take
+        if count // 100 > previous // 100:
+            print(f"Collected {count} cycle embeddings...")
+    
+    data_volume.commit()
 
-    X = np.array(X)
+    X = np.concatenate(X) if X else np.empty((0, 512), dtype=np.float32)
     y = np.array(y)
     
     print(f"✅ Extraction complete. Dataset size: {X.shape}")
@@ -1 +1,2 @@
-from .audio import load_audio, normalize_duration
+from .audio import load_audio, normalize_duration, resolve_audio_source, AudioSource, BufferPool
+from .decode_pool import DecodePool, DecodedAudio
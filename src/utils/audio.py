@@ -1,46 +1,436 @@
+import io
 import os
-import librosa
+import struct
+import functools
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Tuple, Union
+
 import numpy as np
 
-def load_audio(path, sr=16000):
+from src.config import AUDIO_BUFFER_POOL_SIZE
+from src.utils.resample import get_resampler
+
+# Anything load_audio accepts: a path, the file's bytes, a binary file-like
+# object, or an already decoded (waveform, sample_rate) pair
+AudioSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, Tuple[np.ndarray, int]]
+
+# RIFF format tags
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> little-endian sample dtype read straight from disk
+_NATIVE_DTYPES = {
+    (WAVE_FORMAT_PCM, 8): np.dtype("u1"),
+    (WAVE_FORMAT_PCM, 16): np.dtype("<i2"),
+    (WAVE_FORMAT_PCM, 32): np.dtype("<i4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype("<f4"),
+}
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    """Layout of a RIFF/WAVE file, read from its header."""
+    format_tag: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def block_align(self) -> int:
+        return self.channels * self.bits_per_sample // 8
+
+    @property
+    def frames(self) -> int:
+        return self.data_size // self.block_align if self.block_align else 0
+
+    @property
+    def duration_sec(self) -> float:
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def native_dtype(self) -> Optional[np.dtype]:
+        """Sample dtype when the samples can be mapped directly, else None (e.g. 24-bit)."""
+        return _NATIVE_DTYPES.get((self.format_tag, self.bits_per_sample))
+
+
+def _parse_wav_header(read, size):
+    """
+    Walk the RIFF chunks of a WAV held in a file or a buffer.
+
+    Args:
+        read: read(offset, n) -> bytes.
+        size: Total size in bytes.
+    """
+    riff = read(0, 12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    position = 12
+    while True:
+        header = read(position, 8)
+        if len(header) < 8:
+            return None
+        chunk_id, chunk_size = header[:4], struct.unpack("<I", header[4:])[0]
+        body_offset = position + 8
+        if chunk_id == b"fmt ":
+            body = read(body_offset, chunk_size)
+            if len(body) < 16:
+                return None
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                # The actual format is the first two bytes of the SubFormat GUID
+                format_tag = struct.unpack("<H", body[24:26])[0]
+            fmt = (format_tag, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            # Streamed writers may leave the size at 0 / 0xFFFFFFFF: trust the file size
+            available = size - body_offset
+            data_size = chunk_size if 0 < chunk_size <= available else available
+            format_tag, channels, sample_rate, bits = fmt
+            return WavInfo(format_tag, channels, sample_rate, bits, body_offset, data_size)
+        # Chunks are word-aligned
+        position = body_offset + chunk_size + (chunk_size & 1)
+
+
+def read_wav_header(source):
+    """
+    Parse the RIFF header of a WAV file without reading the samples.
+
+    Args:
+        source (str or buffer): Path to the audio file, or the file's bytes.
+
+    Returns:
+        WavInfo or None: None if the file is not a (well-formed) RIFF/WAVE file.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        buffer = memoryview(source).cast("B")
+        return _parse_wav_header(lambda offset, n: bytes(buffer[offset:offset + n]), len(buffer))
+
+    with open(source, "rb") as f:
+        def read(offset, n):
+            f.seek(offset)
+            return f.read(n)
+
+        return _parse_wav_header(read, os.fstat(f.fileno()).st_size)
+
+
+def _to_mono_float32(samples, channels):
+    """Scale integer PCM to [-1, 1) float32 and average channels (as librosa does)."""
+    if samples.dtype == np.uint8:
+        scale, bias = np.float32(1.0 / 128.0), np.float32(-1.0)
+    elif samples.dtype.kind == "i":
+        scale, bias = np.float32(1.0 / (1 << (8 * samples.dtype.itemsize - 1))), None
+    else:
+        scale, bias = None, None
+
+    # Sum the interleaved channels through strided slices (a reduction over a
+    # 2-wide axis is far slower), then scale once
+    waveform = np.array(samples[0::channels], dtype=np.float32)
+    for channel in range(1, channels):
+        waveform += samples[channel::channels]
+    if channels > 1:
+        scale = np.float32(1.0 / channels) * (scale if scale is not None else np.float32(1.0))
+    if scale is not None:
+        waveform *= scale
+    if bias is not None:
+        waveform += bias
+    return waveform
+
+
+def _read_wav_native(source, info, start=0, stop=None):
+    """Map frames [start, stop) of the data chunk (file or buffer) and convert them to mono float32 in one pass."""
+    stop = info.frames if stop is None else stop
+    count = (stop - start) * info.channels
+    if count <= 0:
+        return np.zeros(0, dtype=np.float32)
+    offset = info.data_offset + start * info.block_align
+    if isinstance(source, memoryview):
+        samples = np.frombuffer(source, dtype=info.native_dtype, count=count, offset=offset)
+    else:
+        samples = np.memmap(source, dtype=info.native_dtype, mode="r", offset=offset, shape=(count,))
+    return _to_mono_float32(samples, info.channels)
+
+
+def _open_soundfile(source):
+    """(read_frames, frames, sample_rate) if soundfile is installed and can read the format, else None."""
+    try:
+        import soundfile as sf
+    except ImportError:
+        return None
+    # soundfile reads buffers through a file-like object
+    file = io.BytesIO(source) if isinstance(source, memoryview) else source
+    try:
+        info = sf.info(file)
+    except RuntimeError:
+        # Format soundfile cannot decode (e.g. mp3 on old libsndfile)
+        return None
+
+    def read(start, stop):
+        if not isinstance(file, str):
+            file.seek(0)
+        data, _ = sf.read(file, start=start, stop=stop, dtype="float32", always_2d=True)
+        waveform = data[:, 0] if data.shape[1] == 1 else data.mean(axis=1, dtype=np.float32)
+        return np.ascontiguousarray(waveform)
+
+    return read, info.frames, info.samplerate
+
+
+def _open_decoder(source):
+    """
+    Pick the reader for a resolved source without decoding any samples.
+
+    Returns:
+        tuple or None: (read_frames(start, stop), frames, sample_rate), or None
+        if neither the native WAV reader nor soundfile can decode the source.
+    """
+    if isinstance(source, tuple):
+        waveform, sample_rate = source
+        return (lambda start, stop: waveform[start:stop]), len(waveform), sample_rate
+
+    try:
+        info = read_wav_header(source)
+    except OSError:
+        info = None
+    if info is not None and info.native_dtype is not None:
+        return functools.partial(_read_wav_native, source, info), info.frames, info.sample_rate
+    return _open_soundfile(source)
+
+
+def resolve_audio_source(source):
+    """
+    Normalize any supported audio input without touching disk.
+
+    Accepts a path, raw file bytes (bytes, bytearray, memoryview), a binary
+    file-like object (read once; an io.BytesIO is used without copying), or
+    an already decoded (waveform, sample_rate) pair.
+
+    Args:
+        source: The audio input.
+
+    Returns:
+        str, memoryview or tuple: A path, a byte buffer, or a (1-D float32
+        waveform, sample_rate) pair. Resolved sources resolve to themselves.
+
+    Raises:
+        TypeError: If the input type is not supported.
+        ValueError: If a decoded waveform is not 1-D.
     """
-    Load an audio file and resample to the target sample rate.
-    
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).cast("B")
+    if isinstance(source, tuple) and len(source) == 2:
+        waveform, sample_rate = source
+        waveform = np.asarray(waveform, dtype=np.float32)
+        if waveform.ndim != 1:
+            raise ValueError(f"Decoded audio must be a 1-D (mono) waveform, got shape {waveform.shape}")
+        return waveform, int(sample_rate)
+    if hasattr(source, "read"):
+        if hasattr(source, "getbuffer"):
+            return source.getbuffer()[source.tell():]
+        return memoryview(source.read())
+    raise TypeError(f"Unsupported audio input of type {type(source).__name__}")
+
+
+def describe_audio_source(source):
+    """Short description of an audio input for logs (never the samples themselves)."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, tuple) and len(source) == 2:
+        return f"<decoded audio: {len(source[0])} samples @ {source[1]} Hz>"
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"<in-memory audio: {memoryview(source).nbytes} bytes>"
+    return f"<{type(source).__name__} audio stream>"
+
+
+def _frame_window(frames, rate, offset, duration):
+    """[start, stop) sample indices of an (offset, duration) window in seconds, clamped to `frames`."""
+    start = min(frames, max(0, int(round(offset * rate))))
+    stop = frames if duration is None else min(frames, start + int(round(duration * rate)))
+    return start, stop
+
+
+def _read_resampled(read, frames, file_sr, sr, offset, duration):
+    """
+    Decode and resample only the input frames behind the requested output window.
+
+    Output sample n depends on input frames within one filter length of
+    n * down / up. Decoding from a multiple of `down` keeps the output grid
+    aligned, so the window matches resampling the whole file and slicing it.
+    """
+    resampler = get_resampler(file_sr, sr)
+    total = resampler.output_length(frames)
+    start, stop = _frame_window(total, sr, offset, duration)
+    if start == 0 and stop == total:
+        return resampler(read(0, frames))
+
+    up, down = resampler.up, resampler.down
+    margin = resampler.taps_per_phase
+    first = max(0, start * down // up - margin) // down * down
+    last = min(frames, -(-stop * down // up) + margin)
+    skip = first * up // down
+    return resampler(read(first, last))[start - skip:stop - skip]
+
+
+def load_audio(source, sr=16000, offset=0.0, duration=None):
+    """
+    Load audio and resample to the target sample rate.
+
+    `source` may be a path or an in-memory recording (bytes, a file-like
+    object or a decoded (waveform, sample_rate) pair, see
+    `resolve_audio_source`); in-memory input never touches disk.
+
+    PCM/float WAVs are mapped straight into float32 after reading the RIFF
+    header (memory-mapped from files, viewed in place from buffers), and
+    other formats soundfile can read (24-bit WAV, FLAC, ...) are decoded by
+    it. Off-rate audio is resampled with the cached polyphase engine. Only
+    formats neither can decode (e.g. mp3 on old libsndfile) fall back to
+    librosa, which is only imported then.
+
+    With `offset`/`duration` only the frames behind that window (plus the
+    resampling filter's margin) are read and resampled; the samples are the
+    same as loading the whole file and slicing.
+
     Args:
-        path (str): Path to the audio file.
-        sr (int): Target sample rate. Default is 16000.
-        
+        source: Path to the audio file, or the in-memory recording.
+        sr (int): Target sample rate. Default is 16000 (None keeps the file's rate).
+        offset (float): Start of the window, in seconds.
+        duration (float): Max length of the window in seconds (None reads to the end).
+
     Returns:
         tuple: (waveform, sample_rate)
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Audio file not found: {path}")
-        
+    source = resolve_audio_source(source)
+    if isinstance(source, str) and not os.path.exists(source):
+        raise FileNotFoundError(f"Audio file not found: {source}")
+
+    decoder = _open_decoder(source)
+    if decoder is not None:
+        read, frames, file_sr = decoder
+        if sr is None or sr == file_sr:
+            return read(*_frame_window(frames, file_sr, offset, duration)), file_sr
+        return _read_resampled(read, frames, file_sr, sr, offset, duration), sr
+
+    import librosa
+
+    window = {}
+    if offset:
+        window["offset"] = offset
+    if duration is not None:
+        window["duration"] = duration
     # librosa.load resamples to sr and converts to mono by default
-    waveform, sample_rate = librosa.load(path, sr=sr, mono=True)
+    target = io.BytesIO(source) if isinstance(source, memoryview) else source
+    waveform, sample_rate = librosa.load(target, sr=sr, mono=True, **window)
     return waveform, sample_rate
 
-def normalize_duration(audio, target_length=10.0, sr=16000):
+
+class BufferPool:
+    """
+    Reusable sample buffers for duration normalization.
+
+    Buffers are keyed by (length, dtype); a released buffer is handed to the
+    next request of the same shape, so steady-state requests pad without
+    allocating. Thread-safe.
+    """
+
+    def __init__(self, max_idle=AUDIO_BUFFER_POOL_SIZE):
+        """
+        Args:
+            max_idle (int): Max released buffers kept per (length, dtype).
+        """
+        self.max_idle = max_idle
+        self.allocations = 0
+        self._idle = {}
+        # Weak, so a buffer that is never released is simply garbage collected
+        self._leased = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def acquire(self, length, dtype=np.float32):
+        """
+        Lease an uninitialized 1-D buffer.
+
+        Args:
+            length (int): Number of samples.
+            dtype: Sample dtype.
+
+        Returns:
+            np.ndarray: Buffer owned by the caller until `release`.
+        """
+        key = (int(length), np.dtype(dtype).str)
+        with self._lock:
+            idle = self._idle.get(key)
+            buffer = idle.pop() if idle else None
+            if buffer is None:
+                buffer = np.empty(key[0], dtype=dtype)
+                self.allocations += 1
+            self._leased[id(buffer)] = buffer
+        return buffer
+
+    def release(self, array):
+        """
+        Return a leased buffer (or any view of it) to the pool.
+
+        Args:
+            array (np.ndarray): The buffer or a view of it.
+
+        Returns:
+            bool: False if `array` is not backed by a buffer leased from this pool.
+        """
+        root = array
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        with self._lock:
+            buffer = self._leased.pop(id(root), None)
+            if buffer is None:
+                return False
+            idle = self._idle.setdefault((len(buffer), buffer.dtype.str), [])
+            if len(idle) < self.max_idle:
+                idle.append(buffer)
+        return True
+
+
+def normalize_duration(audio, target_length=10.0, sr=16000, out=None, pool=None):
     """
     Truncate or zero-pad audio to the target duration.
-    
+
+    The dtype of `audio` is preserved. Truncation returns a view of `audio`
+    and audio already at the target length is returned as is; only padding
+    writes samples, into `out`, a buffer leased from `pool`, or a new array
+    (in that order of preference).
+
     Args:
         audio (np.ndarray): Input waveform.
         target_length (float): Target duration in seconds.
         sr (int): Sample rate.
-        
+        out (np.ndarray): Optional buffer of at least the target length, same dtype as `audio`.
+        pool (BufferPool): Optional pool to lease the padding buffer from; the
+            caller releases the result when done with it.
+
     Returns:
         np.ndarray: Normalized waveform.
     """
     target_samples = int(target_length * sr)
     current_samples = len(audio)
-    
+
     if current_samples > target_samples:
         # Truncate
         return audio[:target_samples]
     elif current_samples < target_samples:
         # Zero-pad
-        padding = np.zeros(target_samples - current_samples)
-        return np.concatenate((audio, padding))
+        if out is None:
+            out = pool.acquire(target_samples, audio.dtype) if pool is not None else np.empty(target_samples, dtype=audio.dtype)
+        elif out.dtype != audio.dtype or len(out) < target_samples:
+            raise ValueError(f"out must be a {audio.dtype} buffer of at least {target_samples} samples")
+        out = out[:target_samples]
+        out[:current_samples] = audio
+        out[current_samples:] = 0
+        return out
     else:
         return audio
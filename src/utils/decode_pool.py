@@ -0,0 +1,318 @@
+"""
+Process-based audio decode pool with shared-memory outputs.
+
+Decoding and resampling are CPU-bound and otherwise run one file at a time
+in the calling thread. DecodePool decodes in worker processes, ahead of the
+consumer: each worker writes the float32 samples straight into one of a
+fixed ring of shared-memory slots, and only (slot, length, rate) travels
+back over the result queue, so the audio itself is never pickled.
+
+    with DecodePool(workers=4) as pool:
+        for item in pool.imap(paths):
+            with item:
+                waveform, sr = item.result()    # view into shared memory,
+                ...                             # valid until the item is released
+
+The slot count bounds the prefetch: at most `prefetch` recordings are
+decoded (or being decoded) ahead of the consumer, so memory stays at
+prefetch x max_duration x sr x 4 bytes however long the input list is.
+"""
+
+import sys
+import math
+import queue
+import pickle
+import logging
+import threading
+import multiprocessing as mp
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import SAMPLE_RATE, MAX_AUDIO_DURATION_SEC, DECODE_POOL_WORKERS, DECODE_POOL_PREFETCH
+from src.utils.audio import AudioSource, load_audio
+
+logger = logging.getLogger(__name__)
+
+_STOP = None
+_POLL_INTERVAL_SEC = 0.5
+
+
+def _decode_worker(slot_names, max_samples, sr, max_duration, jobs, results) -> None:
+    """Worker loop: decode each job into its assigned shared-memory slot."""
+    slots = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    buffers = [np.ndarray((max_samples,), dtype=np.float32, buffer=slot.buf) for slot in slots]
+    try:
+        while True:
+            job = jobs.get()
+            if job is _STOP:
+                return
+            job_id, slot, source = job
+            try:
+                waveform, rate = load_audio(source, sr=sr, duration=max_duration)
+                length = min(len(waveform), max_samples)
+                buffers[slot][:length] = waveform[:length]
+                results.put((job_id, slot, length, rate, None))
+            except Exception as e:
+                try:
+                    pickle.dumps(e)
+                except Exception:
+                    # Unpicklable decoder errors would be lost in the queue's feeder thread
+                    e = RuntimeError(f"{type(e).__name__}: {e}")
+                results.put((job_id, slot, 0, 0, e))
+    finally:
+        del buffers
+        for slot in slots:
+            slot.close()
+
+
+class DecodedAudio:
+    """
+    One decoded recording, held in a shared-memory slot until released.
+
+    Usable as a context manager that releases the slot on exit.
+    """
+
+    def __init__(self, pool: "DecodePool", slot: int, length: int, sample_rate: int, error: Optional[Exception]):
+        self._pool = pool
+        self._slot: Optional[int] = slot
+        self.length = length
+        self.sample_rate = sample_rate
+        self.error = error
+
+    def result(self) -> Tuple[np.ndarray, int]:
+        """
+        Return (waveform, sample_rate); the waveform is a view into the slot.
+
+        Raises:
+            Exception: The worker's decode error (e.g. FileNotFoundError).
+            RuntimeError: If the item was already released.
+        """
+        if self.error is not None:
+            raise self.error
+        if self._slot is None:
+            raise RuntimeError("DecodedAudio was already released")
+        return self._pool._view(self._slot, self.length), self.sample_rate
+
+    def release(self) -> None:
+        """Hand the slot back to the pool (the waveform view must not be used afterwards)."""
+        if self._slot is not None:
+            self._pool._free.put(self._slot)
+            self._slot = None
+
+    def __enter__(self) -> "DecodedAudio":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class DecodePool:
+    """
+    Decode audio files in worker processes into shared memory, with bounded prefetch.
+
+    Every recording is decoded exactly as `load_audio(source, sr=sr,
+    duration=max_duration)` would, at most `max_duration` seconds of it.
+    """
+
+    def __init__(
+        self,
+        workers: int = DECODE_POOL_WORKERS,
+        prefetch: int = DECODE_POOL_PREFETCH,
+        sr: int = SAMPLE_RATE,
+        max_duration: float = MAX_AUDIO_DURATION_SEC,
+        start_method: Optional[str] = None
+    ):
+        """
+        Args:
+            workers: Decode processes.
+            prefetch: Shared-memory slots, i.e. max recordings decoded ahead
+                      of (or held by) the consumer.
+            sr: Target sample rate.
+            max_duration: Seconds decoded per recording (sizes the slots).
+            start_method: multiprocessing start method for the workers (None
+                          picks one when the pool starts, see `_context`).
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+        if max_duration <= 0:
+            raise ValueError("max_duration must be positive")
+
+        self.workers = workers
+        self.prefetch = prefetch
+        self.sr = sr
+        self.max_duration = max_duration
+        self.max_samples = int(math.ceil(max_duration * sr))
+        self.start_method = start_method
+        self.decoded = 0
+
+        self._ctx = None
+        self._slots: List[shared_memory.SharedMemory] = []
+        self._free: "queue.Queue[int]" = queue.Queue()
+        self._jobs = None
+        self._results = None
+        self._processes: List[Any] = []
+        self._done: Dict[int, Tuple] = {}
+        self._lock = threading.Lock()
+        self._next_job = 0
+
+    def __enter__(self) -> "DecodePool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._processes)
+
+    def _context(self):
+        """
+        Multiprocessing context for the workers.
+
+        fork (where available) starts workers without re-importing anything.
+        Forking a parent that has already loaded TensorFlow can deadlock the
+        children on locks held by its thread pools, so once TensorFlow is
+        imported the workers come from a forkserver (or spawn) instead. Start
+        the pool before loading HeAR to keep the cheap fork path.
+        """
+        if self.start_method is not None:
+            return mp.get_context(self.start_method)
+        methods = mp.get_all_start_methods()
+        if "fork" in methods and "tensorflow" not in sys.modules:
+            return mp.get_context("fork")
+        return mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+    def start(self) -> None:
+        """Allocate the shared-memory slots and start the workers."""
+        if self._processes:
+            return
+        self._ctx = self._context()
+        self._slots = [
+            shared_memory.SharedMemory(create=True, size=self.max_samples * np.dtype(np.float32).itemsize)
+            for _ in range(self.prefetch)
+        ]
+        for slot in range(self.prefetch):
+            self._free.put(slot)
+        self._jobs = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        names = [slot.name for slot in self._slots]
+        for _ in range(self.workers):
+            process = self._ctx.Process(
+                target=_decode_worker,
+                args=(names, self.max_samples, self.sr, self.max_duration, self._jobs, self._results),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info("Decode pool started: %d %s workers, %d x %.1fs slots",
+                    self.workers, self._ctx.get_start_method(), self.prefetch, self.max_duration)
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if not self._processes:
+            return
+        for _ in self._processes:
+            self._jobs.put(_STOP)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        for slot in self._slots:
+            try:
+                slot.close()
+            except BufferError:
+                # A caller still holds a waveform view; the mapping goes when it does
+                pass
+            slot.unlink()
+        self._slots = []
+        self._free = queue.Queue()
+        self._done.clear()
+
+    def imap(self, sources: Iterable[AudioSource]) -> Iterator[DecodedAudio]:
+        """
+        Decode `sources` in the workers and yield them in input order.
+
+        Up to `prefetch` recordings are decoded ahead; a slot is reused once
+        its item is released, so release (or `with`) every item.
+
+        Yields:
+            DecodedAudio: Call `result()` for (waveform, sample_rate).
+
+        Raises:
+            RuntimeError: If the pool is not started, a worker died, or every
+                slot is held by unreleased items.
+        """
+        if not self._processes:
+            raise RuntimeError("DecodePool is not started")
+
+        sources = iter(sources)
+        pending: "deque[int]" = deque()
+        exhausted = False
+        try:
+            while True:
+                # Keep every free slot busy
+                while not exhausted:
+                    try:
+                        slot = self._free.get_nowait()
+                    except queue.Empty:
+                        break
+                    try:
+                        source = next(sources)
+                    except StopIteration:
+                        self._free.put(slot)
+                        exhausted = True
+                        break
+                    pending.append(self._submit(slot, source))
+                if not pending:
+                    if exhausted:
+                        return
+                    raise RuntimeError(
+                        f"All {self.prefetch} decode slots are held; release decoded items before requesting more"
+                    )
+                _, slot, length, rate, error = self._wait(pending.popleft())
+                self.decoded += 1
+                yield DecodedAudio(self, slot, length, rate, error)
+        finally:
+            # Abandoned early: reclaim the slots of decodes still in flight
+            for job_id in pending:
+                try:
+                    self._free.put(self._wait(job_id)[1])
+                except RuntimeError:
+                    break
+
+    def _submit(self, slot: int, source: AudioSource) -> int:
+        with self._lock:
+            job_id = self._next_job
+            self._next_job += 1
+        if isinstance(source, memoryview):
+            # memoryviews do not pickle
+            source = source.tobytes()
+        self._jobs.put((job_id, slot, source))
+        return job_id
+
+    def _wait(self, job_id: int) -> Tuple:
+        """Block until `job_id`'s result arrives (results of other jobs are parked)."""
+        while True:
+            with self._lock:
+                message = self._done.pop(job_id, None)
+                if message is not None:
+                    return message
+                try:
+                    message = self._results.get(timeout=_POLL_INTERVAL_SEC)
+                except queue.Empty:
+                    if not all(process.is_alive() for process in self._processes):
+                        raise RuntimeError("A decode worker died")
+                    continue
+                if message[0] == job_id:
+                    return message
+                self._done[message[0]] = message
+
+    def _view(self, slot: int, length: int) -> np.ndarray:
+        return np.ndarray((length,), dtype=np.float32, buffer=self._slots[slot].buf)
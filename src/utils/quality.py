@@ -0,0 +1,197 @@
+"""
+Single-pass audio quality analysis.
+
+One global RMS cannot tell a clipped segment from a loud cough, and it
+rejects a whole recording for a few bad seconds. The analyzer instead
+computes, per chunk and in one pass over each chunk's samples:
+
+  - RMS (via a dot product) and peak amplitude
+  - clipping ratio: fraction of samples at full scale
+  - frame-energy variance: spread of short-frame log energies (dB²)
+  - rough SNR: loud-frame vs quiet-frame energy (90th vs 10th percentile, dB)
+
+Frames are reshaped views of the chunk and every temporary is bounded by a
+chunk, never by the recording. The encoder uses the per-chunk verdicts to
+drop bad chunks before they reach HeAR.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from src.config import (
+    SAMPLE_RATE,
+    HEAR_CHUNK_DURATION_SEC,
+    NOISE_RMS_UPPER_THRESHOLD,
+    NOISE_RMS_LOWER_THRESHOLD,
+    QUALITY_FRAME_SEC,
+    QUALITY_CLIP_LEVEL,
+    QUALITY_MAX_CLIPPING_RATIO,
+    QUALITY_MIN_SNR_DB
+)
+from src.utils.segmentation import Segments
+
+_EPS = 1e-10
+_STAT_KEYS = ("rms", "peak", "clipping_ratio", "energy_var_db", "snr_db")
+
+TOO_NOISY_MESSAGE = "Audio recording is too noisy or distorted"
+TOO_SILENT_MESSAGE = "Audio recording contains no clear signal (too silent)"
+
+
+class _Accumulator:
+    """Running statistics over consecutive blocks of one signal."""
+
+    def __init__(self, frame_len: int, clip_level: float):
+        self.frame_len = frame_len
+        self.clip_level = clip_level
+        self.samples = 0
+        self.sum_squares = 0.0
+        self.peak = 0.0
+        self.clipped = 0
+        self.frame_energies: List[np.ndarray] = []
+
+    def update(self, block: np.ndarray) -> None:
+        if block.size == 0:
+            return
+        block = np.asarray(block, dtype=np.float32)
+        self.samples += block.size
+        self.sum_squares += float(np.dot(block, block))
+        self.peak = max(self.peak, float(block.max()), -float(block.min()))
+        self.clipped += int(np.count_nonzero(block >= self.clip_level) + np.count_nonzero(block <= -self.clip_level))
+
+        n_frames = block.size // self.frame_len
+        if n_frames:
+            frames = block[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+            self.frame_energies.append(np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / self.frame_len)
+
+    def result(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"rms": 0.0, "peak": 0.0, "clipping_ratio": 0.0, "energy_var_db": 0.0, "snr_db": 0.0}
+        energy_var_db = snr_db = 0.0
+        if self.frame_energies:
+            energy_db = 10.0 * np.log10(np.concatenate(self.frame_energies) + _EPS)
+            energy_var_db = float(np.var(energy_db))
+            loud, quiet = np.percentile(energy_db, [90, 10])
+            snr_db = float(loud - quiet)
+        return {
+            "rms": float(np.sqrt(self.sum_squares / self.samples)),
+            "peak": self.peak,
+            "clipping_ratio": self.clipped / self.samples,
+            "energy_var_db": energy_var_db,
+            "snr_db": snr_db,
+        }
+
+
+def _frame_len(sr: int) -> int:
+    return max(1, int(sr * QUALITY_FRAME_SEC))
+
+
+def analyze_waveform(waveform: np.ndarray, sr: int = SAMPLE_RATE) -> Dict[str, float]:
+    """
+    Quality statistics of a whole recording, computed chunk by chunk.
+
+    Args:
+        waveform: 1-D audio.
+        sr: Sample rate.
+
+    Returns:
+        dict: rms, peak, clipping_ratio, energy_var_db, snr_db.
+    """
+    waveform = np.asarray(waveform).reshape(-1)
+    frame_len = _frame_len(sr)
+    # Whole frames per block, so frame boundaries match a single pass
+    block = max(frame_len, int(sr * HEAR_CHUNK_DURATION_SEC) // frame_len * frame_len)
+    acc = _Accumulator(frame_len, QUALITY_CLIP_LEVEL)
+    for start in range(0, len(waveform), block):
+        acc.update(waveform[start:start + block])
+    return acc.result()
+
+
+@dataclass
+class ChunkQuality:
+    """
+    Per-chunk quality statistics and verdicts, aligned with `Segments`.
+
+    Attributes:
+        rms, peak, clipping_ratio, energy_var_db, snr_db: Shape (n,) each.
+        usable: Chunks that pass every gate.
+    """
+    rms: np.ndarray
+    peak: np.ndarray
+    clipping_ratio: np.ndarray
+    energy_var_db: np.ndarray
+    snr_db: np.ndarray
+    usable: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.usable)
+
+    @classmethod
+    def from_stats(cls, stats: List[Dict[str, float]], valid: np.ndarray) -> "ChunkQuality":
+        """Build from per-chunk `analyze_chunk` results and each chunk's valid-sample count."""
+        columns = {key: np.array([s[key] for s in stats], dtype=np.float64) for key in _STAT_KEYS}
+        usable = (
+            (columns["rms"] >= NOISE_RMS_LOWER_THRESHOLD)
+            & (columns["rms"] <= NOISE_RMS_UPPER_THRESHOLD)
+            & (columns["clipping_ratio"] <= QUALITY_MAX_CLIPPING_RATIO)
+            & (columns["snr_db"] >= QUALITY_MIN_SNR_DB)
+            & (np.asarray(valid) > 0)
+        )
+        return cls(usable=usable, **columns)
+
+    @property
+    def too_silent(self) -> np.ndarray:
+        return self.rms < NOISE_RMS_LOWER_THRESHOLD
+
+    @property
+    def distorted(self) -> np.ndarray:
+        return (self.rms > NOISE_RMS_UPPER_THRESHOLD) | (self.clipping_ratio > QUALITY_MAX_CLIPPING_RATIO)
+
+    def rejection_message(self) -> str:
+        """Why the recording is unusable when no chunk passes (same wording as the global gate)."""
+        if np.count_nonzero(self.too_silent) > np.count_nonzero(self.distorted):
+            return TOO_SILENT_MESSAGE
+        return TOO_NOISY_MESSAGE
+
+
+def analyze_chunk(chunk: np.ndarray, sr: int = SAMPLE_RATE) -> Dict[str, float]:
+    """
+    Quality statistics of one chunk (pass only its valid, non-padding samples).
+
+    Returns:
+        dict: rms, peak, clipping_ratio, energy_var_db, snr_db.
+    """
+    acc = _Accumulator(_frame_len(sr), QUALITY_CLIP_LEVEL)
+    acc.update(np.asarray(chunk).reshape(-1))
+    return acc.result()
+
+
+def analyze_segments(segments: Segments, sr: int = SAMPLE_RATE) -> ChunkQuality:
+    """
+    Analyze each chunk of a segmented recording over its valid samples only.
+
+    Args:
+        segments: Output of `frame_windows`.
+        sr: Sample rate.
+
+    Returns:
+        ChunkQuality: Statistics and gate verdicts for every chunk.
+    """
+    stats = []
+    for i, valid in enumerate(segments.valid):
+        chunk = segments.full[i] if i < len(segments.full) else segments.tail
+        stats.append(analyze_chunk(chunk[:valid], sr))
+    return ChunkQuality.from_stats(stats, segments.valid)
+
+
+def gate_params() -> Dict[str, float]:
+    """Thresholds behind `ChunkQuality.usable`; results of the gate depend on all of them."""
+    return {
+        "frame_sec": QUALITY_FRAME_SEC,
+        "clip_level": QUALITY_CLIP_LEVEL,
+        "min_rms": NOISE_RMS_LOWER_THRESHOLD,
+        "max_rms": NOISE_RMS_UPPER_THRESHOLD,
+        "max_clipping_ratio": QUALITY_MAX_CLIPPING_RATIO,
+        "min_snr_db": QUALITY_MIN_SNR_DB,
+    }
@@ -0,0 +1,163 @@
+"""
+Polyphase resampling to the pipeline rate with cached filter designs.
+
+ICBHI recordings arrive at 44.1 kHz and 4 kHz and phone uploads at
+whatever the device records. Resampling by up/down (the reduced rate ratio)
+with a polyphase FIR only evaluates the filter taps that hit real input
+samples, and the filter bank for a (source, target) pair is designed once
+per process and reused:
+
+    resampler = get_resampler(44100, 16000)
+    out = resampler(waveform)                  # new float32 array
+    resampler(waveform, out=buffer)            # into a preallocated buffer
+
+Each phase is evaluated over a strided view of the input in blocks of at
+most RESAMPLE_BLOCK_FRAMES outputs, so temporaries stay bounded regardless
+of the recording length.
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.config import SAMPLE_RATE, RESAMPLE_ZERO_CROSSINGS, RESAMPLE_KAISER_BETA, RESAMPLE_BLOCK_FRAMES
+
+
+@lru_cache(maxsize=32)
+def _design_filter_bank(up: int, down: int, zero_crossings: int, beta: float) -> np.ndarray:
+    """
+    Kaiser-windowed sinc low-pass split into `up` polyphase branches.
+
+    Returns:
+        np.ndarray: Read-only (up, taps_per_phase) float32 array where row p
+        holds the taps applied to input samples for output phase p.
+    """
+    max_rate = max(up, down)
+    half_len = zero_crossings * max_rate
+    n = np.arange(-half_len, half_len + 1, dtype=np.float64)
+    # Cut off at the lower of the two Nyquist rates; gain `up` restores the
+    # amplitude lost to zero-stuffing
+    taps = np.sinc(n / max_rate) * np.kaiser(len(n), beta) * (up / max_rate)
+
+    taps_per_phase = math.ceil(len(taps) / up)
+    padded = np.zeros(taps_per_phase * up, dtype=np.float64)
+    padded[:len(taps)] = taps
+    bank = padded.reshape(taps_per_phase, up).T.astype(np.float32)
+    bank.setflags(write=False)
+    return bank
+
+
+class PolyphaseResampler:
+    """
+    Resample 1-D audio from `orig_sr` to `target_sr` by a rational factor.
+
+    Instances are cheap; the filter bank is shared through `_design_filter_bank`.
+    """
+
+    def __init__(
+        self,
+        orig_sr: int,
+        target_sr: int = SAMPLE_RATE,
+        zero_crossings: int = RESAMPLE_ZERO_CROSSINGS,
+        beta: float = RESAMPLE_KAISER_BETA,
+        block_frames: int = RESAMPLE_BLOCK_FRAMES
+    ):
+        """
+        Args:
+            orig_sr: Input sample rate.
+            target_sr: Output sample rate.
+            zero_crossings: Sinc zero crossings per side (filter length / quality).
+            beta: Kaiser window shape.
+            block_frames: Max outputs per phase computed in one block.
+        """
+        if orig_sr <= 0 or target_sr <= 0:
+            raise ValueError(f"Sample rates must be positive, got {orig_sr} -> {target_sr}")
+
+        g = math.gcd(int(orig_sr), int(target_sr))
+        self.orig_sr = int(orig_sr)
+        self.target_sr = int(target_sr)
+        self.up = self.target_sr // g
+        self.down = self.orig_sr // g
+        self.block_frames = max(1, block_frames)
+        self.bank = _design_filter_bank(self.up, self.down, zero_crossings, beta)
+        self.taps_per_phase = self.bank.shape[1]
+        # Filter centre, in upsampled samples (keeps output aligned with input)
+        self._delay = zero_crossings * max(self.up, self.down)
+
+    def output_length(self, n_samples: int) -> int:
+        """Number of output samples for `n_samples` input samples."""
+        return -(-n_samples * self.up // self.down)
+
+    def __call__(self, audio: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Resample `audio`.
+
+        Args:
+            audio: 1-D waveform at `orig_sr`.
+            out: Optional float32 buffer of at least `output_length(len(audio))`
+                samples to write into.
+
+        Returns:
+            np.ndarray: float32 waveform at `target_sr` (a view of `out` if given).
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        n_out = self.output_length(len(audio))
+        if out is None:
+            out = np.empty(n_out, dtype=np.float32)
+        elif out.dtype != np.float32 or out.ndim != 1 or len(out) < n_out:
+            raise ValueError(f"out must be a 1-D float32 buffer of at least {n_out} samples")
+        out = out[:n_out]
+
+        if self.up == self.down:
+            out[:] = audio
+            return out
+
+        # Zero-pad so every tap lands inside the buffer
+        taps = self.taps_per_phase
+        padded = np.zeros(len(audio) + 2 * taps, dtype=np.float32)
+        padded[taps:taps + len(audio)] = audio
+        windows = sliding_window_view(padded, taps)
+
+        # Outputs n0, n0 + up, n0 + 2*up, ... share one phase, and their input
+        # windows start `down` samples apart: each phase is a strided view of
+        # `windows` times one (reversed) tap vector
+        for n0 in range(min(self.up, n_out)):
+            position = n0 * self.down + self._delay
+            taps_reversed = self.bank[position % self.up, ::-1]
+            first = position // self.up + 1
+            count = len(range(n0, n_out, self.up))
+            for k in range(0, count, self.block_frames):
+                rows = min(self.block_frames, count - k)
+                start = first + k * self.down
+                block = windows[start:start + (rows - 1) * self.down + 1:self.down]
+                out[n0 + k * self.up:n0 + (k + rows) * self.up:self.up] = block @ taps_reversed
+        return out
+
+
+@lru_cache(maxsize=32)
+def _shared_resampler(orig_sr: int, target_sr: int) -> PolyphaseResampler:
+    return PolyphaseResampler(orig_sr, target_sr)
+
+
+def get_resampler(orig_sr: int, target_sr: int = SAMPLE_RATE) -> PolyphaseResampler:
+    """Shared resampler for a rate pair (default filter settings)."""
+    return _shared_resampler(int(orig_sr), int(target_sr))
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int = SAMPLE_RATE, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Resample 1-D audio with the cached engine for (orig_sr, target_sr).
+
+    Args:
+        audio: 1-D waveform.
+        orig_sr: Input sample rate.
+        target_sr: Output sample rate.
+        out: Optional preallocated float32 output buffer.
+
+    Returns:
+        np.ndarray: float32 waveform at `target_sr`.
+    """
+    return get_resampler(orig_sr, target_sr)(audio, out=out)
@@ -0,0 +1,159 @@
+"""
+Sliding-window segmentation and embedding pooling.
+
+Windows are strided views over the waveform, so full windows are never
+copied; only the partial tail window is written into one freshly allocated
+zero buffer. Windows may overlap (hop < window).
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+POOLING_MODES = ("mean", "max", "energy")
+
+
+@dataclass
+class Segments:
+    """
+    Windows of one recording.
+
+    Attributes:
+        full: (n_full, window) read-only strided view of the complete windows.
+        tail: Zero-padded final partial window, or None.
+        valid: Real (non-padding) samples in each window, shape (n,).
+    """
+    full: np.ndarray
+    tail: Optional[np.ndarray]
+    valid: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def as_array(self, dtype=np.float32) -> np.ndarray:
+        """
+        Materialize the windows as one (n, window) array.
+
+        Without a tail and with a matching dtype the strided view itself is
+        returned; otherwise the windows are written into a single allocation.
+        """
+        if self.tail is None and self.full.dtype == dtype:
+            return self.full
+        window = self.full.shape[1]
+        out = np.empty((len(self), window), dtype=dtype)
+        out[:len(self.full)] = self.full
+        if self.tail is not None:
+            out[-1] = self.tail
+        return out
+
+    def select(self, keep: np.ndarray) -> "Segments":
+        """
+        Keep only the windows where `keep` is True.
+
+        Returns self when every window is kept, so the strided view is not copied.
+        """
+        keep = np.asarray(keep, dtype=bool)
+        if keep.all():
+            return self
+        n_full = len(self.full)
+        tail = self.tail if self.tail is not None and keep[n_full:].all() else None
+        return Segments(full=self.full[keep[:n_full]], tail=tail, valid=self.valid[keep])
+
+    def energies(self) -> np.ndarray:
+        """Sum of squared samples in each window, shape (n,)."""
+        energy = np.einsum("ij,ij->i", self.full, self.full, dtype=np.float64)
+        if self.tail is not None:
+            energy = np.append(energy, np.dot(self.tail, self.tail))
+        return energy
+
+
+def frame_windows(
+    waveform: np.ndarray,
+    window: int,
+    hop: Optional[int] = None,
+    valid_samples: Optional[int] = None,
+    pad_tail: bool = True
+) -> Segments:
+    """
+    Split a waveform into (possibly overlapping) fixed-length windows.
+
+    Args:
+        waveform: 1-D audio.
+        window: Samples per window.
+        hop: Samples between window starts (defaults to `window`).
+        valid_samples: Only the first `valid_samples` samples are segmented;
+                       anything after them is treated as padding.
+        pad_tail: Emit a zero-padded window for samples not covered by any
+                  full window. A recording shorter than one window always
+                  yields one (padded) window.
+
+    Returns:
+        Segments: Windows and per-window valid-sample counts.
+    """
+    hop = hop or window
+    if window < 1 or hop < 1:
+        raise ValueError("window and hop must be positive")
+
+    waveform = np.asarray(waveform)
+    length = len(waveform) if valid_samples is None else min(int(valid_samples), len(waveform))
+    audio = waveform[:length]
+
+    if length >= window:
+        full = np.lib.stride_tricks.sliding_window_view(audio, window)[::hop]
+    else:
+        full = np.empty((0, window), dtype=audio.dtype)
+    n_full = len(full)
+
+    tail = None
+    covered = (n_full - 1) * hop + window if n_full else 0
+    if (pad_tail and covered < length) or n_full == 0:
+        start = n_full * hop
+        tail = np.zeros(window, dtype=audio.dtype)
+        tail[:length - start] = audio[start:]
+
+    valid = np.full(n_full + (tail is not None), window, dtype=np.int64)
+    if tail is not None:
+        valid[-1] = length - n_full * hop
+    return Segments(full=full, tail=tail, valid=valid)
+
+
+def pool_embeddings(
+    embeddings: np.ndarray,
+    valid: np.ndarray,
+    mode: str = "mean",
+    energies: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Pool per-window embeddings into one (1, dim) vector.
+
+    Args:
+        embeddings: (n, dim) per-window embeddings.
+        valid: Real samples per window.
+        mode: "mean" (weighted by valid samples), "max" (element-wise, over
+              windows holding real audio) or "energy" (weighted by each
+              window's signal energy).
+        energies: Per-window energies, required for "energy".
+
+    Returns:
+        np.ndarray: Pooled float32 embedding of shape (1, dim).
+    """
+    valid = np.asarray(valid, dtype=np.float64)
+    if not valid.any():
+        # e.g. a silent warm-up pass: fall back to a plain mean
+        valid = np.ones_like(valid)
+
+    if mode == "mean":
+        pooled = np.average(embeddings, axis=0, weights=valid)
+    elif mode == "max":
+        pooled = np.max(embeddings[valid > 0], axis=0)
+    elif mode == "energy":
+        if energies is None:
+            raise ValueError("Energy pooling requires per-window energies")
+        weights = np.asarray(energies, dtype=np.float64)
+        if not weights.any():
+            weights = valid
+        pooled = np.average(embeddings, axis=0, weights=weights)
+    else:
+        raise ValueError(f"Unknown pooling mode '{mode}'. Available: {POOLING_MODES}")
+    return np.asarray(pooled, dtype=np.float32)[None, :]
@@ -0,0 +1,233 @@
+"""
+Append-only float32 rows in memory-mapped shards, with a JSONL index.
+
+Shared storage engine of the HeAR embedding cache (one row per key) and the
+per-chunk EmbeddingStore (a run of rows per recording). Rows are addressed
+globally: row r lives at offset r % shard_rows of shard r // shard_rows. The
+owner decides what an index record holds; the engine only needs to know
+where each record's rows end.
+
+Layout:
+    <root>/index.jsonl          one JSON record per line, appended after its rows
+    <root>/index.lock           held by the process that is appending
+    <root>/shard_00000.npy      (shard_rows, dim) float32
+
+Several processes may share a root (forked serving workers, jobs on one
+Modal volume): writers serialize on the lock file and read the records
+other processes appended before allocating rows, and `refresh` lets readers
+pick those records up.
+"""
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory file locks, so a root is single-process only
+    fcntl = None
+
+Record = Dict[str, Any]
+
+
+class ShardedRowStore:
+    """
+    Append-only row storage backed by fixed-size memory-mapped .npy shards.
+
+    Rows are written before their index record, so an interrupted write never
+    leaves the index pointing at garbage. Thread-safe, and process-safe where
+    fcntl is available.
+    """
+
+    INDEX_FILE = "index.jsonl"
+    LOCK_FILE = "index.lock"
+
+    def __init__(self, root: str, dim: int, shard_rows: int, on_record: Callable[[Record], int]):
+        """
+        Open (or create) a store and read its index.
+
+        Args:
+            root: Store directory.
+            dim: Row width.
+            shard_rows: Rows per memory-mapped shard.
+            on_record: Called with every index record, whether read from disk
+                       or just appended; returns the row after the record's
+                       last row. Raising ValueError, KeyError or TypeError
+                       skips the record (e.g. a line torn by a crash).
+        """
+        if shard_rows < 1:
+            raise ValueError("shard_rows must be at least 1")
+
+        self.root = root
+        self.dim = dim
+        self.shard_rows = shard_rows
+        self._on_record = on_record
+        self._shards: Dict[int, np.memmap] = {}
+        self._next_row = 0
+        # Bytes of index.jsonl already read
+        self._index_offset = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(root, exist_ok=True)
+        self.refresh()
+
+    def __len__(self) -> int:
+        """Total number of rows."""
+        return self._next_row
+
+    # ── Index ───────────────────────────────────────────────────────────
+
+    def _index_path(self) -> str:
+        return os.path.join(self.root, self.INDEX_FILE)
+
+    def refresh(self) -> int:
+        """
+        Read the index records appended (by any process) since the last call.
+
+        Returns:
+            int: Number of records read.
+        """
+        index_path = self._index_path()
+        with self._lock:
+            if not os.path.exists(index_path) or os.path.getsize(index_path) == self._index_offset:
+                return 0
+            with open(index_path, "rb") as f:
+                f.seek(self._index_offset)
+                data = f.read()
+            # A line without its newline is still being written (or was torn by a crash)
+            complete = data[:data.rfind(b"\n") + 1]
+            self._index_offset += len(complete)
+            count = 0
+            for line in complete.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    stop = self._on_record(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    # Torn line from an interrupted write
+                    continue
+                self._next_row = max(self._next_row, stop)
+                count += 1
+            return count
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        Hold the write lock (across threads and processes) with the index up to date.
+
+        Owners check for an existing record and `append` inside this block.
+        """
+        with self._lock:
+            if fcntl is None:
+                self.refresh()
+                yield
+                return
+            # Opened per acquisition: flock is per open file, and a descriptor
+            # inherited over fork would share the parent's lock
+            with open(os.path.join(self.root, self.LOCK_FILE), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self.refresh()
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def append(self, rows: np.ndarray, make_record: Callable[[int], Record]) -> Record:
+        """
+        Write `rows` after the last row and index them. Call inside `writing()`.
+
+        Args:
+            rows: (count, dim) array.
+            make_record: Builds the index record from the first row's number.
+
+        Returns:
+            dict: The record, after it has been passed to `on_record`.
+        """
+        rows = np.asarray(rows, dtype=np.float32).reshape(-1, self.dim)
+        start = self._next_row
+        row = start
+        while row < start + len(rows):
+            shard, offset = divmod(row, self.shard_rows)
+            take = min(start + len(rows) - row, self.shard_rows - offset)
+            mapped = self._open_shard(shard, writable=True)
+            mapped[offset:offset + take] = rows[row - start:row - start + take]
+            mapped.flush()
+            row += take
+
+        record = make_record(start)
+        line = json.dumps(record) + "\n"
+        with open(self._index_path(), "ab+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > self._index_offset:
+                # Torn line left by a crashed writer: terminate it
+                line = "\n" + line
+            f.write(line.encode())
+            self._index_offset = f.tell()
+
+        self._next_row = max(self._next_row, self._on_record(record), start + len(rows))
+        return record
+
+    # ── Reads ───────────────────────────────────────────────────────────
+
+    def read_range(self, start: int, stop: int) -> np.ndarray:
+        """
+        Read consecutive rows [start, stop) into a new (stop - start, dim) array.
+
+        Only the touched pages of the touched shards are read from disk.
+        """
+        if not 0 <= start <= stop <= self._next_row:
+            raise IndexError(f"Row range [{start}, {stop}) outside store of {self._next_row} rows")
+        out = np.empty((stop - start, self.dim), dtype=np.float32)
+        row = start
+        while row < stop:
+            shard, offset = divmod(row, self.shard_rows)
+            take = min(stop - row, self.shard_rows - offset)
+            out[row - start:row - start + take] = self._open_shard(shard)[offset:offset + take]
+            row += take
+        return out
+
+    def read_rows(self, rows: Sequence[int]) -> np.ndarray:
+        """
+        Read arbitrary rows (e.g. a shuffled training batch), in the given order.
+
+        Args:
+            rows: Global row numbers.
+
+        Returns:
+            np.ndarray: (len(rows), dim) float32 array.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size and (rows.min() < 0 or rows.max() >= self._next_row):
+            raise IndexError(f"Row outside store of {self._next_row} rows")
+        out = np.empty((len(rows), self.dim), dtype=np.float32)
+        shards, offsets = np.divmod(rows, self.shard_rows)
+        for shard in np.unique(shards):
+            mask = shards == shard
+            out[mask] = self._open_shard(int(shard))[offsets[mask]]
+        return out
+
+    # ── Shards ──────────────────────────────────────────────────────────
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.root, f"shard_{shard:05d}.npy")
+
+    def _open_shard(self, shard: int, writable: bool = False) -> np.memmap:
+        mapped = self._shards.get(shard)
+        if mapped is not None and (not writable or mapped.mode != "r"):
+            return mapped
+        path = self._shard_path(shard)
+        if os.path.exists(path):
+            # Read-only unless writing, so a store on a read-only volume still serves reads
+            mapped = np.load(path, mmap_mode="r+" if writable else "r")
+        else:
+            mapped = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float32, shape=(self.shard_rows, self.dim)
+            )
+        self._shards[shard] = mapped
+        return mapped
@@ -5,7 +5,7 @@ import os
 import sys
 
 from src.agent.core import AuraMedAgent
-from src.datatypes import PatientVitals, TriageResult, TriageStatus, LowQualityError, DangerSignException
+from src.datatypes import PatientVitals, TriageResult, TriageStatus, TriagePath, LowQualityError, DangerSignException
 
 # L3: Real torch import check (might be mocked)
 import torch
@@ -323,3 +323,107 @@ class TestAuraMedAgentLatencyLogging:
         # Check if the warning message contains "exceeded threshold"
         args, _ = mock_logger.warning.call_args
         assert "exceeded threshold" in args[0]
+
+
+@pytest.mark.skipif(torch is None, reason="torch not installed")
+class TestAuraMedAgentPredictBatch:
+    """Tests for AuraMedAgent.predict_batch() orchestration."""
+    
+    @pytest.fixture
+    def mock_encoder(self):
+        encoder = Mock()
+        encoder.encode_batch.side_effect = lambda paths: [torch.randn(1, 512) for _ in paths]
+        return encoder
+    
+    @pytest.fixture
+    def mock_reasoning(self):
+        reasoning = Mock()
+        reasoning.generate_batch.side_effect = lambda embeddings, vitals_list: [
+            TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing detected.") for _ in vitals_list
+        ]
+        return reasoning
+    
+    @patch('src.agent.core.os.path.exists', return_value=True)
+    def test_predict_batch_single_encoder_and_reasoning_call(self, mock_exists, mock_encoder, mock_reasoning):
+        """All recordings should go through one encode_batch and one generate_batch call."""
+        vitals = PatientVitals(age_months=18, respiratory_rate=45)
+        agent = AuraMedAgent(hear_encoder=mock_encoder, medgemma_reasoning=mock_reasoning)
+        
+        results = agent.predict_batch([("a.wav", vitals), ("b.wav", vitals), ("c.wav", vitals)])
+        
+        assert len(results) == 3
+        mock_encoder.encode_batch.assert_called_once_with(["a.wav", "b.wav", "c.wav"])
+        mock_reasoning.generate_batch.assert_called_once()
+        mock_encoder.encode.assert_not_called()
+        for result in results:
+            assert result.status == TriageStatus.YELLOW
+            assert result.action_recommendation == "Administer oral Amoxicillin. Follow up in 48 hours."
+            assert "latency_sec" in result.usage_stats
+    
+    @patch('src.agent.core.os.path.exists', return_value=True)
+    def test_predict_batch_per_request_overrides(self, mock_exists, mock_reasoning):
+        """Danger signs and low quality audio should be handled per request, preserving order."""
+        encoder = Mock()
+        encoder.encode_batch.return_value = [LowQualityError("Audio too short"), torch.randn(1, 512)]
+        agent = AuraMedAgent(hear_encoder=encoder, medgemma_reasoning=mock_reasoning)
+        
+        danger = PatientVitals(age_months=12, respiratory_rate=40, danger_signs=True)
+        normal = PatientVitals(age_months=420, respiratory_rate=25)
+        results = agent.predict_batch([
+            ("danger.wav", danger),
+            ("short.wav", normal),
+            ("ok.wav", normal),
+        ])
+        
+        assert [r.status for r in results] == [TriageStatus.RED, TriageStatus.INCONCLUSIVE, TriageStatus.YELLOW]
+        assert results[0].triage_path == TriagePath.SAFETY_OVERRIDE
+        assert results[1].triage_path == TriagePath.QUALITY_GATE
+        assert "Danger Sign" in results[0].reasoning
+        assert "Audio too short" in results[1].reasoning
+        assert "clinical evaluation" in results[2].action_recommendation.lower()
+        encoder.encode_batch.assert_called_once_with(["short.wav", "ok.wav"])
+        args, _ = mock_reasoning.generate_batch.call_args
+        assert len(args[0]) == 1
+    
+    @patch('src.agent.core.os.path.exists', return_value=False)
+    def test_predict_batch_accepts_in_memory_audio(self, mock_exists, mock_encoder, mock_reasoning):
+        """Bytes, file-like objects and decoded arrays are passed through without touching disk."""
+        import io
+        import numpy as np
+        vitals = PatientVitals(age_months=18, respiratory_rate=45)
+        stream = io.BytesIO(b"RIFF")
+        decoded = (np.zeros(16000, dtype=np.float32), 16000)
+        agent = AuraMedAgent(hear_encoder=mock_encoder, medgemma_reasoning=mock_reasoning)
+        
+        results = agent.predict_batch([(b"RIFF", vitals), (stream, vitals), (decoded, vitals)])
+        
+        assert [r.status for r in results] == [TriageStatus.YELLOW] * 3
+        mock_exists.assert_not_called()
+        sources = mock_encoder.encode_batch.call_args[0][0]
+        assert sources[0] == b"RIFF" and sources[1] is stream and sources[2] is decoded
+    
+    def test_predict_batch_rejects_unsupported_audio(self, mock_encoder, mock_reasoning):
+        agent = AuraMedAgent(hear_encoder=mock_encoder, medgemma_reasoning=mock_reasoning)
+        vitals = PatientVitals(age_months=18, respiratory_rate=30)
+        with pytest.raises(ValueError, match="Unsupported audio input"):
+            agent.predict_batch([(12345, vitals)])
+        with pytest.raises(ValueError, match="audio_path must be provided"):
+            agent.predict_batch([(b"", vitals)])
+    
+    @patch('src.agent.core.os.path.exists', return_value=False)
+    def test_predict_batch_raises_file_not_found(self, mock_exists, mock_encoder, mock_reasoning):
+        """A missing file should fail the batch just as it fails predict()."""
+        agent = AuraMedAgent(hear_encoder=mock_encoder, medgemma_reasoning=mock_reasoning)
+        vitals = PatientVitals(age_months=18, respiratory_rate=30)
+        with pytest.raises(FileNotFoundError, match="Audio file not found"):
+            agent.predict_batch([("missing.wav", vitals)])
+    
+    @patch('src.agent.core.os.path.exists', return_value=True)
+    def test_predict_batch_wraps_generic_errors(self, mock_exists, mock_encoder):
+        """Generic component errors should be wrapped with agent context."""
+        reasoning = Mock()
+        reasoning.generate_batch.side_effect = RuntimeError("OOM")
+        agent = AuraMedAgent(hear_encoder=mock_encoder, medgemma_reasoning=reasoning)
+        vitals = PatientVitals(age_months=18, respiratory_rate=30)
+        with pytest.raises(RuntimeError, match="Batch pipeline execution failed"):
+            agent.predict_batch([("a.wav", vitals)])
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+import torch
+
+from src.agent.core import AuraMedAgent
+from src.agent.async_agent import AsyncAuraMedAgent
+from src.agent.deadline import Deadline
+from src.datatypes import PatientVitals, TriageResult, TriageStatus, LowQualityError
+
+
+@pytest.fixture
+def vitals():
+    return PatientVitals(age_months=18, respiratory_rate=45, danger_signs=False)
+
+
+def _make_agent(encode=None):
+    encoder = Mock()
+    encoder.encode.side_effect = encode or (lambda path: torch.randn(1, 512))
+    reasoning = Mock()
+    reasoning.build_prompt.return_value = "prompt"
+    reasoning.generate_from_prompt.side_effect = lambda prompt, v: TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing.")
+    return AuraMedAgent(hear_encoder=encoder, medgemma_reasoning=reasoning)
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_apredict_returns_enriched_result(mock_exists, vitals):
+    """apredict should match predict(): protocol action and latency are attached."""
+    agent = _make_agent()
+
+    async def run():
+        async with AsyncAuraMedAgent(agent=agent) as async_agent:
+            return await async_agent.apredict("a.wav", vitals)
+
+    result = asyncio.run(run())
+    assert result.status == TriageStatus.YELLOW
+    assert result.action_recommendation == "Administer oral Amoxicillin. Follow up in 48 hours."
+    assert "latency_sec" in result.usage_stats
+    agent.medgemma_reasoning.generate_from_prompt.assert_called_once_with("prompt", vitals)
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_apredict_bounds_concurrency(mock_exists, vitals):
+    """No more than max_concurrency triages should be encoding at once."""
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def slow_encode(path):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return torch.randn(1, 512)
+
+    agent = _make_agent(encode=slow_encode)
+
+    async def run():
+        async with AsyncAuraMedAgent(agent=agent, max_concurrency=2) as async_agent:
+            return await async_agent.apredict_many([(f"{i}.wav", vitals) for i in range(6)])
+
+    results = asyncio.run(run())
+    assert len(results) == 6
+    assert state["peak"] <= 2
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_generation_runs_on_single_dedicated_thread(mock_exists, vitals):
+    """Every generate call should run on the single generation thread."""
+    threads = set()
+    agent = _make_agent()
+
+    def record_thread(prompt, v):
+        threads.add(threading.current_thread().name)
+        return TriageResult(TriageStatus.GREEN, 0.9, "OK")
+
+    agent.medgemma_reasoning.generate_from_prompt.side_effect = record_thread
+
+    async def run():
+        async with AsyncAuraMedAgent(agent=agent, max_concurrency=4) as async_agent:
+            await async_agent.apredict_many([(f"{i}.wav", vitals) for i in range(5)])
+
+    asyncio.run(run())
+    assert len(threads) == 1
+    assert threads.pop().startswith("auramed-generate")
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_apredict_safety_and_quality_paths(mock_exists):
+    """Danger signs short-circuit; low quality audio returns INCONCLUSIVE without generation."""
+    agent = _make_agent(encode=Mock(side_effect=LowQualityError("Audio too short")))
+
+    async def run():
+        async with AsyncAuraMedAgent(agent=agent) as async_agent:
+            red = await async_agent.apredict("a.wav", PatientVitals(age_months=12, respiratory_rate=40, danger_signs=True))
+            inconclusive = await async_agent.apredict("b.wav", PatientVitals(age_months=12, respiratory_rate=40))
+            return red, inconclusive
+
+    red, inconclusive = asyncio.run(run())
+    assert red.status == TriageStatus.RED
+    assert inconclusive.status == TriageStatus.INCONCLUSIVE
+    agent.medgemma_reasoning.generate_from_prompt.assert_not_called()
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_apredict_runs_each_request_under_its_own_deadline(mock_exists, vitals):
+    seen = []
+    agent = _make_agent()
+
+    def generate(prompt, v):
+        seen.append(Deadline.current())
+        return TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing.")
+
+    agent.medgemma_reasoning.generate_from_prompt.side_effect = generate
+
+    async def run():
+        async with AsyncAuraMedAgent(agent=agent) as async_agent:
+            return await async_agent.apredict_many([("a.wav", vitals), ("b.wav", vitals)])
+
+    results = asyncio.run(run())
+    assert all(deadline is not None for deadline in seen)
+    assert seen[0] is not seen[1]
+    assert all("stage_classifier_sec" in result.usage_stats for result in results)
+    assert all(result.usage_stats["deadline_exceeded"] == 0.0 for result in results)
+
+
+def test_apredict_after_close_raises(vitals):
+    async def run():
+        async_agent = AsyncAuraMedAgent(agent=_make_agent())
+        await async_agent.aclose()
+        await async_agent.apredict("a.wav", vitals)
+
+    with pytest.raises(RuntimeError, match="closed"):
+        asyncio.run(run())
@@ -1,6 +1,9 @@
 import unittest
 import sys
 import os
+import struct
+import tempfile
+import wave
 import numpy as np
 from unittest.mock import MagicMock
 
@@ -10,7 +13,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'mock
 
 import librosa
 
-from src.utils.audio import load_audio, normalize_duration
+import io
+
+from src.utils.audio import load_audio, normalize_duration, read_wav_header, resolve_audio_source, BufferPool, WAVE_FORMAT_IEEE_FLOAT
 
 class TestAudioUtils(unittest.TestCase):
     def setUp(self):
@@ -55,9 +60,238 @@ class TestAudioUtils(unittest.TestCase):
         self.assertEqual(len(normalized), sr * target_length)
         self.assertTrue(np.all(normalized[sr*5:] == 0))
 
+    def test_normalize_duration_preserves_dtype(self):
+        sr = 16000
+        for dtype in (np.float32, np.float64, np.int16):
+            audio = np.ones(sr, dtype=dtype)
+            self.assertEqual(normalize_duration(audio, target_length=2.0, sr=sr).dtype, dtype)
+            self.assertEqual(normalize_duration(audio, target_length=0.5, sr=sr).dtype, dtype)
+
+    def test_normalize_duration_truncation_is_view(self):
+        audio = np.arange(16000, dtype=np.float32)
+        normalized = normalize_duration(audio, target_length=0.5, sr=16000)
+        self.assertTrue(np.shares_memory(normalized, audio))
+
+    def test_normalize_duration_pads_into_out_buffer(self):
+        audio = np.ones(8000, dtype=np.float32)
+        out = np.full(20000, 7.0, dtype=np.float32)
+
+        normalized = normalize_duration(audio, target_length=1.0, sr=16000, out=out)
+
+        self.assertTrue(np.shares_memory(normalized, out))
+        self.assertEqual(len(normalized), 16000)
+        self.assertTrue(np.all(normalized[:8000] == 1) and np.all(normalized[8000:] == 0))
+        with self.assertRaises(ValueError):
+            normalize_duration(audio, target_length=1.0, sr=16000, out=np.zeros(16000))
+
+    def test_buffer_pool_reuses_released_buffers(self):
+        pool = BufferPool(max_idle=1)
+        audio = np.ones(8000, dtype=np.float32)
+
+        first = normalize_duration(audio, target_length=1.0, sr=16000, pool=pool)
+        self.assertTrue(pool.release(first))
+        second = normalize_duration(audio, target_length=1.0, sr=16000, pool=pool)
+
+        self.assertTrue(np.shares_memory(first, second))
+        self.assertEqual(pool.allocations, 1)
+        # Releasing twice, or an array the pool never leased, is a no-op
+        self.assertTrue(pool.release(second))
+        self.assertFalse(pool.release(second))
+        self.assertFalse(pool.release(audio))
+
     def test_load_audio_file_not_found(self):
         with self.assertRaises(FileNotFoundError):
             load_audio("non_existent.wav")
 
+class TestNativeWavLoading(unittest.TestCase):
+    def setUp(self):
+        librosa.load.reset_mock()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write_pcm16(self, name, samples, sr=16000, channels=1):
+        path = os.path.join(self.tmpdir.name, name)
+        with wave.open(path, "wb") as w:
+            w.setnchannels(channels)
+            w.setsampwidth(2)
+            w.setframerate(sr)
+            w.writeframes(samples.astype("<i2").tobytes())
+        return path
+
+    def _write_float32(self, name, samples, sr=16000):
+        # The wave module only writes PCM, so build the IEEE-float header by hand
+        path = os.path.join(self.tmpdir.name, name)
+        data = samples.astype("<f4").tobytes()
+        fmt = struct.pack("<HHIIHH", WAVE_FORMAT_IEEE_FLOAT, 1, sr, sr * 4, 4, 32)
+        with open(path, "wb") as f:
+            f.write(b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + len(data)) + b"WAVE")
+            f.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+            f.write(b"data" + struct.pack("<I", len(data)) + data)
+        return path
+
+    def test_pcm16_mono_decoded_without_librosa(self):
+        pcm = np.random.default_rng(0).integers(-32768, 32767, 16000, dtype=np.int16)
+        path = self._write_pcm16("mono.wav", pcm)
+
+        audio, sr = load_audio(path, sr=16000)
+
+        self.assertEqual(sr, 16000)
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_allclose(audio, pcm / 32768.0, atol=1e-7)
+        librosa.load.assert_not_called()
+
+    def test_stereo_downmixed_to_mono(self):
+        left = np.full(800, 16384, dtype=np.int16)
+        right = np.zeros(800, dtype=np.int16)
+        path = self._write_pcm16("stereo.wav", np.stack([left, right], axis=1).reshape(-1), channels=2)
+
+        audio, _ = load_audio(path, sr=16000)
+
+        self.assertEqual(audio.shape, (800,))
+        np.testing.assert_allclose(audio, 0.25)
+
+    def test_float32_wav(self):
+        samples = np.linspace(-0.5, 0.5, 1600, dtype=np.float32)
+        path = self._write_float32("float.wav", samples)
+
+        audio, sr = load_audio(path, sr=None)
+
+        self.assertEqual(sr, 16000)
+        np.testing.assert_array_equal(audio, samples)
+        librosa.load.assert_not_called()
+
+    def test_other_sample_rate_resampled_without_librosa(self):
+        sr = 44100
+        tone = (np.sin(2 * np.pi * 440 * np.arange(sr) / sr) * 16384).astype(np.int16)
+        path = self._write_pcm16("44k.wav", tone, sr=sr)
+
+        audio, out_sr = load_audio(path, sr=16000)
+
+        self.assertEqual(out_sr, 16000)
+        self.assertEqual(len(audio), 16000)
+        expected = 0.5 * np.sin(2 * np.pi * 440 * np.arange(16000) / 16000)
+        np.testing.assert_allclose(audio[100:-100], expected[100:-100], atol=1e-3)
+        librosa.load.assert_not_called()
+
+    def test_undecodable_file_falls_back_to_librosa(self):
+        path = os.path.join(self.tmpdir.name, "clip.mp3")
+        with open(path, "wb") as f:
+            f.write(b"ID3" + bytes(64))
+
+        with unittest.mock.patch.dict(sys.modules, {"soundfile": None}):
+            load_audio(path, sr=16000)
+
+        librosa.load.assert_called_once_with(path, sr=16000, mono=True)
+
+    def test_partial_decode_matches_full_decode(self):
+        pcm = np.random.default_rng(1).integers(-8000, 8000, 16000 * 3, dtype=np.int16)
+        path = self._write_pcm16("long.wav", pcm)
+        full, _ = load_audio(path)
+
+        head, _ = load_audio(path, duration=1.0)
+        window, _ = load_audio(path, offset=0.5, duration=1.0)
+        tail, _ = load_audio(path, offset=2.5, duration=10.0)
+
+        np.testing.assert_array_equal(head, full[:16000])
+        np.testing.assert_array_equal(window, full[8000:24000])
+        np.testing.assert_array_equal(tail, full[40000:])
+
+    def test_partial_decode_with_resampling_matches_full_decode(self):
+        sr = 44100
+        pcm = np.random.default_rng(2).integers(-8000, 8000, sr * 3, dtype=np.int16)
+        path = self._write_pcm16("long44k.wav", pcm, sr=sr)
+        full, _ = load_audio(path, sr=16000)
+
+        for offset, duration in [(0.0, 1.0), (0.7, 1.3), (2.5, 10.0)]:
+            window, _ = load_audio(path, sr=16000, offset=offset, duration=duration)
+            start = int(round(offset * 16000))
+            expected = full[start:start + int(round(duration * 16000))]
+            self.assertEqual(len(window), len(expected))
+            np.testing.assert_allclose(window, expected, atol=1e-6)
+
+    def test_window_passed_to_librosa_fallback(self):
+        path = os.path.join(self.tmpdir.name, "clip.mp3")
+        with open(path, "wb") as f:
+            f.write(b"ID3" + bytes(64))
+
+        with unittest.mock.patch.dict(sys.modules, {"soundfile": None}):
+            load_audio(path, sr=16000, offset=1.0, duration=10)
+
+        librosa.load.assert_called_once_with(path, sr=16000, mono=True, offset=1.0, duration=10)
+
+    def test_header_skips_extra_chunks(self):
+        path = self._write_pcm16("plain.wav", np.arange(100, dtype=np.int16))
+        with open(path, "rb") as f:
+            raw = f.read()
+        # Insert an odd-sized LIST chunk (plus pad byte) before the data chunk
+        split = raw.index(b"data")
+        extra = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+        with open(path, "wb") as f:
+            f.write(raw[:split] + extra + raw[split:])
+
+        info = read_wav_header(path)
+
+        self.assertEqual((info.channels, info.sample_rate, info.frames), (1, 16000, 100))
+        audio, _ = load_audio(path)
+        np.testing.assert_allclose(audio, np.arange(100) / 32768.0, atol=1e-7)
+
+    def test_in_memory_wav_never_touches_disk(self):
+        pcm = np.random.default_rng(3).integers(-8000, 8000, 16000 * 2, dtype=np.int16)
+        path = self._write_pcm16("upload.wav", pcm)
+        with open(path, "rb") as f:
+            data = f.read()
+        expected, _ = load_audio(path)
+
+        with unittest.mock.patch("builtins.open", side_effect=AssertionError("disk access")):
+            for source in (data, bytearray(data), memoryview(data), io.BytesIO(data)):
+                audio, sr = load_audio(source, duration=1.0)
+                self.assertEqual(sr, 16000)
+                np.testing.assert_array_equal(audio, expected[:16000])
+        librosa.load.assert_not_called()
+
+    def test_non_seekable_stream_read_once(self):
+        path = self._write_pcm16("stream.wav", np.arange(1000, dtype=np.int16))
+        with open(path, "rb") as f:
+            data = f.read()
+
+        class Stream:
+            def __init__(self):
+                self.reads = 0
+
+            def read(self, n=-1):
+                self.reads += 1
+                return data
+
+        stream = Stream()
+        audio, _ = load_audio(stream)
+
+        self.assertEqual(stream.reads, 1)
+        np.testing.assert_allclose(audio, np.arange(1000) / 32768.0, atol=1e-7)
+
+    def test_decoded_waveform_input(self):
+        tone = np.sin(2 * np.pi * 440 * np.arange(44100) / 44100).astype(np.float32)
+
+        same, sr = load_audio((tone[:16000], 16000))
+        resampled, out_sr = load_audio((tone, 44100), sr=16000, duration=0.5)
+
+        np.testing.assert_array_equal(same, tone[:16000])
+        self.assertEqual((sr, out_sr, len(resampled)), (16000, 16000, 8000))
+        expected = np.sin(2 * np.pi * 440 * np.arange(8000) / 16000)
+        np.testing.assert_allclose(resampled[100:], expected[100:], atol=1e-3)
+
+    def test_unsupported_sources_rejected(self):
+        with self.assertRaises(TypeError):
+            resolve_audio_source(12345)
+        with self.assertRaises(ValueError):
+            resolve_audio_source((np.zeros((2, 100)), 16000))
+
+    def test_header_rejects_non_wav(self):
+        path = os.path.join(self.tmpdir.name, "notes.txt")
+        with open(path, "wb") as f:
+            f.write(b"not a riff file at all")
+        self.assertIsNone(read_wav_header(path))
+
 if __name__ == '__main__':
     unittest.main()
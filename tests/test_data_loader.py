@@ -85,3 +85,31 @@ class TestICBHIValidationMode:
         
         for sample in samples:
             assert sample.vitals.respiratory_rate == 35
+
+
+class TestCycleAnnotations:
+    """Tests for ICBHI cycle parsing used by the embedding store."""
+
+    def test_read_cycle_annotations(self, tmp_path):
+        from src.data.icbhi_loader import read_cycle_annotations
+        path = tmp_path / "101_1b1_Al_sc_Meditron.txt"
+        path.write_text("0.036\t0.579\t0\t0\n0.579\t2.45\t1\t0\nbad line\n2.45\t3.893\t0\t1\n3.893\t5.5\t1\t1\n")
+
+        cycles = read_cycle_annotations(str(path))
+
+        assert [c.label for c in cycles] == [0, 1, 2, 3]
+        assert (cycles[1].start, cycles[1].end) == (0.579, 2.45)
+
+    def test_cycle_windows_trim_pad_and_drop_empty(self):
+        import numpy as np
+        from src.data.icbhi_loader import RespiratoryCycle, cycle_windows
+        audio = np.arange(100, dtype=np.float32)
+        cycles = [RespiratoryCycle(0.0, 0.3, 0), RespiratoryCycle(0.5, 1.0, 1), RespiratoryCycle(2.0, 3.0, 2)]
+
+        windows, kept = cycle_windows(audio, cycles, sr=100, window=40)
+
+        assert windows.shape == (2, 40)
+        np.testing.assert_array_equal(windows[0, :30], np.arange(30))
+        assert not windows[0, 30:].any()
+        np.testing.assert_array_equal(windows[1], np.arange(50, 90))
+        assert [c.label for c in kept] == [0, 1]
@@ -0,0 +1,187 @@
+import itertools
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import torch
+
+from src.agent.core import AuraMedAgent
+from src.agent.deadline import Deadline, deadline_stage
+from src.models.medgemma import MedGemmaReasoning
+from src.config import MAX_INFERENCE_TIME_SEC
+from src.datatypes import PatientVitals, TriageResult, TriageStatus, TriagePath, DeadlineExceeded
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+BUDGETS = {"decode": 1.0, "hear": 2.0, "classifier": 0.5, "generation": 6.0}
+
+
+def test_stage_budgets_roll_slack_forward():
+    clock = FakeClock()
+    deadline = Deadline(total_sec=10.0, budgets=BUDGETS, clock=clock)
+
+    # Decode may use its own budget plus the unreserved 0.5s
+    assert deadline.budget_for("decode") == pytest.approx(1.5)
+    with deadline.stage("decode"):
+        clock.now += 0.2
+    # Unused decode time is available to HeAR
+    assert deadline.budget_for("hear") == pytest.approx(10.0 - 0.2 - 6.5)
+    with deadline.stage("hear"):
+        clock.now += 5.0
+    assert deadline.overruns == ["hear"]
+    # Generation gets whatever remains
+    assert deadline.budget_for("generation") == pytest.approx(4.8)
+
+    stats = deadline.usage_stats()
+    assert stats["stage_decode_sec"] == pytest.approx(0.2)
+    assert stats["stage_hear_sec"] == pytest.approx(5.0)
+    assert stats["deadline_exceeded"] == 0.0
+
+
+def test_batch_deadline_scales_total_and_budgets():
+    clock = FakeClock()
+    deadline = Deadline.for_batch(4, total_sec=10.0, budgets=BUDGETS, clock=clock)
+
+    assert deadline.total_sec == 40.0
+    assert deadline.budgets["generation"] == 24.0
+    assert deadline.budget_for("generation") == pytest.approx(40.0)
+    assert Deadline.for_batch(0, total_sec=10.0, budgets=BUDGETS).total_sec == 10.0
+
+
+def test_deadline_stage_is_noop_without_active_deadline():
+    with deadline_stage("decode") as budget:
+        assert budget is None
+
+    deadline = Deadline(budgets=BUDGETS)
+    with deadline.activate():
+        assert Deadline.current() is deadline
+        with deadline_stage("hear") as budget:
+            assert budget > 0
+    assert Deadline.current() is None
+    assert "hear" in deadline.timings
+
+
+class TestGenerationDeadline:
+    @pytest.fixture
+    def engine(self):
+        engine = MedGemmaReasoning()
+        engine.model = MagicMock()
+        engine.processor = MagicMock()
+        engine._construct_prompt = MagicMock(return_value="prompt")
+        return engine
+
+    @pytest.fixture
+    def vitals(self):
+        return PatientVitals(age_months=12, respiratory_rate=60)
+
+    def test_exhausted_budget_skips_generation(self, engine, vitals):
+        clock = FakeClock()
+        deadline = Deadline(total_sec=10.0, budgets=BUDGETS, clock=clock)
+        clock.now = 9.5
+        engine._run_generation = MagicMock()
+
+        with deadline.activate():
+            result = engine.generate_from_prompt("prompt", vitals)
+
+        engine._run_generation.assert_not_called()
+        assert result.status == TriageStatus.YELLOW
+        assert result.triage_path == TriagePath.DEADLINE_FALLBACK
+        assert deadline.usage_stats()["deadline_exceeded"] == 1.0
+
+    def test_generation_stopped_by_budget_falls_back(self, engine, vitals):
+        engine._run_generation = MagicMock(side_effect=DeadlineExceeded("budget exhausted"))
+        deadline = Deadline(budgets=BUDGETS)
+
+        with deadline.activate():
+            result = engine.generate_from_prompt("prompt", vitals)
+
+        _, kwargs = engine._run_generation.call_args
+        assert 0 < kwargs["max_time"] <= 10.0
+        assert result.triage_path == TriagePath.DEADLINE_FALLBACK
+        assert deadline.degraded
+
+    def test_no_deadline_means_unbounded_generation(self, engine, vitals):
+        engine._run_generation = MagicMock(return_value=["REASONING: ok\nSTATUS: GREEN\nCONFIDENCE: 0.9"])
+        result = engine.generate_from_prompt("prompt", vitals)
+        assert engine._run_generation.call_args[1]["max_time"] is None
+        assert result.triage_path == TriagePath.LLM
+
+
+class TestRunGenerationTimeout:
+    @pytest.fixture
+    def engine(self):
+        engine = MedGemmaReasoning()
+        engine.model = MagicMock()
+        engine.model.generation_config.eos_token_id = [1, 106]
+        engine.processor = MagicMock()
+        engine.processor.apply_chat_template.return_value.to.return_value = {
+            "input_ids": np.zeros((1, 3), dtype=np.int64)
+        }
+        engine.processor.decode.return_value = "REASONING: ok\nSTATUS: GREEN\nCONFIDENCE: 0.9"
+        return engine
+
+    def test_finished_generation_past_budget_is_kept(self, engine):
+        engine.model.generate.return_value = np.array([[0, 0, 0, 7, 9, 106]])
+        # Every clock read advances 5s, so generation "took" longer than max_time
+        with patch("src.models.medgemma.time.monotonic", side_effect=itertools.count(0.0, 5.0)):
+            responses = engine._run_generation([[]], max_time=1.0)
+        assert responses == ["REASONING: ok\nSTATUS: GREEN\nCONFIDENCE: 0.9"]
+
+    def test_generation_cut_by_budget_raises(self, engine):
+        engine.model.generate.return_value = np.array([[0, 0, 0, 7, 9, 11]])
+        with patch("src.models.medgemma.time.monotonic", side_effect=itertools.count(0.0, 5.0)):
+            with pytest.raises(DeadlineExceeded):
+                engine._run_generation([[]], max_time=1.0)
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_predict_batch_gives_each_request_a_budget(mock_exists):
+    encoder = Mock()
+    encoder.encode_batch.side_effect = lambda paths: [torch.randn(1, 512) for _ in paths]
+    reasoning = Mock()
+    budgets = []
+
+    def generate_batch(embeddings, vitals_list):
+        budgets.append(Deadline.current().total_sec)
+        return [TriageResult(TriageStatus.YELLOW, 0.8, "LLM.") for _ in vitals_list]
+
+    reasoning.generate_batch.side_effect = generate_batch
+    agent = AuraMedAgent(hear_encoder=encoder, medgemma_reasoning=reasoning)
+    vitals = PatientVitals(age_months=24, respiratory_rate=45)
+    results = agent.predict_batch([(f"{i}.wav", vitals) for i in range(3)])
+
+    assert budgets == [pytest.approx(3 * MAX_INFERENCE_TIME_SEC)]
+    assert all(result.usage_stats["max_allowed_sec"] == pytest.approx(3 * MAX_INFERENCE_TIME_SEC) for result in results)
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_predict_reports_stage_timings(mock_exists):
+    """predict() should run under a deadline and surface stage timings."""
+    encoder = Mock()
+
+    def encode(path):
+        with deadline_stage("decode"):
+            pass
+        return torch.randn(1, 512)
+
+    encoder.encode.side_effect = encode
+    reasoning = Mock()
+
+    def generate(embedding, vitals):
+        Deadline.current().degraded = True
+        return TriageResult(TriageStatus.GREEN, 0.85, "Rules.", triage_path=TriagePath.DEADLINE_FALLBACK)
+
+    reasoning.generate.side_effect = generate
+    agent = AuraMedAgent(hear_encoder=encoder, medgemma_reasoning=reasoning)
+    result = agent.predict("a.wav", PatientVitals(age_months=24, respiratory_rate=30))
+
+    assert "stage_decode_sec" in result.usage_stats
+    assert result.usage_stats["deadline_exceeded"] == 1.0
+    assert result.triage_path == TriagePath.DEADLINE_FALLBACK
@@ -0,0 +1,164 @@
+import unittest
+import sys
+import os
+import tempfile
+import multiprocessing as mp
+import wave
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+# Insert root and mocks path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'mocks')))
+
+import torch
+
+from src.utils.audio import load_audio
+from src.utils.decode_pool import DecodePool
+from src.models.hear_encoder import HeAREncoder
+from src.datatypes import AudioDecodeError, LowQualityError
+
+
+class TestDecodePool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.paths = []
+        rng = np.random.default_rng(0)
+        # Mix of native-rate and off-rate recordings, longer and shorter than the slot
+        for i, (sr, seconds) in enumerate([(16000, 5), (44100, 12), (16000, 3), (4000, 8), (16000, 10)]):
+            path = os.path.join(cls.tmpdir.name, f"rec_{i}.wav")
+            with wave.open(path, "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(sr)
+                w.writeframes((rng.normal(0, 0.05, sr * seconds) * 32767).astype("<i2").tobytes())
+            cls.paths.append(path)
+        cls.silent = os.path.join(cls.tmpdir.name, "silent.wav")
+        with wave.open(cls.silent, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(np.zeros(16000 * 5, dtype="<i2").tobytes())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.pool = DecodePool(workers=2, prefetch=3, max_duration=10)
+        self.pool.start()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_results_match_load_audio_in_order(self):
+        for path, item in zip(self.paths, self.pool.imap(self.paths)):
+            with item:
+                waveform, sr = item.result()
+                expected, expected_sr = load_audio(path, sr=16000, duration=10)
+                self.assertEqual(sr, expected_sr)
+                np.testing.assert_array_equal(waveform, expected)
+        self.assertEqual(self.pool.decoded, len(self.paths))
+
+    def test_prefetch_bounded_by_slots(self):
+        items = self.pool.imap(self.paths)
+        held = [next(items) for _ in range(3)]
+        # Every slot is held by the consumer: nothing more can be decoded
+        with self.assertRaises(RuntimeError):
+            next(items)
+        for item in held:
+            item.release()
+
+    def test_released_item_and_abandoned_iteration_free_slots(self):
+        items = self.pool.imap(self.paths)
+        item = next(items)
+        item.release()
+        with self.assertRaises(RuntimeError):
+            item.result()
+        items.close()
+        self.assertEqual(self.pool._free.qsize(), self.pool.prefetch)
+
+    def test_decode_errors_raised_per_item(self):
+        missing = os.path.join(self.tmpdir.name, "missing.wav")
+        items = list(self.pool.imap([missing, self.paths[0]]))
+        with self.assertRaises(FileNotFoundError):
+            items[0].result()
+        self.assertEqual(len(items[1].result()[0]), 16000 * 5)
+        for item in items:
+            item.release()
+
+    def test_requires_started_pool(self):
+        with self.assertRaises(RuntimeError):
+            next(DecodePool(workers=1, prefetch=1).imap(self.paths))
+        with self.assertRaises(ValueError):
+            DecodePool(workers=0)
+
+    def test_encode_batch_with_pool_matches_inline(self):
+        """Pool-decoded recordings reach HeAR exactly as inline-decoded ones."""
+        sources = self.paths + [self.silent]
+
+        def run(encoder):
+            encoder.model = MagicMock()
+            with patch.object(encoder, '_infer_chunks', side_effect=lambda c: np.ones((len(c), 512), dtype=np.float32)) as mock_infer, \
+                 patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+                results = encoder.encode_batch(sources)
+            return results, mock_infer.call_args[0][0]
+
+        inline_results, inline_chunks = run(HeAREncoder())
+        pooled_results, pooled_chunks = run(HeAREncoder(decode_pool=self.pool))
+
+        np.testing.assert_array_equal(pooled_chunks, inline_chunks)
+        self.assertEqual(self.pool.decoded, len(sources))
+        self.assertIsInstance(pooled_results[-1], LowQualityError)
+        self.assertEqual([type(r) for r in pooled_results], [type(r) for r in inline_results])
+        self.assertEqual(self.pool._free.qsize(), self.pool.prefetch)
+
+    def test_fork_avoided_once_tensorflow_is_loaded(self):
+        pool = DecodePool(workers=1, prefetch=1)
+        if "fork" in mp.get_all_start_methods():
+            with patch.dict(sys.modules):
+                sys.modules.pop("tensorflow", None)
+                self.assertEqual(pool._context().get_start_method(), "fork")
+        with patch.dict(sys.modules, {"tensorflow": MagicMock()}):
+            self.assertNotEqual(pool._context().get_start_method(), "fork")
+        self.assertEqual(DecodePool(workers=1, start_method="spawn")._context().get_start_method(), "spawn")
+
+    def test_encode_batch_reports_decode_errors_per_item(self):
+        """A recording the workers cannot decode fails alone instead of aborting the batch."""
+        class _CorruptFirstPool:
+            running = True
+
+            def __init__(self, pool):
+                self.pool = pool
+
+            def imap(self, sources):
+                sources = list(sources)
+                items = self.pool.imap(sources[1:])
+                yield MagicMock(result=MagicMock(side_effect=RuntimeError("LibsndfileError: corrupt")))
+                yield from items
+
+        encoder = HeAREncoder(decode_pool=_CorruptFirstPool(self.pool))
+        encoder.model = MagicMock()
+        with patch.object(encoder, '_infer_chunks', side_effect=lambda c: np.ones((len(c), 512), dtype=np.float32)), \
+             patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+            results = encoder.encode_batch(self.paths[:3])
+
+        self.assertIsInstance(results[0], AudioDecodeError)
+        self.assertIn("corrupt", str(results[0]))
+        self.assertNotIsInstance(results[1], LowQualityError)
+        self.assertNotIsInstance(results[2], LowQualityError)
+        self.assertEqual(self.pool._free.qsize(), self.pool.prefetch)
+
+    def test_inline_decode_error_is_low_quality(self):
+        encoder = HeAREncoder()
+        with patch('src.models.hear_encoder.load_audio', side_effect=EOFError("truncated header")):
+            results = encoder.encode_batch([self.paths[0]])
+            with self.assertRaises(AudioDecodeError):
+                encoder.encode(self.paths[0])
+        self.assertIsInstance(results[0], AudioDecodeError)
+        self.assertIsInstance(results[0], LowQualityError)
+
+
+if __name__ == '__main__':
+    unittest.main()
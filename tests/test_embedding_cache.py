@@ -0,0 +1,163 @@
+import os
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+import torch
+
+from src.models.embedding_cache import EmbeddingCache, hash_audio_file, hash_audio_source
+from src.models.hear_encoder import HeAREncoder
+
+
+def _embedding(value):
+    return np.full((1, 512), value, dtype=np.float32)
+
+
+def test_key_depends_on_content_revision_and_segmentation():
+    params = {"sample_rate": 16000, "chunk_sec": 2.0}
+    base = EmbeddingCache.make_key("abc", "google/hear@1", params)
+    assert base == EmbeddingCache.make_key("abc", "google/hear@1", dict(reversed(list(params.items()))))
+    assert base != EmbeddingCache.make_key("abd", "google/hear@1", params)
+    assert base != EmbeddingCache.make_key("abc", "google/hear@2", params)
+    assert base != EmbeddingCache.make_key("abc", "google/hear@1", {**params, "chunk_sec": 1.0})
+
+
+def test_hash_audio_file_uses_content(tmp_path):
+    a, b, c = tmp_path / "a.wav", tmp_path / "b.wav", tmp_path / "c.wav"
+    a.write_bytes(b"RIFF-same")
+    b.write_bytes(b"RIFF-same")
+    c.write_bytes(b"RIFF-diff")
+    assert hash_audio_file(str(a)) == hash_audio_file(str(b))
+    assert hash_audio_file(str(a)) != hash_audio_file(str(c))
+
+
+def test_lru_eviction_and_counters():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("a", _embedding(1))
+    cache.put("b", _embedding(2))
+    assert cache.get("a") is not None       # a becomes most recent
+    cache.put("c", _embedding(3))           # evicts b
+    assert cache.get("b") is None
+    np.testing.assert_array_equal(cache.get("c"), _embedding(3))
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["memory_entries"] == 2
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    cache = EmbeddingCache(max_entries=1, persist_dir=str(tmp_path), shard_rows=2)
+    for i in range(3):                      # spans two shards
+        cache.put(f"k{i}", _embedding(i))
+
+    reloaded = EmbeddingCache(max_entries=1, persist_dir=str(tmp_path), shard_rows=2)
+    for i in range(3):
+        np.testing.assert_array_equal(reloaded.get(f"k{i}"), _embedding(i))
+    assert reloaded.stats()["disk_hits"] == 3
+    assert reloaded.stats()["disk_entries"] == 3
+
+    reloaded.put("k3", _embedding(3))       # appends after the reloaded rows
+    np.testing.assert_array_equal(reloaded.get("k2"), _embedding(2))
+    assert sorted(p.name for p in tmp_path.glob("shard_*.npy")) == ["shard_00000.npy", "shard_00001.npy"]
+
+
+def test_processes_sharing_persist_dir_never_reuse_rows(tmp_path):
+    # Two caches on one directory stand in for two forked workers
+    a = EmbeddingCache(persist_dir=str(tmp_path), shard_rows=2)
+    b = EmbeddingCache(persist_dir=str(tmp_path), shard_rows=2)
+    a.put("a0", _embedding(1))
+    b.put("b0", _embedding(2))
+    a.put("a1", _embedding(3))
+
+    np.testing.assert_array_equal(b.get("a0"), _embedding(1))
+    np.testing.assert_array_equal(a.get("b0"), _embedding(2))
+    reloaded = EmbeddingCache(persist_dir=str(tmp_path), shard_rows=2)
+    for key, value in (("a0", 1), ("b0", 2), ("a1", 3)):
+        np.testing.assert_array_equal(reloaded.get(key), _embedding(value))
+
+
+def _put_keys(persist_dir, worker):
+    cache = EmbeddingCache(persist_dir=persist_dir, shard_rows=8)
+    for i in range(20):
+        cache.put(f"w{worker}-{i}", _embedding(worker * 100 + i))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_concurrent_forked_writers(tmp_path):
+    ctx = mp.get_context("fork")
+    workers = [ctx.Process(target=_put_keys, args=(str(tmp_path), w)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    cache = EmbeddingCache(persist_dir=str(tmp_path), shard_rows=8)
+    assert cache.stats()["disk_entries"] == 80
+    for w in range(4):
+        for i in range(20):
+            np.testing.assert_array_equal(cache.get(f"w{w}-{i}"), _embedding(w * 100 + i))
+
+
+def test_torn_index_line_is_skipped_and_terminated(tmp_path):
+    cache = EmbeddingCache(persist_dir=str(tmp_path), shard_rows=4)
+    cache.put("k0", _embedding(0))
+    with open(tmp_path / "index.jsonl", "a") as f:
+        f.write('{"key": "torn", "sha')
+
+    reloaded = EmbeddingCache(persist_dir=str(tmp_path), shard_rows=4)
+    reloaded.put("k1", _embedding(1))
+    again = EmbeddingCache(persist_dir=str(tmp_path), shard_rows=4)
+    assert again.stats()["disk_entries"] == 2
+    np.testing.assert_array_equal(again.get("k1"), _embedding(1))
+
+
+def test_encoder_skips_decode_on_cache_hit(tmp_path):
+    audio = tmp_path / "cough.wav"
+    audio.write_bytes(b"fake wav bytes")
+    encoder = HeAREncoder(cache=EmbeddingCache())
+
+    waveform = np.random.uniform(-0.1, 0.1, 16000 * 5).astype(np.float32)
+    with patch('src.models.hear_encoder.load_audio', return_value=(waveform, 16000)) as mock_load, \
+         patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+        encoder.encode(str(audio))
+        encoder.encode(str(audio))
+
+    mock_load.assert_called_once()
+    assert encoder.cache.stats()["hits"] == 1
+    assert encoder.cache.stats()["misses"] == 1
+
+
+def test_quality_gate_settings_are_part_of_the_key(tmp_path):
+    audio = tmp_path / "cough.wav"
+    audio.write_bytes(b"fake wav bytes")
+    encoder = HeAREncoder(cache=EmbeddingCache())
+    gated = encoder._cache_key(str(audio))
+
+    with patch('src.models.hear_encoder.QUALITY_CHUNK_GATING', False):
+        assert encoder._cache_key(str(audio)) != gated
+    with patch('src.utils.quality.QUALITY_MIN_SNR_DB', 6.0):
+        assert encoder._cache_key(str(audio)) != gated
+    assert encoder._cache_key(str(audio)) == gated
+
+
+def test_uploaded_bytes_share_cache_entry_with_file(tmp_path):
+    audio = tmp_path / "cough.wav"
+    audio.write_bytes(b"fake wav bytes")
+    assert hash_audio_source(memoryview(b"fake wav bytes")) == hash_audio_file(str(audio))
+
+    encoder = HeAREncoder(cache=EmbeddingCache())
+    waveform = np.random.uniform(-0.1, 0.1, 16000 * 5).astype(np.float32)
+    with patch('src.models.hear_encoder.load_audio', return_value=(waveform, 16000)) as mock_load, \
+         patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+        encoder.encode(str(audio))
+        encoder.encode(b"fake wav bytes")
+        encoder.encode((waveform, 16000))
+
+    # The upload hits the file's entry; the decoded waveform is its own entry
+    assert mock_load.call_count == 2
+    assert encoder.cache.stats()["hits"] == 1
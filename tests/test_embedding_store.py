@@ -0,0 +1,142 @@
+import json
+import os
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+
+from src.data.embedding_store import EmbeddingStore
+
+
+def _rows(start, count, dim=4):
+    return np.arange(start * dim, (start + count) * dim, dtype=np.float32).reshape(count, dim)
+
+
+def _offsets(count):
+    return [(2.0 * i, 2.0 * i + 2.0) for i in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingStore(str(tmp_path), dim=4, shard_rows=5)
+
+
+def test_put_get_round_trip_across_shards(store):
+    a = store.put("rec_a", "hear@1", _rows(0, 3), _offsets(3), labels=[0, 1, 2])
+    b = store.put("rec_b", "hear@1", _rows(3, 4), _offsets(4))  # spans shards 0 and 1
+
+    assert (a.row, a.count, b.row, b.count) == (0, 3, 3, 4)
+    np.testing.assert_array_equal(store.get("rec_b", "hear@1"), _rows(3, 4))
+    assert store.entry("rec_a", "hear@1").labels == [0, 1, 2]
+    assert store.get("rec_a", "hear@2") is None
+    assert len(store) == 7
+
+
+def test_range_and_random_reads(store):
+    store.put("rec_a", "hear@1", _rows(0, 12), _offsets(12))
+
+    np.testing.assert_array_equal(store.read_range(4, 11), _rows(4, 7))
+    order = [11, 0, 6, 5, 3]
+    np.testing.assert_array_equal(store.read_rows(order), _rows(0, 12)[order])
+    with pytest.raises(IndexError):
+        store.read_range(10, 13)
+    with pytest.raises(IndexError):
+        store.read_rows([12])
+
+
+def test_index_persists_and_tolerates_torn_line(tmp_path):
+    store = EmbeddingStore(str(tmp_path), dim=4, shard_rows=5)
+    store.put("rec_a", "hear@1", _rows(0, 3), _offsets(3), labels=[0, 0, 1])
+    with open(tmp_path / EmbeddingStore.INDEX_FILE, "a") as f:
+        f.write('{"recording_id": "torn", "revis')
+
+    reopened = EmbeddingStore(str(tmp_path), dim=4, shard_rows=5)
+    assert len(reopened) == 3
+    assert reopened.entry("rec_a", "hear@1").offsets == [(0.0, 2.0), (2.0, 4.0), (4.0, 6.0)]
+    np.testing.assert_array_equal(reopened.get("rec_a", "hear@1"), _rows(0, 3))
+
+    # Appends continue after the last complete record
+    entry = reopened.put("rec_b", "hear@1", _rows(3, 2), _offsets(2))
+    assert entry.row == 3
+
+
+def test_revisions_are_separate(store):
+    store.put("rec_a", "hear@1", _rows(0, 2), _offsets(2))
+    store.put("rec_a", "hear@2", _rows(2, 3), _offsets(3))
+    store.put("rec_b", "hear@1", _rows(5, 1), _offsets(1))
+
+    assert [e.recording_id for e in store.entries("hear@1")] == ["rec_a", "rec_b"]
+    np.testing.assert_array_equal(store.rows("hear@1"), [0, 1, 5])
+    np.testing.assert_array_equal(store.rows("hear@3"), [])
+
+
+def test_get_or_compute_only_computes_once(store):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _rows(0, 2), _offsets(2), [1, 2]
+
+    first = store.get_or_compute("rec_a", "hear@1", compute)
+    second = store.get_or_compute("rec_a", "hear@1", compute)
+
+    assert first == second
+    assert len(calls) == 1
+    # put() of an existing entry does not append rows
+    assert store.put("rec_a", "hear@1", _rows(9, 2), _offsets(2)) == first
+    assert len(store) == 2
+
+
+def test_put_validates_lengths(store):
+    with pytest.raises(ValueError):
+        store.put("rec_a", "hear@1", _rows(0, 2), _offsets(3))
+    with pytest.raises(ValueError):
+        store.put("rec_a", "hear@1", _rows(0, 2), _offsets(2), labels=[1])
+
+
+def test_index_is_compact_json_lines(store, tmp_path):
+    store.put("rec_a", "hear@1", _rows(0, 2), [(0.0123456, 1.5), (1.5, 3.0)], labels=[0, 3])
+    record = json.loads((tmp_path / EmbeddingStore.INDEX_FILE).read_text().splitlines()[0])
+    assert record == {
+        "recording_id": "rec_a", "revision": "hear@1", "row": 0, "count": 2,
+        "offsets": [[0.012, 1.5], [1.5, 3.0]], "labels": [0, 3],
+    }
+
+
+def test_stores_sharing_root_see_each_others_recordings(tmp_path):
+    # Two stores on one directory stand in for two jobs on a shared volume
+    a = EmbeddingStore(str(tmp_path), dim=4, shard_rows=5)
+    b = EmbeddingStore(str(tmp_path), dim=4, shard_rows=5)
+    a.put("rec_a", "hear@1", _rows(0, 3), _offsets(3))
+    b.put("rec_b", "hear@1", _rows(3, 4), _offsets(4))
+
+    assert b.entry("rec_a", "hear@1").row == 0
+    assert a.entry("rec_b", "hear@1").row == 3
+    np.testing.assert_array_equal(a.get("rec_b", "hear@1"), _rows(3, 4))
+    # Already stored by the other process: no new rows
+    assert b.put("rec_a", "hear@1", _rows(9, 3), _offsets(3)).row == 0
+    assert len(a) == len(b) == 7
+
+
+def _put_recordings(root, worker):
+    store = EmbeddingStore(root, dim=4, shard_rows=5)
+    for i in range(10):
+        store.put(f"w{worker}-{i}", "hear@1", _rows(worker * 100 + i, 3), _offsets(3))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_concurrent_forked_writers(tmp_path):
+    ctx = mp.get_context("fork")
+    workers = [ctx.Process(target=_put_recordings, args=(str(tmp_path), w)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    store = EmbeddingStore(str(tmp_path), dim=4, shard_rows=5)
+    assert len(store.entries("hear@1")) == 40
+    assert len(store) == 120
+    for w in range(4):
+        for i in range(10):
+            np.testing.assert_array_equal(store.get(f"w{w}-{i}", "hear@1"), _rows(w * 100 + i, 3))
@@ -0,0 +1,245 @@
+import os
+import sys
+import types
+import pytest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.models.hear_backends import (
+    ONNXBackend,
+    TFLiteBackend,
+    SavedModelBackend,
+    load_backend
+)
+from src.models.hear_encoder import HeAREncoder
+from src.models.model_store import ModelStore
+
+
+def _fake_embed(chunks):
+    return np.asarray(chunks, dtype=np.float32)[:, :512] * 2
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / "hear.bin"
+    path.write_bytes(b"converted-weights")
+    return str(path)
+
+
+@pytest.fixture
+def fake_onnxruntime():
+    module = types.ModuleType("onnxruntime")
+
+    class SessionOptions:
+        intra_op_num_threads = 0
+
+    class InferenceSession:
+        def __init__(self, path, sess_options=None, providers=None):
+            self.providers = providers
+
+        def get_inputs(self):
+            return [types.SimpleNamespace(name="x")]
+
+        def run(self, outputs, feeds):
+            return [_fake_embed(feeds["x"])]
+
+    module.SessionOptions = SessionOptions
+    module.InferenceSession = InferenceSession
+    with patch.dict(sys.modules, {"onnxruntime": module}):
+        yield module
+
+
+@pytest.fixture
+def fake_tflite():
+    package = types.ModuleType("tflite_runtime")
+    module = types.ModuleType("tflite_runtime.interpreter")
+
+    class Interpreter:
+        resizes = []
+
+        def __init__(self, model_path, num_threads=None):
+            self._tensor = None
+
+        def get_input_details(self):
+            return [{"index": 0}]
+
+        def get_output_details(self):
+            return [{"index": 1}]
+
+        def resize_tensor_input(self, index, shape):
+            Interpreter.resizes.append(tuple(shape))
+
+        def allocate_tensors(self):
+            pass
+
+        def set_tensor(self, index, value):
+            self._tensor = value
+
+        def invoke(self):
+            self._output = _fake_embed(self._tensor)
+
+        def get_tensor(self, index):
+            return self._output
+
+    module.Interpreter = Interpreter
+    package.interpreter = module
+    with patch.dict(sys.modules, {"tflite_runtime": package, "tflite_runtime.interpreter": module}):
+        Interpreter.resizes = []
+        yield Interpreter
+
+
+def test_onnx_backend(fake_onnxruntime, model_file):
+    backend = load_backend("onnx", model_file)
+    chunks = np.random.rand(3, 32000).astype(np.float32)
+
+    assert isinstance(backend, ONNXBackend)
+    np.testing.assert_allclose(backend.infer(chunks), _fake_embed(chunks))
+    assert backend.revision.startswith("onnx:hear.bin@")
+
+
+def test_tflite_backend_resizes_only_on_new_batch_size(fake_tflite, model_file):
+    backend = load_backend("tflite", model_file)
+    chunks = np.random.rand(4, 32000).astype(np.float32)
+
+    assert isinstance(backend, TFLiteBackend)
+    np.testing.assert_allclose(backend.infer(chunks), _fake_embed(chunks))
+    backend.infer(chunks)
+    backend.infer(chunks[:2])
+    assert fake_tflite.resizes == [(4, 32000), (2, 32000)]
+
+
+def test_revision_tracks_file_contents(fake_onnxruntime, model_file):
+    first = load_backend("onnx", model_file).revision
+    with open(model_file, "wb") as f:
+        f.write(b"re-exported-weights")
+    assert load_backend("onnx", model_file).revision != first
+
+
+def test_revision_of_stored_model_uses_manifest_checksum(fake_onnxruntime, tmp_path):
+    store = ModelStore(root=str(tmp_path / "store"), artifacts={})
+    directory = tmp_path / "store" / "hear-onnx"
+    directory.mkdir(parents=True)
+    (directory / "hear.onnx").write_bytes(b"converted-weights")
+    checksum = store.register("hear-onnx", str(directory)).files["hear.onnx"]["sha256"]
+
+    # The manifest already holds the checksum: nothing is re-hashed at load
+    with patch("src.models.hear_backends.get_model_store", return_value=store), \
+         patch("src.models.model_store._sha256", side_effect=AssertionError("re-hashed")):
+        backend = load_backend("onnx", str(directory / "hear.onnx"))
+    assert backend.revision == f"onnx:hear.onnx@{checksum[:12]}"
+
+
+def test_load_backend_errors(tmp_path):
+    with pytest.raises(ValueError, match="Unknown HeAR backend"):
+        load_backend("tensorrt", None)
+    with pytest.raises(ValueError, match="needs a local model file"):
+        load_backend("onnx", None)
+    with pytest.raises(FileNotFoundError):
+        load_backend("onnx", str(tmp_path / "missing.onnx"))
+
+
+def test_encoder_uses_injected_backend(fake_onnxruntime, model_file):
+    backend = load_backend("onnx", model_file)
+    encoder = HeAREncoder(backend=backend, max_batch_size=2)
+    chunks = np.random.rand(5, 32000).astype(np.float32)
+
+    assert encoder.model is backend
+    assert encoder.model_revision == backend.revision
+    np.testing.assert_allclose(encoder._infer_chunks(chunks), _fake_embed(chunks))
+
+
+@pytest.mark.skipif(
+    os.environ.get("AURA_HEAR_BACKEND") not in ("tflite", "onnx") or not os.environ.get("AURA_HEAR_BACKEND_PATH"),
+    reason="Set AURA_HEAR_BACKEND and AURA_HEAR_BACKEND_PATH to a converted HeAR model"
+)
+def test_converted_backend_matches_saved_model():
+    """Parity of the converted runtime against the official SavedModel outputs."""
+    pytest.importorskip("tensorflow")
+    reference = SavedModelBackend()
+    converted = load_backend(os.environ["AURA_HEAR_BACKEND"], os.environ["AURA_HEAR_BACKEND_PATH"])
+
+    rng = np.random.default_rng(0)
+    chunks = rng.uniform(-0.5, 0.5, (4, 32000)).astype(np.float32)
+    chunks[3] = 0.0  # silent chunk
+
+    expected = reference.infer(chunks)
+    actual = converted.infer(chunks)
+    assert actual.shape == expected.shape == (4, 512)
+    cosine = np.sum(expected * actual, axis=1) / (
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1) + 1e-12
+    )
+    assert np.all(cosine > 0.999)
+    np.testing.assert_allclose(actual, expected, atol=1e-3, rtol=1e-2)
+
+
+class _RecordingBackend:
+    revision = "fake"
+
+    def __init__(self):
+        self.shapes = []
+        self.prepared = None
+
+    def prepare(self, batch_sizes):
+        self.prepared = list(batch_sizes)
+
+    def infer(self, chunks):
+        self.shapes.append(chunks.shape)
+        return _fake_embed(chunks)
+
+
+def test_encoder_prepares_and_warms_every_bucket():
+    backend = _RecordingBackend()
+    encoder = HeAREncoder(backend=backend, max_batch_size=8)
+
+    assert backend.prepared == [1, 2, 5, 8]
+    # Two silent passes per bucket
+    assert backend.shapes == [(1, 32000), (1, 32000), (2, 32000), (2, 32000),
+                              (5, 32000), (5, 32000), (8, 32000), (8, 32000)]
+    assert set(encoder.warmup_stats) == {1, 2, 5, 8}
+    assert all({"cold_ms", "warm_ms"} <= set(stats) for stats in encoder.warmup_stats.values())
+
+
+def test_batches_padded_to_bucket_shape():
+    backend = _RecordingBackend()
+    encoder = HeAREncoder(backend=backend, max_batch_size=8)
+    backend.shapes.clear()
+    chunks = np.random.rand(11, 32000).astype(np.float32)
+
+    embeddings = encoder._infer_chunks(chunks)
+
+    # 11 chunks → a full 8-row batch plus 3 rows padded to the 5 bucket
+    assert backend.shapes == [(8, 32000), (5, 32000)]
+    np.testing.assert_allclose(embeddings, _fake_embed(chunks))
+
+
+def test_saved_model_backend_traces_fixed_shapes():
+    calls = []
+
+    def serving(x):
+        calls.append(x.shape)
+        return {'output_0': types.SimpleNamespace(numpy=lambda: _fake_embed(x))}
+
+    fake_tf = types.ModuleType("tensorflow")
+    fake_tf.float32 = np.float32
+    fake_tf.constant = lambda value, dtype=None: np.asarray(value, dtype=dtype)
+    fake_tf.TensorSpec = lambda shape, dtype: shape
+    traced = []
+
+    def tf_function(fn):
+        def get_concrete_function(spec):
+            traced.append(spec)
+            return lambda x: types.SimpleNamespace(numpy=lambda: fn(x).numpy())
+        return types.SimpleNamespace(get_concrete_function=get_concrete_function)
+
+    fake_tf.function = tf_function
+    model = types.SimpleNamespace(signatures={"serving_default": serving})
+    with patch.dict(sys.modules, {"tensorflow": fake_tf}):
+        backend = SavedModelBackend(model=model)
+        backend.prepare([1, 5])
+        chunks = np.random.rand(5, 32000).astype(np.float32)
+        np.testing.assert_allclose(backend.infer(chunks), _fake_embed(chunks))
+        backend.infer(chunks[:3])  # no traced shape: falls back to the signature
+
+    assert traced == [(1, 32000), (5, 32000)]
+    assert calls == [(5, 32000), (3, 32000)]
@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+import numpy as np
+import torch
+
+from src.models.hear_batcher import HeARChunkBatcher
+from src.models.hear_encoder import HeAREncoder
+
+
+class _RecordingInfer:
+    """Fake HeAR signature: embedding row i is filled with the chunk's first sample."""
+
+    def __init__(self, delay=0.0):
+        self.shapes = []
+        self.delay = delay
+
+    def __call__(self, batch):
+        self.shapes.append(batch.shape)
+        time.sleep(self.delay)
+        return np.repeat(batch[:, :1], 4, axis=1)
+
+
+def _chunks(value, n):
+    return np.full((n, 8), value, dtype=np.float32)
+
+
+def test_results_routed_to_each_caller():
+    infer = _RecordingInfer()
+    with HeARChunkBatcher(infer, batch_size=4, max_wait_ms=200) as batcher:
+        futures = [batcher.submit(_chunks(value, 3)) for value in (1.0, 2.0, 3.0)]
+        outputs = [future.result(timeout=5) for future in futures]
+
+    for value, output in zip((1.0, 2.0, 3.0), outputs):
+        assert output.shape == (3, 4)
+        assert np.all(output == value)
+
+
+def test_chunks_packed_into_fixed_shape_batches():
+    infer = _RecordingInfer()
+    with HeARChunkBatcher(infer, batch_size=4, max_wait_ms=200) as batcher:
+        futures = [batcher.submit(_chunks(value, 3)) for value in (1.0, 2.0, 3.0)]
+        for future in futures:
+            future.result(timeout=5)
+        stats = batcher.stats()
+
+    # 9 chunks → 3 batches of 4 rows (last one padded), not 3 calls of 3
+    assert infer.shapes == [(4, 8)] * 3
+    assert stats["chunks"] == 9
+    assert stats["padded_chunks"] == 3
+    assert stats["requests"] == 3
+
+
+def test_unpadded_batches():
+    infer = _RecordingInfer()
+    with HeARChunkBatcher(infer, batch_size=4, max_wait_ms=10, pad_batches=False) as batcher:
+        batcher.submit(_chunks(1.0, 2)).result(timeout=5)
+    assert infer.shapes == [(2, 8)]
+
+
+def test_lone_request_runs_after_wait_window():
+    infer = _RecordingInfer()
+    with HeARChunkBatcher(infer, batch_size=16, max_wait_ms=20) as batcher:
+        start = time.perf_counter()
+        batcher.submit(_chunks(1.0, 5)).result(timeout=5)
+        assert time.perf_counter() - start < 2.0
+    assert len(infer.shapes) == 1
+
+
+def test_concurrent_callers_share_batches():
+    infer = _RecordingInfer(delay=0.01)
+    results = {}
+    with HeARChunkBatcher(infer, batch_size=16, max_wait_ms=100) as batcher:
+        def encode(value):
+            results[value] = batcher.submit(_chunks(value, 5)).result(timeout=5)
+
+        threads = [threading.Thread(target=encode, args=(float(i),)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # 30 chunks in 16-row batches instead of 6 separate calls
+    assert len(infer.shapes) < 6
+    for value, output in results.items():
+        assert np.all(output == value)
+
+
+def test_inference_error_propagates():
+    def failing(batch):
+        raise RuntimeError("boom")
+
+    with HeARChunkBatcher(failing, batch_size=4, max_wait_ms=10) as batcher:
+        with pytest.raises(RuntimeError, match="boom"):
+            batcher.submit(_chunks(1.0, 2)).result(timeout=5)
+        # The worker keeps serving after a failed batch
+        with pytest.raises(RuntimeError, match="boom"):
+            batcher.submit(_chunks(1.0, 2)).result(timeout=5)
+
+
+def test_submit_requires_start():
+    with pytest.raises(RuntimeError):
+        HeARChunkBatcher(_RecordingInfer()).submit(_chunks(1.0, 1))
+
+
+def test_encoder_routes_chunks_through_shared_batcher():
+    encoder = HeAREncoder(max_batch_size=8)
+    encoder.model = object()  # pretend the real model is loaded
+    with patch.object(encoder, '_infer_chunks', side_effect=lambda c: np.ones((len(c), 512), dtype=np.float32)) as mock_infer, \
+         patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+        encoder.enable_shared_batching(max_wait_ms=10)
+        embedding = encoder.embed(np.full(16000 * 10, 0.1, dtype=np.float32), 16000)
+        encoder.disable_shared_batching()
+
+    assert embedding.shape == (1, 512)
+    assert mock_infer.call_args[0][0].shape == (8, 32000)
+    assert encoder.batcher is None
@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from src.models.hear_encoder import HeAREncoder
+from src.agent.core import AuraMedAgent
+from src.utils.audio import normalize_duration
+from src.datatypes import LowQualityError, PatientVitals, TriageResult, TriageStatus, TriagePath
+
+SR = 16000
+
+
+def _fake_infer(chunks):
+    """Deterministic stand-in for HeAR: first 512 samples of each chunk."""
+    return np.asarray(chunks, dtype=np.float32)[:, :512].copy()
+
+
+@pytest.fixture
+def encoder():
+    encoder = HeAREncoder()
+    encoder.model = object()  # pretend the real model is loaded
+    as_tensor = lambda a: Mock(float=lambda: a)
+    with patch.object(encoder, '_infer_chunks', side_effect=_fake_infer), \
+         patch('src.models.hear_stream.torch.from_numpy', side_effect=as_tensor), \
+         patch('src.models.hear_encoder.torch.from_numpy', side_effect=as_tensor):
+        yield encoder
+
+
+def _stream(session, waveform, frame=1600):
+    for start in range(0, len(waveform), frame):
+        session.push(waveform[start:start + frame])
+
+
+@pytest.mark.parametrize("seconds", [3.3, 10.0, 12.5])
+def test_matches_file_based_embedding(encoder, seconds):
+    rng = np.random.default_rng(0)
+    waveform = rng.uniform(-0.1, 0.1, int(SR * seconds)).astype(np.float32)
+
+    session = encoder.open_stream()
+    _stream(session, waveform)
+    streamed = session.finalize()
+
+    expected = encoder.embed(normalize_duration(waveform, target_length=10, sr=SR), SR)
+    np.testing.assert_allclose(streamed, expected, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("hop_sec, pooling", [(1.0, "mean"), (2.0, "max"), (1.5, "energy")])
+def test_matches_file_based_embedding_with_overlap_and_pooling(encoder, hop_sec, pooling):
+    encoder.hop_sec = hop_sec
+    encoder.pooling = pooling
+    rng = np.random.default_rng(1)
+    waveform = rng.uniform(-0.1, 0.1, int(SR * 6.7)).astype(np.float32)
+
+    session = encoder.open_stream()
+    _stream(session, waveform, frame=1000)
+    streamed = session.finalize()
+
+    expected = encoder.embed(normalize_duration(waveform, target_length=10, sr=SR), SR)
+    np.testing.assert_allclose(streamed, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_full_windows_embedded_while_recording(encoder):
+    session = encoder.open_stream()
+    _stream(session, np.full(SR * 5, 0.05, dtype=np.float32))
+    for future in session._pending:
+        future.result()
+
+    stats = session.quality_stats()
+    assert stats["windows_ready"] == 2
+    assert stats["duration_sec"] == 5.0
+    assert stats["rms"] == pytest.approx(0.05)
+    assert encoder._infer_chunks.call_count == 2
+
+
+def test_int16_frames_are_scaled(encoder):
+    session = encoder.open_stream()
+    session.push(np.full(SR, 16384, dtype=np.int16))
+    assert session.quality_stats()["peak"] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("waveform, message", [
+    (np.full(SR // 2, 0.05, dtype=np.float32), "too short"),
+    (np.zeros(SR * 3, dtype=np.float32), "too silent"),
+    (np.full(SR * 3, 0.95, dtype=np.float32), "too noisy"),
+])
+def test_quality_gates(encoder, waveform, message):
+    session = encoder.open_stream()
+    session.push(waveform)
+    with pytest.raises(LowQualityError, match=message):
+        session.finalize()
+
+
+def test_push_after_finalize_rejected(encoder):
+    session = encoder.open_stream()
+    session.push(np.full(SR * 2, 0.05, dtype=np.float32))
+    session.finalize()
+    with pytest.raises(RuntimeError):
+        session.push(np.zeros(10, dtype=np.float32))
+
+
+def test_rejects_other_sample_rates(encoder):
+    with pytest.raises(ValueError):
+        encoder.open_stream(sample_rate=44100)
+
+
+def test_agent_predict_stream():
+    session = Mock()
+    session.finalize.return_value = np.zeros((1, 512), dtype=np.float32)
+    reasoning = Mock()
+    reasoning.generate.return_value = TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing.")
+    agent = AuraMedAgent(hear_encoder=Mock(), medgemma_reasoning=reasoning)
+
+    result = agent.predict_stream(session, PatientVitals(age_months=18, respiratory_rate=45))
+
+    assert result.status == TriageStatus.YELLOW
+    assert result.action_recommendation == "Administer oral Amoxicillin. Follow up in 48 hours."
+    session.finalize.assert_called_once()
+
+
+def test_agent_predict_stream_low_quality():
+    session = Mock()
+    session.finalize.side_effect = LowQualityError("Audio recording contains no clear signal (too silent)")
+    agent = AuraMedAgent(hear_encoder=Mock(), medgemma_reasoning=Mock())
+
+    result = agent.predict_stream(session, PatientVitals(age_months=18, respiratory_rate=45))
+
+    assert result.status == TriageStatus.INCONCLUSIVE
+    assert result.triage_path == TriagePath.QUALITY_GATE
+
+
+def test_clipped_windows_dropped(encoder):
+    rng = np.random.default_rng(2)
+    t = np.arange(SR * 2) / SR
+    clipped = np.clip(1.2 * np.sin(2 * np.pi * 220 * t), -1.0, 1.0)
+    waveform = np.concatenate([clipped, rng.uniform(-0.1, 0.1, SR * 4)]).astype(np.float32)
+
+    session = encoder.open_stream()
+    _stream(session, waveform)
+    assert session.quality_stats()["windows_dropped"] == 1
+    streamed = session.finalize()
+
+    expected = encoder.embed(normalize_duration(waveform, target_length=10, sr=SR), SR)
+    np.testing.assert_allclose(streamed, expected, rtol=1e-5, atol=1e-6)
@@ -1,7 +1,7 @@
 import torch
 import unittest
 from unittest.mock import MagicMock
-from src.datatypes import PatientVitals, TriageStatus
+from src.datatypes import PatientVitals, TriageResult, TriageStatus, TriagePath
 from src.models.medgemma import MedGemmaReasoning
 from src.models.projection import ProjectionLayer
 
@@ -80,5 +80,70 @@ CONFIDENCE: 0.85"""
         self.assertAlmostEqual(result.confidence, 0.85, places=2)
         self.assertIn("fast breathing", result.reasoning)
 
+
+class TestMedGemmaFastPath(unittest.TestCase):
+    """Confidence-gated cascade: unambiguous cases skip MedGemma generation."""
+
+    def setUp(self):
+        self.engine = MedGemmaReasoning()
+        # Pretend the LLM is loaded so the cascade is exercised
+        self.engine.model = MagicMock()
+        self.engine.processor = MagicMock()
+        self.engine.classifier = MagicMock()
+        self.engine._construct_prompt = MagicMock(return_value="prompt")
+        self.engine._run_generation = MagicMock(return_value=["REASONING: Borderline.\nSTATUS: YELLOW\nCONFIDENCE: 0.6"])
+
+    def _classify(self, label, confidence):
+        self.engine.classifier.predict.return_value = (label, f"{label} sounds.", confidence)
+        self.engine.classifier.predict_batch.side_effect = lambda embs: [(label, f"{label} sounds.", confidence)] * len(embs)
+
+    def test_confident_normal_with_slow_breathing_skips_llm(self):
+        self._classify("Normal", 0.95)
+        vitals = PatientVitals(age_months=24, respiratory_rate=28)  # threshold 40
+        result = self.engine.generate(torch.randn(1, 512), vitals)
+        self.assertEqual(result.status, TriageStatus.GREEN)
+        self.assertEqual(result.triage_path, TriagePath.FAST_PATH)
+        self.assertEqual(result.action_recommendation, "Soothe throat, fluids, rest. No antibiotics needed.")
+        self.engine._run_generation.assert_not_called()
+
+    def test_confident_crackles_with_fast_breathing_skips_llm(self):
+        self._classify("Crackle", 0.93)
+        vitals = PatientVitals(age_months=420, respiratory_rate=30)  # threshold 20
+        result = self.engine.generate(torch.randn(1, 512), vitals)
+        self.assertEqual(result.status, TriageStatus.YELLOW)
+        self.assertEqual(result.triage_path, TriagePath.FAST_PATH)
+        self.engine._run_generation.assert_not_called()
+
+    def test_borderline_cases_escalate_to_llm(self):
+        vitals_near_threshold = PatientVitals(age_months=24, respiratory_rate=38)
+        for label, confidence, vitals in [
+            ("Normal", 0.60, PatientVitals(age_months=24, respiratory_rate=20)),  # low confidence
+            ("Normal", 0.95, vitals_near_threshold),                              # RR inside margin
+            ("Wheeze", 0.95, PatientVitals(age_months=24, respiratory_rate=20)),  # label/vitals disagree
+        ]:
+            self._classify(label, confidence)
+            result = self.engine.generate(torch.randn(1, 512), vitals)
+            self.assertEqual(result.triage_path, TriagePath.LLM)
+        self.assertEqual(self.engine._run_generation.call_count, 3)
+
+    def test_fast_path_can_be_disabled(self):
+        self.engine.fast_path = False
+        self._classify("Normal", 0.99)
+        result = self.engine.generate(torch.randn(1, 512), PatientVitals(age_months=24, respiratory_rate=20))
+        self.assertEqual(result.triage_path, TriagePath.LLM)
+
+    def test_generate_batch_only_escalates_borderline(self):
+        self._classify("Normal", 0.95)
+        vitals = [PatientVitals(age_months=24, respiratory_rate=20), PatientVitals(age_months=24, respiratory_rate=39)]
+        results = self.engine.generate_batch([torch.randn(1, 512)] * 2, vitals)
+        self.assertEqual([r.triage_path for r in results], [TriagePath.FAST_PATH, TriagePath.LLM])
+        conversations = self.engine._run_generation.call_args[0][0]
+        self.assertEqual(len(conversations), 1)
+
+    def test_rule_based_path_recorded_without_llm(self):
+        engine = MedGemmaReasoning()
+        result = engine.generate(torch.randn(1, 512), PatientVitals(age_months=12, respiratory_rate=30))
+        self.assertEqual(result.triage_path, TriagePath.RULE_BASED)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import types
+import pytest
+from unittest.mock import patch
+
+from src.datatypes import ModelUnavailableError
+from src.models.model_store import ModelStore, main
+
+ARTIFACTS = {"hear": ("google/hear", "abc123")}
+
+
+def _write_artifact(directory, files):
+    for relpath, content in files.items():
+        path = os.path.join(directory, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+
+@pytest.fixture
+def fake_hub(monkeypatch):
+    """huggingface_hub stand-in that 'downloads' a tiny SavedModel."""
+    calls = []
+    module = types.ModuleType("huggingface_hub")
+
+    class HfApi:
+        def model_info(self, repo_id, revision=None):
+            return types.SimpleNamespace(sha="abc123")
+
+    def snapshot_download(repo_id, revision=None, local_dir=None):
+        calls.append((repo_id, revision))
+        _write_artifact(local_dir, {
+            "saved_model.pb": b"graph",
+            "variables/variables.index": b"index",
+            ".cache/huggingface/download.lock": b"",
+        })
+        return local_dir
+
+    module.HfApi = HfApi
+    module.snapshot_download = snapshot_download
+    monkeypatch.setitem(sys.modules, "huggingface_hub", module)
+    return calls
+
+
+def test_resolve_without_prefetch_raises_with_hint(tmp_path):
+    store = ModelStore(root=str(tmp_path), artifacts=ARTIFACTS)
+    with pytest.raises(ModelUnavailableError, match="prefetch hear"):
+        store.resolve("hear")
+
+
+def test_prefetch_records_pinned_commit_and_checksums(tmp_path, fake_hub):
+    store = ModelStore(root=str(tmp_path), artifacts=ARTIFACTS)
+    record = store.prefetch("hear")
+
+    assert fake_hub == [("google/hear", "abc123")]
+    assert record.revision == "abc123"
+    # Hub bookkeeping files are not part of the artifact
+    assert sorted(record.files) == ["saved_model.pb", os.path.join("variables", "variables.index")]
+    assert record.files["saved_model.pb"]["size"] == len(b"graph")
+
+    # A fresh store (e.g. the next start) resolves from the manifest alone
+    with patch.dict(sys.modules, {"huggingface_hub": None}):
+        path = ModelStore(root=str(tmp_path), artifacts=ARTIFACTS).resolve("hear")
+    assert path == os.path.join(str(tmp_path), "hear")
+    assert len(fake_hub) == 1
+
+
+def test_resolve_downloads_only_when_allowed(tmp_path, fake_hub):
+    store = ModelStore(root=str(tmp_path), artifacts=ARTIFACTS, allow_download=True)
+    assert os.path.isdir(store.resolve("hear"))
+    store.resolve("hear")
+    assert len(fake_hub) == 1
+
+
+def test_resolve_rejects_other_pinned_revision(tmp_path, fake_hub):
+    ModelStore(root=str(tmp_path), artifacts=ARTIFACTS).prefetch("hear")
+    store = ModelStore(root=str(tmp_path), artifacts={"hear": ("google/hear", "def456")})
+    with pytest.raises(ModelUnavailableError, match="def456 is pinned"):
+        store.resolve("hear")
+
+
+def test_damaged_artifact_detected(tmp_path, fake_hub):
+    store = ModelStore(root=str(tmp_path), artifacts=ARTIFACTS)
+    store.prefetch("hear")
+    pb = tmp_path / "hear" / "saved_model.pb"
+
+    # Same size, different bytes: only the full checksum notices
+    pb.write_bytes(b"GRAPH")
+    assert store.resolve("hear")
+    assert store.verify("hear") == ["saved_model.pb checksum mismatch"]
+    with pytest.raises(ModelUnavailableError, match="checksum mismatch"):
+        ModelStore(root=str(tmp_path), artifacts=ARTIFACTS, verify_checksums=True).resolve("hear")
+
+    # Truncated or missing files fail the cheap check at start-up
+    pb.write_bytes(b"gr")
+    with pytest.raises(ModelUnavailableError, match="has size 2"):
+        store.resolve("hear")
+    pb.unlink()
+    with pytest.raises(ModelUnavailableError, match="missing"):
+        store.resolve("hear")
+
+
+def test_register_hand_copied_artifact(tmp_path):
+    directory = tmp_path / "hear"
+    _write_artifact(str(directory), {"saved_model.pb": b"graph"})
+    store = ModelStore(root=str(tmp_path), artifacts=ARTIFACTS)
+
+    record = store.register("hear", str(directory))
+
+    assert record.revision == "local"
+    assert store.resolve("hear") == str(directory)
+
+
+def test_cli_verify_and_list(tmp_path, fake_hub, capsys):
+    with patch("src.models.model_store.MODEL_ARTIFACTS", ARTIFACTS):
+        main(["prefetch", "--root", str(tmp_path)])
+        main(["verify", "--root", str(tmp_path)])
+        main(["list", "--root", str(tmp_path)])
+        (tmp_path / "hear" / "saved_model.pb").write_bytes(b"GRAPH")
+        with pytest.raises(SystemExit):
+            main(["verify", "--root", str(tmp_path)])
+
+    out = capsys.readouterr().out
+    assert "✅ hear: intact" in out
+    assert "google/hear@abc123 (2 files" in out
+    assert "❌ hear: saved_model.pb checksum mismatch" in out
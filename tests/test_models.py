@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'mock
 import torch
 import numpy as np
 from src.models.hear_encoder import HeAREncoder
+from src.models.hear_backends import SavedModelBackend
 from src.models.medgemma import MedGemmaReasoning
 from src.datatypes import PatientVitals, TriageResult, TriageStatus
 
@@ -30,9 +31,22 @@ class TestModels(unittest.TestCase):
                 self.assertIsInstance(embedding, torch.Tensor)
                 self.assertEqual(embedding.shape, (1, 512))
                 
-                mock_load.assert_called_once()
+                # Only the analyzed window of long recordings is decoded
+                mock_load.assert_called_once_with("dummy.wav", sr=sr, duration=10)
                 mock_norm.assert_called_once()
 
+    def test_hear_encode_reuses_padding_buffer(self):
+        """Steady-state encodes of short clips pad into one pooled buffer."""
+        sr = 16000
+        short = np.random.uniform(-0.1, 0.1, sr * 5).astype(np.float32)
+        with unittest.mock.patch('src.models.hear_encoder.load_audio', return_value=(short, sr)):
+            for _ in range(3):
+                self.hear.encode("short.wav")
+            self.hear.encode_batch(["a.wav", "b.wav"])
+        
+        # One buffer for the sequential encodes, a second for the concurrent batch item
+        self.assertEqual(self.hear.buffer_pool.allocations, 2)
+
     def test_medgemma_generation(self):
         embedding = torch.randn(1, 512)
         vitals = PatientVitals(age_months=12, respiratory_rate=30)
@@ -41,3 +55,94 @@ class TestModels(unittest.TestCase):
         self.assertIsInstance(result, TriageResult)
         self.assertIsInstance(result.status, TriageStatus)
         self.assertGreater(result.confidence, 0.0)
+
+    def test_hear_encode_batch_single_inference_call(self):
+        """encode_batch should stack all chunks into one HeAR call and keep quality errors per item."""
+        from src.datatypes import LowQualityError
+        sr = 16000
+        good = np.random.uniform(-0.1, 0.1, sr * 10).astype(np.float32)
+        silent = np.zeros(sr * 10, dtype=np.float32)
+        waveforms = {"a.wav": good, "silent.wav": silent, "b.wav": good}
+        
+        self.hear.model = unittest.mock.MagicMock()
+        with unittest.mock.patch('src.models.hear_encoder.load_audio', side_effect=lambda p, sr, **kwargs: (waveforms[p], sr)), \
+             unittest.mock.patch.object(self.hear, '_infer_chunks', side_effect=lambda c: np.ones((len(c), 512), dtype=np.float32)) as mock_infer, \
+             unittest.mock.patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+            results = self.hear.encode_batch(["a.wav", "silent.wav", "b.wav"])
+        
+        mock_infer.assert_called_once()
+        self.assertEqual(mock_infer.call_args[0][0].shape, (10, 32000))
+        self.assertIsInstance(results[1], LowQualityError)
+        self.assertEqual(results[0].shape, (1, 512))
+
+    def _fake_serving(self):
+        """A fake HeAR serving signature that records each batch shape."""
+        calls = []
+
+        def infer(x):
+            calls.append(x.shape)
+            return {'output_0': unittest.mock.Mock(numpy=lambda: np.ones((x.shape[0], 512), dtype=np.float32))}
+
+        fake_tf = unittest.mock.MagicMock()
+        fake_tf.constant.side_effect = lambda value, dtype=None: np.asarray(value)
+        saved_model = unittest.mock.MagicMock()
+        saved_model.signatures = {"serving_default": infer}
+        self.hear.model = SavedModelBackend(model=saved_model)
+        return calls, fake_tf
+
+    def test_hear_encode_real_single_batched_call(self):
+        """A 10 s clip should reach HeAR as one (5, 32000) batch, not five (1, 32000) calls."""
+        calls, fake_tf = self._fake_serving()
+        waveform = np.random.uniform(-0.1, 0.1, 16000 * 10).astype(np.float32)
+        with unittest.mock.patch.dict(sys.modules, {'tensorflow': fake_tf}), \
+             unittest.mock.patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+            embedding = self.hear._encode_real(waveform, 16000)
+
+        self.assertEqual(calls, [(5, 32000)])
+        self.assertEqual(embedding.shape, (1, 512))
+
+    def test_hear_encode_skips_padding_chunks(self):
+        """A 3 s cough padded to 10 s should cost 2 HeAR chunks, pooled by valid samples."""
+        self._fake_serving()  # take the real-model path
+        sr = 16000
+        short = np.random.uniform(-0.1, 0.1, sr * 3).astype(np.float32)
+        captured = {}
+
+        def fake_infer(chunks):
+            captured['chunks'] = chunks
+            # Each chunk's embedding is filled with its chunk index
+            return np.repeat(np.arange(len(chunks), dtype=np.float32)[:, None], 512, axis=1)
+
+        with unittest.mock.patch('src.models.hear_encoder.load_audio', return_value=(short, sr)), \
+             unittest.mock.patch.object(self.hear, '_infer_chunks', side_effect=fake_infer), \
+             unittest.mock.patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: unittest.mock.Mock(float=lambda: a)):
+            embedding = self.hear.encode("cough.wav")
+
+        self.assertEqual(captured['chunks'].shape, (2, 32000))
+        # Chunk 0 holds 2 s of audio, chunk 1 holds 1 s: weighted mean = (0*2 + 1*1) / 3
+        np.testing.assert_allclose(embedding, np.full((1, 512), 1 / 3), rtol=1e-6)
+
+    def test_hear_segment_valid_detects_trailing_padding(self):
+        sr = 16000
+        waveform = np.zeros(sr * 10, dtype=np.float32)
+        waveform[:sr * 5] = 0.05
+        segments = self.hear._segment_valid(waveform, sr)
+        self.assertEqual(segments.as_array().shape, (3, 32000))
+        np.testing.assert_array_equal(segments.valid, [32000, 32000, 16000])
+
+        segments = self.hear._segment_valid(np.zeros(sr * 10, dtype=np.float32), sr)
+        self.assertEqual(segments.as_array().shape, (1, 32000))
+
+    def test_hear_infer_chunks_respects_max_batch_size(self):
+        calls, fake_tf = self._fake_serving()
+        self.hear.max_batch_size = 2
+        with unittest.mock.patch.dict(sys.modules, {'tensorflow': fake_tf}):
+            embeddings = self.hear._infer_chunks(np.zeros((5, 32000), dtype=np.float32))
+
+        self.assertEqual(calls, [(2, 32000), (2, 32000), (1, 32000)])
+        self.assertEqual(embeddings.shape, (5, 512))
+
+    def test_medgemma_generate_batch_mock(self):
+        vitals = [PatientVitals(age_months=12, respiratory_rate=30), PatientVitals(age_months=12, respiratory_rate=60)]
+        results = self.medgemma.generate_batch([torch.randn(1, 512), torch.randn(1, 512)], vitals)
+        self.assertEqual([r.status for r in results], [TriageStatus.GREEN, TriageStatus.YELLOW])
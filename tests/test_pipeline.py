@@ -0,0 +1,138 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+import numpy as np
+import torch
+
+from src.agent.core import AuraMedAgent
+from src.agent.pipeline import PipelinedTriageRunner, STAGES
+from src.agent.deadline import Deadline
+from src.datatypes import PatientVitals, TriageResult, TriageStatus, LowQualityError
+from src.models.embedding_cache import EmbeddingCache
+from src.models.hear_encoder import HeAREncoder, DecodedRecording
+
+
+@pytest.fixture
+def vitals():
+    return PatientVitals(age_months=18, respiratory_rate=45, danger_signs=False)
+
+
+def _make_reasoning(events):
+    reasoning = Mock()
+    reasoning.build_prompt.return_value = "prompt"
+
+    def slow_generate(prompt, v):
+        events.append(("generate_start", None))
+        time.sleep(0.05)
+        events.append(("generate_end", None))
+        return TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing.")
+
+    reasoning.generate_from_prompt.side_effect = slow_generate
+    return reasoning
+
+
+def _make_agent(events=None, decode=None):
+    events = events if events is not None else []
+    encoder = Mock()
+
+    def default_decode(path):
+        events.append(("decode", path))
+        return DecodedRecording(waveform=np.zeros(16000, dtype=np.float32), sample_rate=16000)
+
+    encoder.decode.side_effect = decode or default_decode
+    encoder.embed_decoded.return_value = torch.randn(1, 512)
+    return AuraMedAgent(hear_encoder=encoder, medgemma_reasoning=_make_reasoning(events))
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_run_returns_results_in_order(mock_exists, vitals):
+    agent = _make_agent()
+    results = PipelinedTriageRunner(agent).run([(f"{i}.wav", vitals) for i in range(4)])
+
+    assert len(results) == 4
+    for result in results:
+        assert result.status == TriageStatus.YELLOW
+        assert result.action_recommendation == "Administer oral Amoxicillin. Follow up in 48 hours."
+        assert "latency_sec" in result.usage_stats
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_next_request_decoded_while_previous_generates(mock_exists, vitals):
+    """Request k+1 should be decoded before request k finishes generating."""
+    events = []
+    agent = _make_agent(events=events)
+    PipelinedTriageRunner(agent).run([("0.wav", vitals), ("1.wav", vitals)])
+
+    first_generate_end = events.index(("generate_end", None))
+    assert events.index(("decode", "1.wav")) < first_generate_end
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_overrides_and_quality_errors_pass_through(mock_exists, vitals):
+    def decode(path):
+        if "bad" in path:
+            raise LowQualityError("Audio too short")
+        return DecodedRecording(waveform=np.zeros(16000, dtype=np.float32), sample_rate=16000)
+
+    agent = _make_agent(decode=decode)
+    danger = PatientVitals(age_months=12, respiratory_rate=40, danger_signs=True)
+    results = PipelinedTriageRunner(agent).run([
+        ("danger.wav", danger), ("bad.wav", vitals), ("ok.wav", vitals)
+    ])
+
+    assert [r.status for r in results] == [TriageStatus.RED, TriageStatus.INCONCLUSIVE, TriageStatus.YELLOW]
+    assert agent.medgemma_reasoning.generate_from_prompt.call_count == 1
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_stage_failure_wrapped_and_stats_reported(mock_exists, vitals):
+    agent = _make_agent()
+    agent.hear_encoder.embed_decoded.side_effect = ValueError("TF crashed")
+
+    with PipelinedTriageRunner(agent, queue_size=1) as runner:
+        with pytest.raises(RuntimeError, match="Stage 'encode' failed"):
+            runner.submit("a.wav", vitals).result(timeout=5)
+        stats = runner.stats()
+
+    assert set(stats) == set(STAGES)
+    assert stats["decode"]["processed"] == 1
+    assert stats["generate"]["processed"] == 0
+    for stage in stats.values():
+        assert 0.0 <= stage["utilisation"] <= 1.0
+        assert "queue_depth" in stage
+
+
+def test_stages_use_encoder_cache_and_valid_samples(vitals):
+    encoder = HeAREncoder(cache=EmbeddingCache())
+    agent = AuraMedAgent(hear_encoder=encoder, medgemma_reasoning=_make_reasoning([]))
+    audio = (np.random.default_rng(0).normal(0, 0.02, 16000 * 5).astype(np.float32), 16000)
+
+    with patch.object(encoder, 'embed', wraps=encoder.embed) as embed:
+        with PipelinedTriageRunner(agent) as runner:
+            runner.run([(audio, vitals)])
+            runner.run([(audio, vitals)])
+
+    # Second request is served from the cache; the first pools only real audio
+    assert embed.call_count == 1
+    assert embed.call_args[0][2] == 16000 * 5
+    assert encoder.cache.stats()["hits"] == 1
+    assert len(encoder.buffer_pool._leased) == 0
+
+
+@patch('src.agent.core.os.path.exists', return_value=True)
+def test_each_job_runs_under_its_own_deadline(mock_exists, vitals):
+    agent = _make_agent()
+    seen = []
+
+    def generate(prompt, v):
+        seen.append(Deadline.current())
+        return TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing.")
+
+    agent.medgemma_reasoning.generate_from_prompt.side_effect = generate
+    results = PipelinedTriageRunner(agent).run([("a.wav", vitals), ("b.wav", vitals)])
+
+    assert len(seen) == 2 and all(deadline is not None for deadline in seen)
+    assert seen[0] is not seen[1]
+    assert all("stage_classifier_sec" in result.usage_stats for result in results)
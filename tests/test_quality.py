@@ -5,6 +5,10 @@ import torch
 from src.models.hear_encoder import HeAREncoder
 from src.agent.core import AuraMedAgent
 from src.datatypes import PatientVitals, TriageStatus, LowQualityError
+from src.utils.quality import analyze_chunk, analyze_segments, analyze_waveform
+from src.utils.segmentation import frame_windows
+
+SR = 16000
 
 def test_hear_encoder_raises_low_quality_for_noisy_audio():
     """AC 1 & 3: HeAREncoder should raise LowQualityError if audio is too noisy."""
@@ -52,3 +56,103 @@ def test_agent_returns_inconclusive_on_low_quality():
     
     # AC 6: MedGemma should be bypassed
     mock_medgemma.generate.assert_not_called()
+
+
+# --- Per-chunk quality analyzer ---
+
+
+def _clipped_sine(seconds, amplitude=1.2):
+    t = np.arange(int(SR * seconds)) / SR
+    return np.clip(amplitude * np.sin(2 * np.pi * 220 * t), -1.0, 1.0).astype(np.float32)
+
+
+def test_analyze_chunk_statistics():
+    rng = np.random.default_rng(0)
+    chunk = rng.uniform(-0.5, 0.5, SR * 2).astype(np.float32)
+    stats = analyze_chunk(chunk)
+
+    assert stats["rms"] == pytest.approx(np.sqrt(np.mean(chunk.astype(np.float64) ** 2)), rel=1e-5)
+    assert stats["peak"] == pytest.approx(np.max(np.abs(chunk)))
+    assert stats["clipping_ratio"] == 0.0
+    # Stationary noise: flat frame energies, no loud-vs-quiet contrast
+    assert stats["snr_db"] < 2.0
+
+
+def test_clipping_separates_distortion_from_loud_cough():
+    clipped = analyze_chunk(_clipped_sine(2.0))
+    # A loud burst that stays below full scale
+    cough = np.zeros(SR * 2, dtype=np.float32)
+    cough[8000:12000] = 0.95 * np.sin(np.linspace(0, 400 * np.pi, 4000))
+    loud = analyze_chunk(cough)
+
+    assert clipped["clipping_ratio"] > 0.3
+    assert loud["clipping_ratio"] == 0.0
+    assert loud["peak"] == pytest.approx(0.95, abs=1e-3)
+    # Burst over silence: high frame-energy variance and contrast
+    assert loud["energy_var_db"] > clipped["energy_var_db"]
+    assert loud["snr_db"] > 20
+
+
+def test_analyze_waveform_matches_single_pass():
+    rng = np.random.default_rng(1)
+    waveform = rng.uniform(-0.3, 0.3, SR * 7).astype(np.float32)
+    np.testing.assert_allclose(
+        list(analyze_waveform(waveform).values()), list(analyze_chunk(waveform).values()), rtol=1e-5
+    )
+
+
+def test_analyze_segments_flags_bad_chunks():
+    rng = np.random.default_rng(2)
+    waveform = np.concatenate([
+        rng.uniform(-0.1, 0.1, SR * 2),   # ok
+        _clipped_sine(2.0),              # clipped
+        np.zeros(SR * 2),                 # silent
+        rng.uniform(-0.1, 0.1, SR),       # ok partial tail
+    ]).astype(np.float32)
+    quality = analyze_segments(frame_windows(waveform, SR * 2))
+
+    np.testing.assert_array_equal(quality.usable, [True, False, False, True])
+    np.testing.assert_array_equal(quality.distorted, [False, True, False, False])
+    np.testing.assert_array_equal(quality.too_silent, [False, False, True, False])
+
+
+def _real_encoder():
+    encoder = HeAREncoder()
+    encoder.model = object()  # pretend the real model is loaded
+    return encoder
+
+
+def test_encoder_drops_bad_chunks_before_hear():
+    encoder = _real_encoder()
+    rng = np.random.default_rng(3)
+    waveform = np.concatenate([_clipped_sine(2.0), rng.uniform(-0.1, 0.1, SR * 8)]).astype(np.float32)
+    with patch.object(encoder, '_infer_chunks', side_effect=lambda c: np.ones((len(c), 512), dtype=np.float32)) as mock_infer, \
+         patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+        embedding = encoder.embed(waveform, SR)
+
+    assert embedding.shape == (1, 512)
+    assert mock_infer.call_args[0][0].shape == (4, 32000)
+
+
+def test_encoder_rejects_recording_without_usable_chunks():
+    encoder = _real_encoder()
+    with patch.object(encoder, '_infer_chunks') as mock_infer:
+        with pytest.raises(LowQualityError, match="too noisy or distorted"):
+            encoder.embed(_clipped_sine(10.0), SR)
+    mock_infer.assert_not_called()
+
+
+def test_encode_batch_keeps_per_chunk_rejection_per_item():
+    encoder = _real_encoder()
+    rng = np.random.default_rng(4)
+    good = rng.uniform(-0.1, 0.1, SR * 10).astype(np.float32)
+    # Passes the global RMS gate, but every chunk is clipped
+    clipped = _clipped_sine(10.0)
+    with patch('src.models.hear_encoder.load_audio', side_effect=[(good, SR), (clipped, SR)]), \
+         patch.object(encoder, '_infer_chunks', side_effect=lambda c: np.ones((len(c), 512), dtype=np.float32)) as mock_infer, \
+         patch('src.models.hear_encoder.torch.from_numpy', side_effect=lambda a: torch.Tensor(a.shape)):
+        results = encoder.encode_batch(["good.wav", "clipped.wav"])
+
+    assert results[0].shape == (1, 512)
+    assert isinstance(results[1], LowQualityError)
+    assert mock_infer.call_args[0][0].shape == (5, 32000)
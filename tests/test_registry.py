@@ -0,0 +1,139 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.agent.core import AuraMedAgent
+from src.models.hear_encoder import HeAREncoder
+from src.models.registry import ModelRegistry, get_model_registry
+
+
+def _counting_factory(counter, delay=0.0):
+    def factory(registry):
+        counter.append(1)
+        time.sleep(delay)
+        return MagicMock()
+    return factory
+
+
+def test_models_load_lazily_and_once():
+    loads = {"hear": [], "medgemma": []}
+    registry = ModelRegistry(factories={
+        "hear": _counting_factory(loads["hear"]),
+        "medgemma": _counting_factory(loads["medgemma"]),
+    })
+
+    assert not registry.is_loaded("hear")
+    agents = [AuraMedAgent(registry=registry) for _ in range(3)]
+
+    assert len(loads["hear"]) == 1
+    assert len(loads["medgemma"]) == 1
+    assert all(agent.hear_encoder is agents[0].hear_encoder for agent in agents)
+    assert all(agent.medgemma_reasoning is agents[0].medgemma_reasoning for agent in agents)
+
+
+def test_concurrent_first_use_loads_once():
+    loads = []
+    registry = ModelRegistry(factories={"hear": _counting_factory(loads, delay=0.05)})
+    handles = []
+    threads = [threading.Thread(target=lambda: handles.append(registry.get("hear"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+    assert all(h is handles[0] for h in handles)
+
+
+def test_injected_components_take_precedence():
+    registry = ModelRegistry(factories={"hear": _counting_factory([]), "medgemma": _counting_factory([])})
+    encoder = MagicMock()
+    agent = AuraMedAgent(hear_encoder=encoder, registry=registry)
+    assert agent.hear_encoder is encoder
+    assert not registry.is_loaded("hear")
+
+
+def test_default_medgemma_shares_classifier_and_projection():
+    registry = ModelRegistry()
+    reasoning = registry.medgemma_reasoning()
+    assert reasoning.classifier is registry.classifier()
+    assert reasoning.projection is registry.projection()
+
+
+def test_warmup_and_unload():
+    loads = []
+    hear = MagicMock(warmup_stats={})
+    registry = ModelRegistry(factories={"hear": lambda r: (loads.append(1), hear)[1]})
+
+    timings = registry.warmup(["hear"])
+    assert "hear" in timings
+    hear.warmup.assert_called_once()
+
+    registry.unload(["hear"])
+    assert not registry.is_loaded("hear")
+    registry.get("hear")
+    assert len(loads) == 2
+
+
+class _FakeBackend:
+    revision = "fake"
+
+    def __init__(self):
+        self.shapes = []
+
+    def prepare(self, batch_sizes):
+        pass
+
+    def infer(self, chunks):
+        self.shapes.append(chunks.shape)
+        return np.zeros((len(chunks), 512), dtype=np.float32)
+
+
+def test_warmup_with_loaded_backend_bypasses_quality_gate():
+    backend = _FakeBackend()
+    registry = ModelRegistry(factories={"hear": lambda r: HeAREncoder(backend=backend, max_batch_size=4)})
+    with patch("src.models.hear_encoder.HEAR_WARMUP_AT_LOAD", False):
+        encoder = registry.hear_encoder()
+    assert backend.shapes == []
+
+    # Silent warmup input would be rejected by the gate if it went through embed()
+    timings = registry.warmup(["hear"])
+
+    assert "hear" in timings
+    assert {shape[0] for shape in backend.shapes} == set(encoder.batch_buckets)
+
+
+def test_warmup_does_not_repeat_warmup_at_load():
+    backend = _FakeBackend()
+    registry = ModelRegistry(factories={"hear": lambda r: HeAREncoder(backend=backend, max_batch_size=4)})
+    encoder = registry.hear_encoder()
+    swept = len(backend.shapes)
+    assert encoder.warmup_stats
+
+    registry.warmup(["hear"])
+    assert len(backend.shapes) == swept
+
+
+def test_deferred_warmup_skips_hear_warmup_at_load():
+    registry = ModelRegistry()
+    registry.defer_warmup = True
+    with patch("src.models.registry.HeAREncoder") as encoder_cls, \
+         patch("src.models.registry.EmbeddingCache"):
+        registry.get("hear")
+    assert encoder_cls.call_args.kwargs["warmup_at_load"] is False
+
+    backend = _FakeBackend()
+    HeAREncoder(backend=backend, max_batch_size=4, warmup_at_load=False)
+    assert backend.shapes == []
+
+
+def test_unknown_model_raises():
+    with pytest.raises(KeyError, match="Unknown model"):
+        ModelRegistry().get("whisper")
+
+
+def test_default_registry_is_process_wide():
+    assert get_model_registry() is get_model_registry()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.utils.resample import PolyphaseResampler, get_resampler, resample
+
+
+def _tone(freq, sr, seconds=1.0):
+    return np.sin(2 * np.pi * freq * np.arange(int(sr * seconds)) / sr).astype(np.float32)
+
+
+@pytest.mark.parametrize("orig_sr", [44100, 10000, 4000, 48000, 8000])
+def test_tone_preserved_for_icbhi_and_phone_rates(orig_sr):
+    out = resample(_tone(440, orig_sr), orig_sr, 16000)
+
+    assert out.dtype == np.float32
+    assert len(out) == 16000
+    # Edges see the zero padding; the interior must match the ideal tone
+    np.testing.assert_allclose(out[200:-200], _tone(440, 16000)[200:-200], atol=2e-3)
+
+
+def test_content_above_target_nyquist_is_removed():
+    out = resample(_tone(10000, 44100), 44100, 16000)
+    assert np.sqrt(np.mean(out[200:-200] ** 2)) < 0.01
+
+
+def test_filter_bank_designed_once_per_rate_pair():
+    assert get_resampler(44100) is get_resampler(44100, 16000)
+    # Fresh instances with default settings share the cached bank
+    assert PolyphaseResampler(44100).bank is get_resampler(44100).bank
+    assert get_resampler(44100).bank.shape[0] == 160  # 44100 -> 16000 is up 160 / down 441
+
+
+def test_writes_into_preallocated_buffer():
+    audio = _tone(440, 44100)
+    buffer = np.full(20000, -1.0, dtype=np.float32)
+
+    out = resample(audio, 44100, 16000, out=buffer)
+
+    assert out.base is buffer and len(out) == 16000
+    np.testing.assert_array_equal(out, resample(audio, 44100, 16000))
+    assert np.all(buffer[16000:] == -1.0)
+    with pytest.raises(ValueError):
+        resample(audio, 44100, 16000, out=np.empty(100, dtype=np.float32))
+
+
+def test_block_size_does_not_change_output():
+    audio = np.random.default_rng(0).normal(size=22050).astype(np.float32)
+    np.testing.assert_allclose(
+        PolyphaseResampler(22050, block_frames=7)(audio),
+        PolyphaseResampler(22050)(audio),
+        atol=1e-6
+    )
+
+
+def test_same_rate_and_empty_input():
+    audio = _tone(440, 16000, 0.1)
+    np.testing.assert_array_equal(resample(audio, 16000, 16000), audio)
+    assert resample(np.zeros(0, dtype=np.float32), 44100).shape == (0,)
+    with pytest.raises(ValueError):
+        PolyphaseResampler(0)
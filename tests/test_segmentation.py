@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from src.utils.segmentation import frame_windows, pool_embeddings
+
+
+def _legacy_segment(waveform, chunk):
+    """The list + np.pad segmentation the encoder used before."""
+    chunks = []
+    for i in range(0, len(waveform), chunk):
+        piece = waveform[i:i + chunk]
+        if len(piece) < chunk:
+            piece = np.pad(piece, (0, chunk - len(piece)), mode='constant')
+        chunks.append(piece)
+    return np.array(chunks, dtype=np.float32)
+
+
+@pytest.mark.parametrize("length", [10, 32, 33, 100, 128])
+def test_matches_legacy_segmentation(length):
+    waveform = np.arange(1, length + 1, dtype=np.float32)
+    segments = frame_windows(waveform, 32)
+    np.testing.assert_array_equal(segments.as_array(), _legacy_segment(waveform, 32))
+
+
+def test_full_windows_are_views():
+    waveform = np.arange(128, dtype=np.float32)
+    segments = frame_windows(waveform, 32)
+    assert segments.tail is None
+    assert np.shares_memory(segments.full, waveform)
+    assert segments.as_array() is segments.full
+
+
+def test_tail_is_padded_and_counted():
+    segments = frame_windows(np.ones(80, dtype=np.float32), 32)
+    assert len(segments) == 3
+    np.testing.assert_array_equal(segments.valid, [32, 32, 16])
+    np.testing.assert_array_equal(segments.tail, np.r_[np.ones(16), np.zeros(16)])
+
+
+def test_overlapping_windows():
+    waveform = np.arange(100, dtype=np.float32)
+    segments = frame_windows(waveform, 40, hop=20)
+    windows = segments.as_array()
+    # Full windows start at 0, 20, 40, 60 and cover all 100 samples
+    assert [w[0] for w in windows] == [0, 20, 40, 60]
+    assert segments.tail is None
+
+    segments = frame_windows(np.arange(110, dtype=np.float32), 40, hop=20)
+    np.testing.assert_array_equal(segments.valid, [40, 40, 40, 40, 30])
+    assert segments.tail[0] == 80
+
+
+def test_valid_samples_drops_padding():
+    waveform = np.r_[np.ones(50), np.zeros(78)].astype(np.float32)
+    segments = frame_windows(waveform, 32, valid_samples=50)
+    np.testing.assert_array_equal(segments.valid, [32, 18])
+
+
+def test_short_or_empty_input_yields_one_window():
+    segments = frame_windows(np.zeros(0, dtype=np.float32), 32)
+    assert segments.as_array().shape == (1, 32)
+    np.testing.assert_array_equal(segments.valid, [0])
+
+
+def test_select_keeps_view_or_drops_windows():
+    waveform = np.arange(80, dtype=np.float32)
+    segments = frame_windows(waveform, 32)
+    assert segments.select([True, True, True]) is segments
+
+    kept = segments.select([False, True, False])
+    np.testing.assert_array_equal(kept.as_array(), [waveform[32:64]])
+    np.testing.assert_array_equal(kept.valid, [32])
+    assert kept.tail is None
+
+
+def test_energies():
+    waveform = np.r_[np.full(32, 2.0), np.full(16, 1.0)].astype(np.float32)
+    np.testing.assert_allclose(frame_windows(waveform, 32).energies(), [128.0, 16.0])
+
+
+class TestPooling:
+    embeddings = np.array([[0.0, 4.0], [3.0, 1.0]], dtype=np.float32)
+
+    def test_mean_weighted_by_valid_samples(self):
+        pooled = pool_embeddings(self.embeddings, np.array([30, 10]), "mean")
+        np.testing.assert_allclose(pooled, [[0.75, 3.25]])
+
+    def test_max(self):
+        np.testing.assert_allclose(pool_embeddings(self.embeddings, np.array([1, 1]), "max"), [[3.0, 4.0]])
+
+    def test_energy(self):
+        pooled = pool_embeddings(self.embeddings, np.array([1, 1]), "energy", energies=np.array([1.0, 3.0]))
+        np.testing.assert_allclose(pooled, [[2.25, 1.75]])
+
+    def test_energy_requires_energies(self):
+        with pytest.raises(ValueError):
+            pool_embeddings(self.embeddings, np.array([1, 1]), "energy")
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            pool_embeddings(self.embeddings, np.array([1, 1]), "median")
@@ -0,0 +1,192 @@
+import json
+import base64
+import threading
+import urllib.request
+import urllib.error
+import pytest
+from unittest.mock import Mock
+
+from src.agent.core import AuraMedAgent
+from src.serve import MicroBatcher, create_server
+from src.datatypes import PatientVitals, TriageResult, TriageStatus, TriagePath
+
+VITALS = {"age_months": 18, "respiratory_rate": 45}
+
+
+def _make_agent(batch_sizes):
+    agent = AuraMedAgent(hear_encoder=Mock(), medgemma_reasoning=Mock())
+
+    def predict_batch(requests):
+        batch_sizes.append(len(requests))
+        return [
+            TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing.",
+                         usage_stats={"latency_sec": 0.01}, triage_path=TriagePath.LLM)
+            for _ in requests
+        ]
+
+    agent.predict_batch = Mock(side_effect=predict_batch)
+    return agent
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "a.wav"
+    path.write_bytes(b"RIFF")
+    return str(path)
+
+
+@pytest.fixture
+def server():
+    batch_sizes = []
+    server = create_server(_make_agent(batch_sizes), host="127.0.0.1", port=0, max_batch_size=4, max_wait_ms=200)
+    server.batch_sizes = batch_sizes
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def _post(server, path, body, content_type):
+    request = urllib.request.Request(_url(server, path), data=body, headers={"Content-Type": content_type})
+    return urllib.request.urlopen(request, timeout=10)
+
+
+class TestMicroBatcher:
+    def test_concurrent_requests_share_a_batch(self, audio_file):
+        batch_sizes = []
+        batcher = MicroBatcher(_make_agent(batch_sizes), max_batch_size=4, max_wait_ms=500)
+        batcher.start()
+        vitals = PatientVitals(**VITALS)
+        futures = [batcher.submit(audio_file, vitals) for _ in range(4)]
+        outcomes = [future.result(timeout=5) for future in futures]
+        batcher.close()
+
+        assert batch_sizes == [4]
+        for result, timing in outcomes:
+            assert result.status == TriageStatus.YELLOW
+            assert timing.batch_size == 4
+
+    def test_batch_size_is_bounded(self, audio_file):
+        batch_sizes = []
+        batcher = MicroBatcher(_make_agent(batch_sizes), max_batch_size=2, max_wait_ms=500)
+        batcher.start()
+        vitals = PatientVitals(**VITALS)
+        futures = [batcher.submit(audio_file, vitals) for _ in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+        batcher.close()
+
+        assert max(batch_sizes) <= 2
+        assert sum(batch_sizes) == 5
+
+    def test_lone_request_dispatched_after_wait_window(self, audio_file):
+        batch_sizes = []
+        batcher = MicroBatcher(_make_agent(batch_sizes), max_batch_size=8, max_wait_ms=10)
+        batcher.start()
+        result, timing = batcher.submit(audio_file, PatientVitals(**VITALS)).result(timeout=5)
+        batcher.close()
+
+        assert batch_sizes == [1]
+        assert timing.batch_size == 1
+
+    def test_invalid_request_fails_alone(self):
+        batcher = MicroBatcher(_make_agent([]))
+        batcher.start()
+        with pytest.raises(FileNotFoundError):
+            batcher.submit("/nonexistent/file.wav", PatientVitals(**VITALS))
+        batcher.close()
+
+    def test_batch_failure_isolated_to_failing_request(self, audio_file, tmp_path):
+        garbage = tmp_path / "garbage.wav"
+        garbage.write_bytes(b"not audio")
+        agent = _make_agent([])
+        agent.predict_batch.side_effect = RuntimeError("AuraMedAgent: Batch pipeline execution failed: boom")
+
+        def predict(audio, vitals):
+            if audio == str(garbage):
+                raise RuntimeError("AuraMedAgent: Pipeline execution failed: undecodable")
+            return TriageResult(TriageStatus.YELLOW, 0.8, "Fast breathing.", triage_path=TriagePath.LLM)
+
+        agent.predict = Mock(side_effect=predict)
+        batcher = MicroBatcher(agent, max_batch_size=2, max_wait_ms=500)
+        batcher.start()
+        good = batcher.submit(audio_file, PatientVitals(**VITALS))
+        bad = batcher.submit(str(garbage), PatientVitals(**VITALS))
+
+        result, timing = good.result(timeout=5)
+        assert result.status == TriageStatus.YELLOW
+        assert timing.batch_size == 2
+        with pytest.raises(RuntimeError, match="undecodable"):
+            bad.result(timeout=5)
+        batcher.close()
+        assert agent.predict.call_count == 2
+
+    def test_lone_request_failure_not_retried(self, audio_file):
+        agent = _make_agent([])
+        agent.predict_batch.side_effect = RuntimeError("boom")
+        agent.predict = Mock()
+        batcher = MicroBatcher(agent, max_batch_size=1)
+        batcher.start()
+        with pytest.raises(RuntimeError, match="boom"):
+            batcher.submit(audio_file, PatientVitals(**VITALS)).result(timeout=5)
+        batcher.close()
+        agent.predict.assert_not_called()
+
+
+class TestTriageServer:
+    def test_json_request(self, server):
+        body = json.dumps({"audio_b64": base64.b64encode(b"RIFF").decode(), "vitals": VITALS}).encode()
+        response = _post(server, "/triage", body, "application/json")
+        payload = json.loads(response.read())
+
+        assert response.status == 200
+        assert payload["status"] == "YELLOW"
+        assert payload["triage_path"] == "LLM"
+        assert response.headers["X-Batch-Size"] == "1"
+        for header in ("X-Queue-Wait-Ms", "X-Inference-Ms", "X-Total-Ms", "Server-Timing"):
+            assert header in response.headers
+
+    def test_raw_audio_request_with_query_vitals(self, server):
+        response = _post(server, "/triage?age_months=18&respiratory_rate=45", b"RIFF", "audio/wav")
+        assert response.status == 200
+        assert json.loads(response.read())["status"] == "YELLOW"
+
+    def test_uploaded_audio_passed_in_memory(self, server):
+        body = json.dumps({"audio_b64": base64.b64encode(b"RIFF....WAVE").decode(), "vitals": VITALS}).encode()
+        _post(server, "/triage", body, "application/json").read()
+
+        (requests,), _ = server.batcher.agent.predict_batch.call_args
+        assert requests[0][0] == b"RIFF....WAVE"
+
+    def test_invalid_vitals_rejected(self, server):
+        body = json.dumps({"audio_b64": base64.b64encode(b"RIFF").decode(), "vitals": {"age_months": -1}}).encode()
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(server, "/triage", body, "application/json")
+        assert exc.value.code == 400
+
+    def test_unsupported_content_type_rejected(self, server):
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(server, "/triage", b"hello", "text/plain")
+        assert exc.value.code == 400
+
+    @pytest.mark.parametrize("length", ["abc", "-5"])
+    def test_invalid_content_length_rejected(self, server, length):
+        request = urllib.request.Request(
+            _url(server, "/triage"), data=b"RIFF",
+            headers={"Content-Type": "audio/wav", "Content-Length": length}
+        )
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(request, timeout=10)
+        assert exc.value.code == 400
+        assert json.loads(exc.value.read())["error"] == "Invalid Content-Length"
+
+    def test_health(self, server):
+        response = urllib.request.urlopen(_url(server, "/health"), timeout=5)
+        payload = json.loads(response.read())
+        assert payload["status"] == "ok"
+        assert "mean_batch_size" in payload["batching"]
@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.utils.shard_store import ShardedRowStore
+
+
+class _Owner:
+    """Minimal owner: one record per run of rows."""
+
+    def __init__(self, root, shard_rows=3):
+        self.records = []
+        self.rows = ShardedRowStore(str(root), dim=2, shard_rows=shard_rows, on_record=self._on_record)
+
+    def _on_record(self, record):
+        self.records.append(record)
+        return record["row"] + record["count"]
+
+    def append(self, rows):
+        with self.rows.writing():
+            return self.rows.append(rows, lambda row: {"row": row, "count": len(rows)})
+
+
+def _rows(start, count):
+    return np.arange(start * 2, (start + count) * 2, dtype=np.float32).reshape(count, 2)
+
+
+def test_append_spans_shards_and_reads_back(tmp_path):
+    owner = _Owner(tmp_path)
+    assert owner.append(_rows(0, 2)) == {"row": 0, "count": 2}
+    assert owner.append(_rows(2, 5)) == {"row": 2, "count": 5}   # shards 0, 1 and 2
+
+    assert len(owner.rows) == 7
+    assert sorted(p.name for p in tmp_path.glob("shard_*.npy")) == [
+        "shard_00000.npy", "shard_00001.npy", "shard_00002.npy"
+    ]
+    np.testing.assert_array_equal(owner.rows.read_range(1, 7), _rows(1, 6))
+    np.testing.assert_array_equal(owner.rows.read_rows([6, 0, 3]), _rows(0, 7)[[6, 0, 3]])
+    with pytest.raises(IndexError):
+        owner.rows.read_rows([7])
+
+
+def test_refresh_reads_only_new_complete_lines(tmp_path):
+    writer, reader = _Owner(tmp_path), _Owner(tmp_path)
+    writer.append(_rows(0, 2))
+    assert reader.rows.refresh() == 1
+    assert reader.rows.refresh() == 0
+
+    # A half-written line is left for later, then skipped once terminated
+    with open(tmp_path / ShardedRowStore.INDEX_FILE, "a") as f:
+        f.write('{"row": 2, "cou')
+    assert reader.rows.refresh() == 0
+    writer.append(_rows(2, 1))
+    assert reader.rows.refresh() == 1
+    assert reader.records == [{"row": 0, "count": 2}, {"row": 2, "count": 1}]
+    lines = (tmp_path / ShardedRowStore.INDEX_FILE).read_text().splitlines()
+    assert json.loads(lines[-1]) == {"row": 2, "count": 1}
+
+
+def test_shard_rows_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        _Owner(tmp_path, shard_rows=0)
@@ -0,0 +1,170 @@
+import os
+import time
+import signal
+import threading
+import pytest
+
+import torch
+
+from src.agent.worker_pool import TriageWorkerPool
+from src.models.registry import ModelRegistry, HEAR, MEDGEMMA
+from src.datatypes import PatientVitals, TriageResult, TriageStatus
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="TriageWorkerPool requires fork")
+
+
+class _FakeEncoder:
+    warmup_stats = {}
+
+    def warmup(self):
+        return {}
+
+    def encode(self, audio_path):
+        if "crash" in audio_path:
+            os._exit(1)
+        if "hang" in audio_path:
+            time.sleep(60)
+        return torch.randn(1, 512)
+
+
+class _FakeReasoning:
+    def generate(self, embedding, vitals):
+        return TriageResult(TriageStatus.YELLOW, 0.8, f"pid={os.getpid()}")
+
+
+@pytest.fixture
+def registry():
+    return ModelRegistry(factories={
+        HEAR: lambda registry: _FakeEncoder(),
+        MEDGEMMA: lambda registry: _FakeReasoning(),
+    })
+
+
+@pytest.fixture
+def vitals():
+    return PatientVitals(age_months=18, respiratory_rate=45, danger_signs=False)
+
+
+@pytest.fixture
+def audio_files(tmp_path):
+    paths = []
+    for name in ("a.wav", "b.wav", "c.wav", "d.wav", "hang.wav", "crash.wav"):
+        path = tmp_path / name
+        path.write_bytes(b"RIFF")
+        paths.append(str(path))
+    return paths
+
+
+def test_models_loaded_once_in_zygote(tmp_path, vitals, audio_files):
+    loads = tmp_path / "loads.txt"
+
+    def load_encoder(registry):
+        # The zygote loads without running inference
+        assert registry.defer_warmup
+        with open(loads, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        return _FakeEncoder()
+
+    registry = ModelRegistry(factories={HEAR: load_encoder, MEDGEMMA: lambda registry: _FakeReasoning()})
+    with TriageWorkerPool(num_workers=2, registry=registry, preload=(HEAR, MEDGEMMA)) as pool:
+        pool.map([(path, vitals) for path in audio_files[:4]])
+        worker_pids = {stats["pid"] for stats in pool.telemetry().values()}
+
+    # Loaded by neither the parent nor the workers, which inherit it
+    pids = loads.read_text().split()
+    assert len(pids) == 1
+    assert int(pids[0]) != os.getpid()
+    assert int(pids[0]) not in worker_pids
+    assert not registry.is_loaded(HEAR)
+
+
+def test_map_returns_results_in_order(registry, vitals, audio_files):
+    with TriageWorkerPool(num_workers=2, registry=registry, preload=(HEAR, MEDGEMMA)) as pool:
+        results = pool.map([(path, vitals) for path in audio_files[:4]])
+        telemetry = pool.telemetry()
+
+    assert len(results) == 4
+    for result in results:
+        assert result.status == TriageStatus.YELLOW
+        assert result.action_recommendation == "Administer oral Amoxicillin. Follow up in 48 hours."
+        # Served by a worker, not the parent
+        assert result.reasoning != f"pid={os.getpid()}"
+
+    assert sum(stats["jobs"] for stats in telemetry.values()) == 4
+    assert all(stats["alive"] for stats in telemetry.values())
+
+
+def test_safety_override_handled_by_worker(registry, audio_files):
+    danger = PatientVitals(age_months=18, respiratory_rate=45, danger_signs=True)
+    with TriageWorkerPool(num_workers=1, registry=registry, preload=(HEAR, MEDGEMMA)) as pool:
+        result = pool.submit(audio_files[0], danger).result(timeout=10)
+    assert result.status == TriageStatus.RED
+
+
+def test_worker_errors_propagate(registry, vitals):
+    with TriageWorkerPool(num_workers=1, registry=registry, preload=(HEAR, MEDGEMMA)) as pool:
+        with pytest.raises(FileNotFoundError):
+            pool.submit("/nonexistent/file.wav", vitals).result(timeout=10)
+        assert pool.telemetry()[0]["errors"] == 1
+
+
+def test_dead_worker_is_restarted(registry, vitals, audio_files):
+    with TriageWorkerPool(num_workers=1, registry=registry, preload=(HEAR, MEDGEMMA)) as pool:
+        first_pid = pool.telemetry()[0]["pid"]
+        with pytest.raises(RuntimeError, match="worker 0 failed"):
+            pool.submit(audio_files[-1], vitals).result(timeout=10)
+
+        # The replacement worker keeps serving
+        result = pool.submit(audio_files[0], vitals).result(timeout=10)
+        telemetry = pool.telemetry()[0]
+
+    assert result.status == TriageStatus.YELLOW
+    assert telemetry["restarts"] == 1
+    assert telemetry["pid"] != first_pid
+
+
+def test_hung_worker_is_killed_without_wedging_the_others(registry, vitals, audio_files):
+    pool = TriageWorkerPool(num_workers=2, registry=registry, preload=(HEAR, MEDGEMMA), job_timeout=1.0)
+    with pool:
+        hung = pool.submit(audio_files[4], vitals)
+        results = pool.map([(path, vitals) for path in audio_files[:4]])
+        with pytest.raises(RuntimeError, match="job exceeded"):
+            hung.result(timeout=10)
+
+        # Both workers, including the replacement, keep serving
+        results += pool.map([(path, vitals) for path in audio_files[:4] * 2])
+        telemetry = pool.telemetry()
+
+    assert all(result.status == TriageStatus.YELLOW for result in results)
+    assert sum(stats["restarts"] for stats in telemetry.values()) == 1
+    assert all(stats["alive"] for stats in telemetry.values())
+
+
+def test_send_to_unresponsive_worker_does_not_block_the_pool(registry, vitals, audio_files):
+    pool = TriageWorkerPool(num_workers=1, registry=registry, preload=(HEAR, MEDGEMMA), job_timeout=1.0)
+    with pool:
+        pool.submit(audio_files[0], vitals).result(timeout=10)
+        # Idle but not reading: a payload larger than the socket buffer blocks the send
+        os.kill(pool.telemetry()[0]["pid"], signal.SIGSTOP)
+        futures = []
+        submitter = threading.Thread(target=lambda: futures.append(pool.submit(b"\0" * (16 << 20), vitals)))
+        submitter.start()
+        submitter.join(timeout=10)
+        assert not submitter.is_alive()
+
+        # The monitor could still take the lock, kill the worker and fail the job
+        with pytest.raises(RuntimeError, match="worker 0 failed"):
+            futures[0].result(timeout=10)
+        result = pool.submit(audio_files[0], vitals).result(timeout=10)
+
+    assert result.status == TriageStatus.YELLOW
+
+
+def test_submit_requires_start(registry, vitals):
+    with pytest.raises(RuntimeError):
+        TriageWorkerPool(num_workers=1, registry=registry).submit("a.wav", vitals)
+
+
+def test_rejects_invalid_worker_count(registry):
+    with pytest.raises(ValueError):
+        TriageWorkerPool(num_workers=0, registry=registry)